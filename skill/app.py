@@ -1,22 +1,40 @@
-from flask import Flask, request, jsonify, render_template, redirect, url_for, flash
+from flask import Flask, Request, Response, g, request, jsonify, render_template, redirect, url_for, flash, current_app
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
 import json
+import shutil
 import random
 from datetime import datetime, timedelta
 from config import Config
 from models import Resume, ResumeDatabase
-from verification import ResumeParser, VerificationEngine
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-import io
+from jobs import UploadPipeline, QueueFullError
+from ingest import ArchiveLimitError, extract_zip, ingest_files
+from storage import SpooledUpload, UnsupportedUpload
+from reports import ReportCache, stream_csv, stream_ndjson, stream_zip
+from metrics import metrics
+from snapshot import SnapshotStore
+import time
+import zipfile
+
+class SkillCredRequest(Request):
+    @property
+    def max_content_length(self):
+        # ZIP archives for bulk ingestion get a larger body limit
+        if self.path == '/api/upload/bulk':
+            return current_app.config['BULK_MAX_CONTENT_LENGTH']
+        return current_app.config['MAX_CONTENT_LENGTH']
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Resumes are sniffed, hashed and spooled as werkzeug parses the body
+        if self.path == '/upload':
+            return SpooledUpload(current_app.config['UPLOAD_FOLDER'],
+                                 current_app.config['UPLOAD_SPOOL_SIZE'], current_app.config['MAX_CONTENT_LENGTH'])
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
 
 # Initialize Flask app
 app = Flask(__name__)
+app.request_class = SkillCredRequest
 app.config.from_object(Config)
 CORS(app)
 
@@ -24,13 +42,44 @@ CORS(app)
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 # Initialize components
-db = ResumeDatabase()
-parser = ResumeParser()
-verifier = VerificationEngine()
+# Resumes are read into memory on first use, not at import
+db = ResumeDatabase(lazy=True)
+pipeline = UploadPipeline(db)
+report_cache = ReportCache()
+snapshots = SnapshotStore()
+metrics.register_gauge('skillcred_upload_queue_depth', pipeline.queue_depth)
+metrics.register_gauge('skillcred_resumes', lambda: db.count_resumes())
 
 def allowed_file(filename, allowed_extensions):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions
 
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    metrics.begin_collection()
+
+@app.before_request
+def sync_database():
+    """Pick up resumes written by other worker processes"""
+    db.sync()
+
+@app.after_request
+def record_request_time(response):
+    if 'request_started' in g:
+        metrics.observe('skillcred_request_seconds', time.perf_counter() - g.request_started,
+                        endpoint=request.endpoint or 'unknown')
+    return response
+
+@app.teardown_request
+def end_stage_collection(error=None):
+    metrics.end_collection()
+
+def timing_fields():
+    """Per-stage breakdown of this request in ms, included when ``?timings=1`` is passed"""
+    if request.args.get('timings') not in ('1', 'true'):
+        return {}
+    return {'timings_ms': {stage: round(seconds * 1000, 3) for stage, seconds in metrics.collected().items()}}
+
 @app.route('/')
 def index():
     return redirect(url_for('dashboard'))
@@ -38,28 +87,12 @@ def index():
 @app.route('/dashboard')
 def dashboard():
     stats = db.get_stats()
-    resumes = db.get_all_resumes()
     
-    # Sort resumes by upload date (newest first)
-    resumes.sort(key=lambda x: x.uploaded_at, reverse=True)
+    # 20 most recent resumes, straight from the upload-date index
+    resumes = db.get_recent_resumes(20)
     
-    # Calculate real skills frequency from actual data
-    def calculate_skills_frequency():
-        skills_count = {}
-        all_resumes = db.get_all_resumes()
-        
-        for resume in all_resumes:
-            if resume.parsed_data and resume.parsed_data.get('skills'):
-                for skill in resume.parsed_data.get('skills', []):
-                    skill = skill.strip()
-                    if skill:  # Only count non-empty skills
-                        skills_count[skill] = skills_count.get(skill, 0) + 1
-        
-        # Sort by frequency and get top 10
-        sorted_skills = sorted(skills_count.items(), key=lambda x: x[1], reverse=True)[:10]
-        return dict(sorted_skills)
-    
-    skills_frequency = calculate_skills_frequency()
+    # Skills frequency and chart data come from the running aggregates
+    skills_frequency = db.get_top_skills(10)
     
     # If no skills found, use defaults
     if not skills_frequency:
@@ -71,9 +104,8 @@ def dashboard():
             'Java': 25
         }
 
-    # Generate sample chart data
-    trust_score_distribution = [25, 45, 20, 10]  # 90-100%, 70-89%, 50-69%, 0-49%
-    verification_status = [65, 25, 10]  # Verified, Review, Flagged
+    trust_score_distribution = stats['trust_score_distribution']  # 90-100%, 70-89%, 50-69%, 0-49%
+    verification_status = stats['verification_status']  # Verified, Review, Flagged
     
     # Get recent flags
     recent_flags = []
@@ -83,7 +115,7 @@ def dashboard():
     
     return render_template('dashboard.html', 
                          stats=stats,
-                         resumes=resumes[:20],  # Limit to 20 most recent
+                         resumes=resumes,
                          trust_score_distribution=trust_score_distribution,
                          verification_status=verification_status,
                          skills_frequency=skills_frequency,
@@ -115,59 +147,160 @@ def upload_file():
         if not filename:
             filename = f"resume_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
 
-        # Create file path
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        # Sniffed on the first chunk and hashed while the request body was parsed
+        with metrics.time('save_upload'):
+            try:
+                upload = resume_file.stream.finish()
+            except UnsupportedUpload as e:
+                return jsonify({'error': f'{e}. Please upload PDF or DOCX files.'}), 400
+        metrics.inc('skillcred_bytes_processed_total', upload.size)
+        content_hash = upload.content_hash
         
-        # Save file
-        resume_file.save(file_path)
+        # Identical content was uploaded before: reuse its parse and verification
+        with metrics.time('cache_lookup'):
+            existing = db.find_by_hash(content_hash)
+        if existing:
+            db.record_cache_lookup(hit=True)
+            upload.discard()
+            return jsonify({
+                "message": "Resume already processed" if existing.status == 'completed' else "Resume is already being processed",
+                "resume_id": existing.id,
+                "job_id": existing.id,
+                "filename": existing.filename,
+                "status": existing.status,
+                "cached": True,
+                "status_url": url_for('api_resume_status', resume_id=existing.id),
+                "parsed": existing.parsed_data,
+                "verification": existing.verification_results,
+                "flags": existing.flags,
+                "trust_score": existing.trust_score,
+                **timing_fields(),
+            }), 200 if existing.status == 'completed' else 202
+        db.record_cache_lookup(hit=False)
+        with metrics.time('store_upload'):
+            file_path = upload.store()
 
         # Create resume record
         resume = Resume(filename, file_path)
+        resume.content_hash = content_hash
         resume_id = db.add_resume(resume)
 
-        # Parse resume
-        resume.status = 'processing'
-        db.update_resume(resume_id, status='processing')
+        if not app.config['UPLOAD_ASYNC']:
+            if not pipeline.process_now(resume):
+                return jsonify({'error': pipeline.get_error(resume_id)}), 400
+            resume = db.get_resume(resume_id)
+            return jsonify({
+                "message": "Resume processed successfully!",
+                "resume_id": resume_id,
+                "filename": filename,
+                "parsed": resume.parsed_data,
+                "verification": resume.verification_results,
+                "flags": resume.flags,
+                "trust_score": resume.trust_score,
+                **timing_fields(),
+            })
         
-        parsed_data = parser.parse_resume(file_path)
-        if parsed_data is None:
-            resume.status = 'error'
+        # Hand parsing and verification to the worker pool
+        try:
+            pipeline.submit(resume)
+        except QueueFullError as e:
             db.update_resume(resume_id, status='error')
-            return jsonify({'error': 'Failed to parse resume file'}), 400
-
-        # Verify claims
-        verification_results, flags, trust_score = verifier.verify_claims(parsed_data)
-
-        # Update resume with results
-        resume.parsed_data = parsed_data
-        resume.verification_results = verification_results
-        resume.trust_score = trust_score
-        resume.flags = flags
-        resume.status = 'completed'
-        
-        db.update_resume(resume_id, 
-                        parsed_data=parsed_data,
-                        verification_results=verification_results,
-                        trust_score=trust_score,
-                        flags=flags,
-                        status='completed')
+            response = jsonify({'error': f'{e}. Please retry shortly.'})
+            response.headers['Retry-After'] = '5'
+            return response, 503
 
         return jsonify({
-            "message": "Resume processed successfully!",
+            "message": "Resume queued for processing",
             "resume_id": resume_id,
+            "job_id": resume_id,
             "filename": filename,
-            "parsed": parsed_data,
-            "verification": verification_results,
-            "flags": flags,
-            "trust_score": trust_score,
-        })
+            "status": 'processing',
+            "status_url": url_for('api_resume_status', resume_id=resume_id),
+            **timing_fields(),
+        }), 202
+    
+    except Exception as e:
+        return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+
+@app.route('/api/upload/bulk', methods=['POST'])
+def upload_bulk():
+    """Ingest a ZIP archive of resumes in one request"""
+    try:
+        if 'archive' not in request.files:
+            return jsonify({'error': 'ZIP archive is required'}), 400
+        
+        archive = request.files['archive']
+        if not allowed_file(archive.filename or '', {'zip'}):
+            return jsonify({'error': 'Unsupported file type. Please upload a ZIP archive.'}), 400
+        
+        job_id = f"bulk_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        target_dir = os.path.join(app.config['UPLOAD_FOLDER'], job_id)
+        try:
+            file_paths = extract_zip(archive.stream, target_dir)
+        except zipfile.BadZipFile:
+            shutil.rmtree(target_dir, ignore_errors=True)
+            return jsonify({'error': 'Invalid ZIP archive'}), 400
+        except ArchiveLimitError as e:
+            return jsonify({'error': str(e)}), 413
+        
+        if not file_paths:
+            return jsonify({'error': 'No PDF or DOCX resumes found in archive'}), 400
+        
+        if not app.config['UPLOAD_ASYNC']:
+            report = ingest_files(file_paths, db)
+            return jsonify({
+                "message": f"Processed {report['files']} resumes",
+                **report,
+            })
+        
+        # Parse and verify in the background; poll the status URL for the report
+        pipeline.submit_bulk(job_id, file_paths)
+        return jsonify({
+            "message": f"Queued {len(file_paths)} resumes for processing",
+            "job_id": job_id,
+            "files": len(file_paths),
+            "status": 'pending',
+            "status_url": url_for('api_bulk_status', job_id=job_id),
+        }), 202
     
     except Exception as e:
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+@app.route('/api/upload/bulk/<job_id>')
+def api_bulk_status(job_id):
+    """Poll a bulk upload: ``pending``, ``processing``, then ``completed`` with the ingest report, or ``error``"""
+    job = pipeline.bulk_status(job_id)
+    if not job:
+        return jsonify({'error': 'Bulk upload not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/resumes/<resume_id>/status')
+def api_resume_status(resume_id):
+    """Poll the processing status of an uploaded resume"""
+    resume = db.get_resume(resume_id)
+    if not resume:
+        return jsonify({'error': 'Resume not found'}), 404
+    
+    data = {
+        'resume_id': resume_id,
+        'job_id': resume_id,
+        'filename': resume.filename,
+        'status': resume.status,
+    }
+    if resume.status == 'completed':
+        data.update({
+            'parsed': resume.parsed_data,
+            'verification': resume.verification_results,
+            'flags': resume.flags,
+            'trust_score': resume.trust_score,
+        })
+    elif resume.status == 'error':
+        data['error'] = pipeline.get_error(resume_id) or 'Failed to process resume'
+    return jsonify(data)
+
 @app.route('/results/<resume_id>')
 def results(resume_id):
-    resume = db.get_resume(resume_id)
+    resume = db.get_resume_detail(resume_id)
     if not resume:
         flash('Resume not found.', 'error')
         return redirect(url_for('dashboard'))
@@ -196,156 +329,82 @@ def api_dashboard():
     """API endpoint for dashboard data"""
     stats = db.get_stats()
     
-    # Calculate real skills frequency
-    def calculate_skills_frequency_api():
-        skills_count = {}
-        all_resumes = db.get_all_resumes()
-        
-        for resume in all_resumes:
-            if resume.parsed_data and resume.parsed_data.get('skills'):
-                for skill in resume.parsed_data.get('skills', []):
-                    skill = skill.strip()
-                    if skill:  # Only count non-empty skills
-                        skills_count[skill] = skills_count.get(skill, 0) + 1
-        
-        # Sort by frequency and get top 10
-        sorted_skills = sorted(skills_count.items(), key=lambda x: x[1], reverse=True)[:10]
-        return dict(sorted_skills) if sorted_skills else {
-            'JavaScript': 45,
-            'Python': 38,
-            'React': 32,
-            'Node.js': 28,
-            'Java': 25
-        }
-    
-    skills_frequency = calculate_skills_frequency_api()
+    skills_frequency = db.get_top_skills(10) or {
+        'JavaScript': 45,
+        'Python': 38,
+        'React': 32,
+        'Node.js': 28,
+        'Java': 25
+    }
     
     return jsonify({
         'totalResumes': stats['total_resumes'],
         'avgTrustScore': stats['avg_trust_score'],
         'verificationRate': stats['verification_rate'],
         'fraudAlerts': stats['fraud_alerts'],
-        'trustScoreDistribution': [25, 45, 20, 10],
-        'verificationStatus': [65, 25, 10],
+        'cacheHits': stats['cache_hits'],
+        'cacheMisses': stats['cache_misses'],
+        'cacheHitRate': stats['cache_hit_rate'],
+        'claimCacheHits': stats['claim_cache_hits'],
+        'claimCacheMisses': stats['claim_cache_misses'],
+        'claimCacheHitRate': stats['claim_cache_hit_rate'],
+        'trustScoreDistribution': stats['trust_score_distribution'],
+        'verificationStatus': stats['verification_status'],
         'skillsFrequency': skills_frequency
     })
 
-def generate_resume_pdf_report(resume):
-    """Generate PDF report for a resume"""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
-    story = []
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#2c5530'),
-        spaceAfter=30,
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#2c5530'),
-        spaceBefore=20,
-        spaceAfter=10,
-    )
-    
-    # Title
-    story.append(Paragraph("SkillCred Resume Verification Report", title_style))
-    story.append(Spacer(1, 20))
-    
-    # Basic Info
-    parsed_data = resume.parsed_data or {}
-    story.append(Paragraph("Candidate Information", heading_style))
-    
-    basic_info = [
-        ['Name:', parsed_data.get('name', 'Unknown')],
-        ['Email:', parsed_data.get('email', 'No email provided')],
-        ['Filename:', resume.filename],
-        ['Upload Date:', resume.uploaded_at.strftime('%Y-%m-%d %H:%M:%S')],
-    ]
-    
-    basic_table = Table(basic_info, colWidths=[2*inch, 4*inch])
-    basic_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8f9fa')),
-    ]))
-    story.append(basic_table)
-    story.append(Spacer(1, 20))
-    
-    # Verification Results
-    story.append(Paragraph("Verification Results", heading_style))
-    
-    # Trust Score with color coding
-    trust_color = colors.green if resume.trust_score >= 80 else colors.orange if resume.trust_score >= 60 else colors.red
-    status = 'VERIFIED' if resume.trust_score >= 80 else 'REVIEW REQUIRED' if resume.trust_score >= 60 else 'FLAGGED'
-    
-    verification_info = [
-        ['Trust Score:', f"{resume.trust_score}%"],
-        ['Status:', status],
-        ['Flags Count:', str(len(resume.flags))],
-    ]
-    
-    verification_table = Table(verification_info, colWidths=[2*inch, 4*inch])
-    verification_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8f9fa')),
-        ('TEXTCOLOR', (1, 1), (1, 1), trust_color),
-        ('FONTNAME', (1, 1), (1, 1), 'Helvetica-Bold'),
-    ]))
-    story.append(verification_table)
-    story.append(Spacer(1, 20))
-    
-    # Skills
-    if parsed_data.get('skills'):
-        story.append(Paragraph("Skills", heading_style))
-        skills_text = ', '.join(parsed_data.get('skills', []))
-        story.append(Paragraph(skills_text, styles['Normal']))
-        story.append(Spacer(1, 15))
-    
-    # Flags (if any)
-    if resume.flags:
-        story.append(Paragraph("Verification Flags", heading_style))
-        for flag in resume.flags:
-            story.append(Paragraph(f"• {flag}", styles['Normal']))
-        story.append(Spacer(1, 15))
-    
-    # Experience
-    if parsed_data.get('experience'):
-        story.append(Paragraph("Work Experience", heading_style))
-        for exp in parsed_data.get('experience', []):
-            exp_text = f"<b>{exp.get('title', 'Unknown Position')}</b> at {exp.get('company', 'Unknown Company')}"
-            if exp.get('duration'):
-                exp_text += f" ({exp.get('duration')})"
-            story.append(Paragraph(exp_text, styles['Normal']))
-            story.append(Spacer(1, 5))
-    
-    # Footer
-    story.append(Spacer(1, 30))
-    story.append(Paragraph("This report was generated by SkillCred - AI-Powered Resume Verification System", 
-                          ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey)))
-    story.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
-                          ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey)))
-    
-    # Build PDF
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
+def analytics_snapshot():
+    """The current columnar snapshot, built on first use and then refreshed in the background"""
+    snapshots.start(db)
+    return snapshots.current() or snapshots.refresh_from(db)
+
+def snapshot_fields(snapshot):
+    return {'snapshotBuiltAt': datetime.fromtimestamp(snapshot.manifest['built_at']).isoformat(),
+            'snapshotResumes': len(snapshot)}
+
+@app.route('/api/analytics/dashboard')
+def api_analytics_dashboard():
+    """Dashboard chart data from the columnar snapshot, without loading the resume store"""
+    snapshot = analytics_snapshot()
+    if snapshot is None:
+        return jsonify({'error': 'Analytics snapshot is not available'}), 503
+    stats = snapshot.dashboard()
+    return jsonify({
+        'totalResumes': stats['total_resumes'],
+        'avgTrustScore': stats['avg_trust_score'],
+        'verificationRate': stats['verification_rate'],
+        'fraudAlerts': stats['fraud_alerts'],
+        'trustScoreDistribution': stats['trust_score_distribution'],
+        'verificationStatus': stats['verification_status'],
+        'skillsFrequency': snapshot.top_skills(10),
+        **snapshot_fields(snapshot),
+    })
+
+@app.route('/api/analytics/timeseries')
+def api_analytics_timeseries():
+    """Uploads or average trust score per day or week, from the columnar snapshot"""
+    metric = request.args.get('metric', 'uploads')
+    bucket = request.args.get('bucket', 'day')
+    if metric not in ('uploads', 'avg_trust'):
+        return jsonify({'error': 'metric must be uploads or avg_trust'}), 400
+    if bucket not in ('day', 'week'):
+        return jsonify({'error': 'bucket must be day or week'}), 400
+    try:
+        since, until = (datetime.strptime(request.args[key], '%Y-%m-%d').date() if request.args.get(key) else None
+                        for key in ('since', 'until'))
+    except ValueError:
+        return jsonify({'error': 'since and until must be YYYY-MM-DD dates'}), 400
+    
+    snapshot = analytics_snapshot()
+    if snapshot is None:
+        return jsonify({'error': 'Analytics snapshot is not available'}), 503
+    series = snapshot.time_series(metric, bucket, since, until, request.args.get('skill') or None)
+    return jsonify({
+        'metric': metric,
+        'bucket': bucket,
+        'series': [{'period': period, 'value': value} for period, value in series],
+        **snapshot_fields(snapshot),
+    })
 
 @app.route('/api/report/<resume_id>')
 def api_report(resume_id):
@@ -359,12 +418,12 @@ def api_report(resume_id):
     if format_type == 'json':
         return jsonify(resume.to_dict())
     elif format_type == 'pdf':
-        # Generate PDF report
-        pdf_buffer = generate_resume_pdf_report(resume)
+        # Generate PDF report (cached until the resume changes)
+        pdf = report_cache.render(resume)
         
         # Return PDF as download
         from flask import make_response
-        response = make_response(pdf_buffer.getvalue())
+        response = make_response(pdf)
         response.headers['Content-Type'] = 'application/pdf'
         response.headers['Content-Disposition'] = f'attachment; filename=resume_report_{resume_id}.pdf'
         return response
@@ -375,18 +434,72 @@ def api_report(resume_id):
             'data': resume.to_dict()
         })
 
+@app.route('/api/reports/bulk', methods=['POST'])
+def api_reports_bulk():
+    """Download PDF reports for several resumes as one streamed ZIP"""
+    data = request.get_json(silent=True) or {}
+    resume_ids = data.get('ids') or request.form.getlist('ids')
+    if not resume_ids:
+        return jsonify({'error': 'No resume ids provided'}), 400
+    if len(resume_ids) > Config.REPORT_BULK_MAX:
+        return jsonify({'error': f'At most {Config.REPORT_BULK_MAX} reports per request'}), 400
+    
+    resumes = [db.get_resume(str(resume_id)) for resume_id in resume_ids]
+    missing = [str(resume_id) for resume_id, resume in zip(resume_ids, resumes) if resume is None]
+    if missing:
+        return jsonify({'error': 'Resume not found', 'missing': missing}), 404
+    
+    entries = ((f'resume_report_{resume.id}.pdf', pdf) for resume, pdf in report_cache.render_many(resumes))
+    response = Response(stream_zip(entries), mimetype='application/zip')
+    response.headers['Content-Disposition'] = 'attachment; filename=resume_reports.zip'
+    return response
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Stage histograms, counters and gauges in Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+EXPORT_FIELDS = ['id', 'name', 'email', 'phone', 'filename', 'uploaded_at', 'processing_status',
+                 'trust_score', 'status', 'flags_count', 'skills']
+
+def export_record(resume):
+    """One exported row; listing fields only, so the bulky columns stay in the database"""
+    parsed_data = resume.summary or {}
+    return {
+        'id': resume.id,
+        'name': parsed_data.get('name') or '',
+        'email': parsed_data.get('email') or '',
+        'phone': parsed_data.get('phone') or '',
+        'filename': resume.filename,
+        'uploaded_at': resume.uploaded_at.isoformat(),
+        'processing_status': resume.status,
+        'trust_score': resume.trust_score,
+        'status': 'verified' if resume.trust_score >= 80 else 'review' if resume.trust_score >= 60 else 'flagged',
+        'flags_count': len(resume.flags),
+        'skills': parsed_data.get('skills') or [],
+    }
+
 @app.route('/api/export/dashboard')
-def api_export_dashboard():
-    """Export dashboard data"""
+@app.route('/api/export/resumes')
+def api_export_resumes():
+    """Stream every resume matching the search filters as CSV or NDJSON"""
     format_type = request.args.get('format', 'csv')
-    stats = db.get_stats()
-    resumes = db.get_all_resumes()
-    
-    return jsonify({
-        'message': f'Dashboard export in {format_type} format coming soon',
-        'stats': stats,
-        'total_resumes': len(resumes)
-    })
+    sort = request.args.get('sort', 'uploaded_at')
+    if format_type not in ('csv', 'ndjson'):
+        return jsonify({'error': 'format must be csv or ndjson'}), 400
+    if sort not in ('uploaded_at', 'trust_score'):
+        return jsonify({'error': 'sort must be uploaded_at or trust_score'}), 400
+    
+    # Same filters as /api/search_resumes, read a page at a time as the response is sent
+    resumes = db.iter_search(request.args.get('search', '').lower(), request.args.get('trustScore', 'all'),
+                             request.args.get('status', 'all'), sort=sort)
+    rows = (export_record(resume) for resume in resumes)
+    if format_type == 'csv':
+        response = Response(stream_csv(EXPORT_FIELDS, rows), mimetype='text/csv')
+    else:
+        response = Response(stream_ndjson(rows), mimetype='application/x-ndjson')
+    response.headers['Content-Disposition'] = f'attachment; filename=skillcred_resumes.{format_type}'
+    return response
 
 @app.route('/api/search_resumes')
 def api_search_resumes():
@@ -396,61 +509,24 @@ def api_search_resumes():
     status_filter = request.args.get('status', 'all')
     page = int(request.args.get('page', 1))
     per_page = int(request.args.get('per_page', 20))
+    after = request.args.get('after')  # id of the last resume on the previous page
+    sort = request.args.get('sort', 'uploaded_at')
+    if sort not in ('uploaded_at', 'trust_score'):
+        return jsonify({'error': 'sort must be uploaded_at or trust_score'}), 400
     
-    # Get all resumes
-    all_resumes = db.get_all_resumes()
-    filtered_resumes = []
-    
-    for resume in all_resumes:
-        # Skip resumes without parsed data
-        # Get parsed data safely
-        parsed_data = resume.parsed_data or {}
-            
-        # Search filter
-        if search_query:
-            searchable_text = ' '.join([
-                (parsed_data.get('name') or '').lower(),
-                (parsed_data.get('email') or '').lower(),
-                ' '.join(parsed_data.get('skills') or []).lower(),
-                ' '.join([exp.get('company', '') for exp in (parsed_data.get('experience') or [])]).lower()
-            ])
-            
-            if search_query not in searchable_text:
-                continue
-        
-        # Trust score filter
-        if trust_score_filter != 'all':
-            if trust_score_filter == 'high' and resume.trust_score < 90:
-                continue
-            elif trust_score_filter == 'medium' and (resume.trust_score < 70 or resume.trust_score >= 90):
-                continue
-            elif trust_score_filter == 'low' and (resume.trust_score < 50 or resume.trust_score >= 70):
-                continue
-            elif trust_score_filter == 'very-low' and resume.trust_score >= 50:
-                continue
-        
-        # Status filter
-        if status_filter != 'all':
-            current_status = 'verified' if resume.trust_score >= 80 else 'review' if resume.trust_score >= 60 else 'flagged'
-            if status_filter != current_status:
-                continue
-        
-        filtered_resumes.append(resume)
-    
-    # Sort by upload date (newest first)
-    filtered_resumes.sort(key=lambda x: x.uploaded_at, reverse=True)
-    
-    # Pagination
-    total = len(filtered_resumes)
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_resumes = filtered_resumes[start:end]
+    # Matching resumes from the inverted index, best match first, then by the sort index
+    try:
+        total, paginated_resumes = db.search_resumes(search_query, trust_score_filter, status_filter,
+                                                     offset=(page - 1) * per_page, limit=per_page,
+                                                     after=after, sort=sort)
+    except KeyError:
+        return jsonify({'error': f'Unknown cursor: {after}'}), 400
     
     # Convert to dict format for JSON response
     resume_data = []
     for resume in paginated_resumes:
-        # Ensure parsed_data exists
-        parsed_data = resume.parsed_data or {}
+        # Listing fields only; the raw text stays in the database
+        parsed_data = resume.summary or {}
         
         status = 'verified' if resume.trust_score >= 80 else 'review' if resume.trust_score >= 60 else 'flagged'
         resume_data.append({
@@ -470,7 +546,8 @@ def api_search_resumes():
         'total': total,
         'page': page,
         'per_page': per_page,
-        'total_pages': (total + per_page - 1) // per_page
+        'total_pages': (total + per_page - 1) // per_page,
+        'next_cursor': paginated_resumes[-1].id if len(paginated_resumes) == per_page else None
     })
 
 @app.errorhandler(413)
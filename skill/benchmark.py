@@ -0,0 +1,752 @@
+import argparse
+import contextlib
+import inspect
+import json
+import random
+import string
+import sys
+import time
+from matching import KeywordMatcher
+
+def timeit(func, repeat=5):
+    """Best-of-``repeat`` wall time of ``func()`` in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+def legacy_extract_skills(skills_database, text):
+    """The original per-skill substring scan, kept as the baseline"""
+    found_skills = []
+    text_lower = text.lower()
+    for skill in skills_database:
+        if skill.lower() in text_lower:
+            found_skills.append(skill)
+    return found_skills
+
+def synthetic_taxonomy(size, rng):
+    taxonomy = {}
+    while len(taxonomy) < size:
+        words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        skill = ' '.join(word.capitalize() for word in words)
+        taxonomy[skill] = [''.join(word[0] for word in words).upper()] if len(words) > 1 else []
+    return taxonomy
+
+def synthetic_text(taxonomy, words, rng):
+    skills = list(taxonomy)
+    filler = ['developed', 'team', 'project', 'using', 'and', 'with', 'the', 'built', 'systems', 'led']
+    tokens = []
+    while len(tokens) < words:
+        tokens.append(rng.choice(skills) if rng.random() < 0.05 else rng.choice(filler))
+    return ' '.join(tokens)
+
+def bench_skills(sizes=(28, 1000, 20000), words=2000, seed=42):
+    """Compare the compiled matcher against the legacy substring scan.
+    
+    The first row is the built-in taxonomy on a one-page resume; the others
+    are synthetic taxonomies of ``sizes`` skills on ``words``-word texts.
+    """
+    from verification import ResumeParser
+    rng = random.Random(seed)
+    cases = [('builtin', ResumeParser().skills_database, synthetic_resume_text(1, rng))]
+    for size in sizes:
+        taxonomy = synthetic_taxonomy(size, rng)
+        cases.append(('synthetic', taxonomy, synthetic_text(taxonomy, words, rng)))
+    
+    results = []
+    for name, taxonomy, text in cases:
+        skills_database = list(taxonomy)
+        start = time.perf_counter()
+        matcher = KeywordMatcher(taxonomy)
+        build_ms = round((time.perf_counter() - start) * 1000, 3)
+        
+        results.append({
+            'taxonomy': name,
+            'taxonomy_size': len(skills_database),
+            'matcher': 'regex' if matcher.patterns is not None else 'aho-corasick',
+            'text_chars': len(text),
+            'matcher_build_ms': build_ms,
+            'legacy_ms': timeit(lambda: legacy_extract_skills(skills_database, text)),
+            'matcher_ms': timeit(lambda: matcher.find(text)),
+            'matches': len(matcher.find(text)),
+        })
+    return results
+
+def synthetic_resume_text(pages, rng):
+    """Plain-text resume of roughly ``pages`` pages (~3k characters each)"""
+    lines = ['Jane Q Candidate', 'jane.candidate@example.com | +14155550123', '']
+    companies = ['Google', 'Acme Technologies', 'Initech Corp', 'Globex Solutions', 'Umbrella Group']
+    skills = ['Python', 'JavaScript', 'React', 'Docker', 'Kubernetes', 'SQL', 'AWS', 'Machine Learning']
+    while sum(len(line) for line in lines) < pages * 3000:
+        year = rng.randint(2005, 2024)
+        lines.append(f"Software Engineer at {rng.choice(companies)} ({year} - {year + rng.randint(1, 4)})")
+        lines.append(f"Built services with {', '.join(rng.sample(skills, 3))} for {rng.randint(2, 40)} teams.")
+        if rng.random() < 0.1:
+            lines.append(f"Bachelor of Science, State University {year - 4}; AWS Certified {year}")
+    return '\n'.join(lines)
+
+def bench_extraction(pages=(1, 10, 100), repeat=5, seed=42):
+    """Per-extractor latency of ResumeParser.extract_information"""
+    from verification import ResumeParser
+    rng = random.Random(seed)
+    parser = ResumeParser()
+    results = []
+    for page_count in pages:
+        text = synthetic_resume_text(page_count, rng)
+        parser.timing_totals = {}
+        total_ms = timeit(lambda: parser.extract_information(text), repeat)
+        results.append({
+            'pages': page_count,
+            'text_chars': len(text),
+            'total_ms': total_ms,
+            'extractor_mean_ms': {
+                field: round(total / count * 1000, 3)
+                for field, (count, total) in parser.timing_totals.items()
+            },
+        })
+    return results
+
+def write_synthetic_pdf(path, pages, rng):
+    """Multi-page PDF resume rendered with ReportLab"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    text = synthetic_resume_text(pages, rng).split('\n')
+    lines_per_page = max(1, len(text) // pages)
+    pdf = canvas.Canvas(path, pagesize=A4)
+    for page in range(pages):
+        y = 800
+        for line in text[page * lines_per_page:(page + 1) * lines_per_page][:60]:
+            pdf.drawString(40, y, line[:110])
+            y -= 13
+        pdf.showPage()
+    pdf.save()
+
+def legacy_pdf_text(file_path):
+    """The original whole-document extraction, kept as the baseline"""
+    import PyPDF2
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        text = ""
+        for page in pdf_reader.pages:
+            text += page.extract_text()
+    return text
+
+def peak_memory_kb(func):
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        func()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+def bench_pdf(pages=(1, 20, 200), repeat=3, seed=42):
+    """Streaming, budgeted PDF parsing vs full-document extraction"""
+    import os
+    import tempfile
+    from verification import ResumeParser
+    rng = random.Random(seed)
+    parser = ResumeParser()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for page_count in pages:
+            path = os.path.join(tmp, f"resume_{page_count}.pdf")
+            write_synthetic_pdf(path, page_count, rng)
+            results.append({
+                'pages': page_count,
+                'file_kb': round(os.path.getsize(path) / 1024, 1),
+                'legacy_text_ms': timeit(lambda: legacy_pdf_text(path), repeat),
+                'legacy_peak_kb': peak_memory_kb(lambda: legacy_pdf_text(path)),
+                'parse_ms': timeit(lambda: parser.parse_resume(path), repeat),
+                'parse_peak_kb': peak_memory_kb(lambda: parser.parse_resume(path)),
+                'header_only_ms': timeit(lambda: parser.parse_resume(path, fields=['name']), repeat),
+                'pages_parsed': parser.parse_resume(path)['pages_parsed'],
+            })
+    return results
+
+def write_synthetic_docx(path, pages, rng):
+    """DOCX resume of roughly ``pages`` pages written with python-docx"""
+    from docx import Document
+    document = Document()
+    for line in synthetic_resume_text(pages, rng).split('\n'):
+        document.add_paragraph(line)
+    document.save(path)
+
+def bench_parse(pages=(1, 10, 100), repeat=3, seed=42):
+    """ResumeParser.parse_resume latency per format on synthetic 1-100 page resumes"""
+    import os
+    import tempfile
+    from verification import ResumeParser
+    rng = random.Random(seed)
+    parser = ResumeParser()
+    writers = {'docx': write_synthetic_docx, 'pdf': write_synthetic_pdf}
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for file_format, write in writers.items():
+            for page_count in pages:
+                path = os.path.join(tmp, f"resume_{page_count}.{file_format}")
+                write(path, page_count, rng)
+                parsed_data = parser.parse_resume(path)
+                results.append({
+                    'format': file_format,
+                    'pages': page_count,
+                    'file_kb': round(os.path.getsize(path) / 1024, 1),
+                    'parse_ms': timeit(lambda: parser.parse_resume(path), repeat),
+                    'chars_parsed': len(parsed_data['raw_text']),
+                    'truncated': parsed_data['truncated'],
+                })
+    return results
+
+FIRST_NAMES = ['John', 'Jane', 'Priya', 'Akash', 'Maria', 'Wei', 'Omar', 'Sara', 'Liam', 'Ana']
+LAST_NAMES = ['Doe', 'Smith', 'Yadav', 'Dixit', 'Garcia', 'Chen', 'Khan', 'Lopez', 'Brown', 'Singh']
+COMPANIES = ['Google', 'Microsoft', 'Amazon', 'Acme Corp', 'Initech', 'Globex', 'Umbrella', 'Stark Industries']
+SKILLS = ['Python', 'JavaScript', 'Java', 'React', 'Node.js', 'Docker', 'Kubernetes', 'SQL', 'AWS', 'Go']
+
+def synthetic_resume(index, rng, uploaded_at=None):
+    """A completed Resume record with realistic-looking parsed data"""
+    from models import Resume
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    resume = Resume(f"resume_{index}.pdf", f"uploads/resume_{index}.pdf", uploaded_at)
+    resume.status = 'completed'
+    resume.trust_score = round(rng.uniform(0, 100), 1)
+    resume.flags = [{'type': 'verification_failed', 'severity': 'high'}] * rng.randint(0, 2)
+    resume.parsed_data = {
+        'name': name,
+        'email': f"{name.lower().replace(' ', '.')}{index}@example.com",
+        'phone': f"+1 415 {index:07d}",
+        'skills': rng.sample(SKILLS, rng.randint(2, 6)),
+        'experience': [{'company': rng.choice(COMPANIES), 'position': 'Engineer', 'years': 2}],
+    }
+    return resume
+
+def populated_database(size, seed=42):
+    """In-memory ResumeDatabase holding ``size`` synthetic resumes"""
+    from models import ResumeDatabase
+    rng = random.Random(seed)
+    db = ResumeDatabase('sqlite://', json_file=None)
+    for start in range(0, size, 10000):
+        db.add_resumes([synthetic_resume(i, rng) for i in range(start, min(start + 10000, size))])
+    return db
+
+def percentiles(samples_ms):
+    samples = sorted(samples_ms)
+    pick = lambda q: round(samples[min(len(samples) - 1, int(q * len(samples)))], 3)
+    return {'p50_ms': pick(0.5), 'p99_ms': pick(0.99), 'max_ms': round(samples[-1], 3)}
+
+def sample_ms(func, samples):
+    """Latency percentiles of ``func(i)`` over ``samples`` calls"""
+    timings = []
+    for i in range(samples):
+        start = time.perf_counter()
+        func(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return percentiles(timings)
+
+def bench_search(sizes=(10000, 100000, 500000), queries=200, seed=7):
+    """Latency of ResumeDatabase.search_resumes for the first page of results.
+    
+    ``prefix_first_query`` times the first search for each 1-3 character
+    prefix of the names and skills, before the index has cached any prefix;
+    the other cases run afterwards, as a long-running server sees them.
+    """
+    rng = random.Random(seed)
+    words = [word.lower() for word in FIRST_NAMES + LAST_NAMES + SKILLS]
+    prefixes = sorted({word[:length] for word in words for length in (1, 2, 3)})
+    results = []
+    for size in sizes:
+        db = populated_database(size)
+        row = {'resumes': size,
+               'prefix_first_query': sample_ms(lambda i: db.search_resumes(prefixes[i], limit=20), len(prefixes))}
+        cases = {
+            'term': lambda: db.search_resumes(rng.choice(SKILLS).lower(), limit=20),
+            'prefix': lambda: db.search_resumes(rng.choice(LAST_NAMES).lower()[:3], limit=20),
+            'short_prefix': lambda: db.search_resumes(rng.choice(words)[:rng.randint(1, 2)], limit=20),
+            'two_terms': lambda: db.search_resumes(
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(COMPANIES)}".lower(), limit=20),
+            'facets': lambda: db.search_resumes('', rng.choice(['high', 'low']), rng.choice(['verified', 'flagged']), limit=20),
+            'unfiltered': lambda: db.search_resumes('', limit=20),
+        }
+        for case, run in cases.items():
+            samples = []
+            for _ in range(queries):
+                start = time.perf_counter()
+                run()
+                samples.append((time.perf_counter() - start) * 1000)
+            row[case] = percentiles(samples)
+        results.append(row)
+    return results
+
+def bench_verification(claims=(10, 50, 200), latency=0.02, seed=42):
+    """Concurrent provider calls vs one claim at a time, with simulated network latency.
+    
+    ``cached_ms`` verifies the same claims again through a warm claim cache.
+    """
+    from providers import stub_providers
+    from verification import VerificationEngine
+    random.seed(seed)
+    results = []
+    for count in claims:
+        parsed_data = {'skills': (SKILLS * (count // len(SKILLS) + 1))[:count]}
+        serial = VerificationEngine(stub_providers(latency=latency, pool_size=1), cache=False)
+        concurrent = VerificationEngine(stub_providers(latency=latency), cache=False)
+        cached = VerificationEngine(stub_providers(latency=latency))
+        cached.verify_claims(parsed_data)
+        results.append({
+            'claims': count,
+            'latency_ms': latency * 1000,
+            'serial_ms': timeit(lambda: serial.verify_claims(parsed_data), 1),
+            'concurrent_ms': timeit(lambda: concurrent.verify_claims(parsed_data), 1),
+            'cached_ms': timeit(lambda: cached.verify_claims(parsed_data), 1),
+        })
+    return results
+
+def synthetic_claims(index, rng):
+    """Parsed data with claims in every verification category"""
+    parsed_data = synthetic_resume(index, rng).parsed_data
+    parsed_data['education'] = [{'degree': 'Bachelor', 'institution': rng.choice(['MIT', 'State University', 'Stanford']), 'year': '2015'}]
+    parsed_data['certifications'] = [{'name': rng.choice(['AWS Certified', 'PMP', 'CISSP']), 'issuer': 'Issuer', 'year': '2020'}]
+    return parsed_data
+
+def bench_verify(resumes=1000, seed=42):
+    """VerificationEngine.verify_claims per resume: deterministic (uncached) vs warm claim cache"""
+    from verification import VerificationEngine
+    rng = random.Random(seed)
+    corpus = [synthetic_claims(i, rng) for i in range(resumes)]
+    engines = {
+        'deterministic': VerificationEngine(deterministic=True),
+        'cached': VerificationEngine(deterministic=False),
+    }
+    for parsed_data in corpus:
+        engines['cached'].verify_claims(parsed_data)
+    results = {'resumes': resumes}
+    for mode, engine in engines.items():
+        start = time.perf_counter()
+        latency = sample_ms(lambda i: engine.verify_claims(corpus[i]), resumes)
+        elapsed = time.perf_counter() - start
+        results[mode] = {**latency, 'resumes_per_sec': round(resumes / elapsed, 1)}
+    return results
+
+def bench_corpus(directory=None, repeat=3):
+    """End-to-end parse and verify over a resume corpus (default static/uploads) in deterministic mode.
+    
+    Trust scores are seeded from each file's content hash, so ``scores_digest``
+    only changes when parsing or scoring changes; compare it across commits
+    alongside the timings. ``reproducible`` checks that every run agreed.
+    """
+    import hashlib
+    import os
+    from ingest import find_resume_files
+    from storage import hash_file
+    from verification import ResumeParser, VerificationEngine
+    directory = directory or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'uploads')
+    files = find_resume_files(directory)
+    parser = ResumeParser()
+    engine = VerificationEngine(deterministic=True)
+    runs = []
+    for _ in range(repeat):
+        scores = {}
+        parse_time = verify_time = 0.0
+        for path in files:
+            content_hash = hash_file(path)
+            start = time.perf_counter()
+            parsed_data = parser.parse_resume(path)
+            parse_time += time.perf_counter() - start
+            if parsed_data is None:
+                scores[os.path.basename(path)] = None
+                continue
+            start = time.perf_counter()
+            _, _, trust_score = engine.verify_claims(parsed_data, seed=content_hash)
+            verify_time += time.perf_counter() - start
+            scores[os.path.basename(path)] = trust_score
+        digest = hashlib.sha256(json.dumps(scores, sort_keys=True).encode('utf-8')).hexdigest()
+        runs.append((parse_time * 1000, verify_time * 1000, digest, scores))
+    
+    return {
+        'directory': directory,
+        'files': len(files),
+        'parse_ms': round(min(run[0] for run in runs), 3),
+        'verify_ms': round(min(run[1] for run in runs), 3),
+        'scores_digest': runs[0][2][:16],
+        'reproducible': len({run[2] for run in runs}) == 1,
+        'trust_scores': runs[0][3],
+    }
+
+def bench_database(sizes=(1000, 100000, 1000000), samples=200, seed=42):
+    """ResumeDatabase writes on an on-disk store as it grows through ``sizes`` records"""
+    import os
+    import tempfile
+    from models import ResumeDatabase
+    rng = random.Random(seed)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ResumeDatabase(f"sqlite:///{os.path.join(tmp, 'bench.db')}", json_file=None)
+        count = 0
+        for size in sizes:
+            inserted = 0
+            start = time.perf_counter()
+            while count < size:
+                batch = [synthetic_resume(count + i, rng) for i in range(min(10000, size - count))]
+                db.add_resumes(batch)
+                count += len(batch)
+                inserted += len(batch)
+            bulk_seconds = time.perf_counter() - start
+            
+            ids = list(db.resumes)
+            new_resumes = [synthetic_resume(count + i, rng) for i in range(samples)]
+            row = {
+                'resumes': size,
+                'bulk_insert_per_sec': round(inserted / bulk_seconds, 1) if inserted else None,
+                'add_resume': sample_ms(lambda i: db.add_resume(new_resumes[i]), samples),
+                'update_resume': sample_ms(
+                    lambda i: db.update_resume(rng.choice(ids), trust_score=round(rng.uniform(0, 100), 1)), samples),
+                'get_stats': sample_ms(lambda i: db.get_stats(), samples),
+            }
+            count += samples
+            results.append(row)
+    return results
+
+def bench_identity(sizes=(1000, 100000), samples=200, legacy_samples=20, seed=42):
+    """Identity-collision lookups through IdentityIndex vs scanning every stored resume.
+    
+    Each query reuses a stored resume's email and phone under a new name, so
+    every lookup finds exactly one collision.
+    """
+    from indexes import normalize_email, normalize_phone
+    results = []
+    for size in sizes:
+        rng = random.Random(seed)
+        db = populated_database(size, seed)
+        ids = list(db.resumes)
+        queries = []
+        for _ in range(samples):
+            stored = db.resumes[rng.choice(ids)].summary
+            queries.append({**stored, 'name': 'Someone Else'})
+        
+        def legacy(i):
+            email, phone = normalize_email(queries[i]['email']), normalize_phone(queries[i]['phone'])
+            return [resume.id for resume in db.resumes.values()
+                    if normalize_email(resume.summary.get('email')) == email
+                    or normalize_phone(resume.summary.get('phone')) == phone]
+        
+        found = sum(len(db.find_identity_collisions(None, query)) for query in queries)
+        results.append({
+            'resumes': size,
+            'lookup': sample_ms(lambda i: db.find_identity_collisions(None, queries[i]), samples),
+            'legacy_scan': sample_ms(legacy, legacy_samples),
+            'collisions_found': found,
+        })
+        db.conn.close()
+    return results
+
+def bench_endpoints(sizes=(1000, 100000), requests=100, seed=42):
+    """Latency of the search, dashboard and report endpoints through the Flask test client"""
+    from config import Config
+    Config.DATABASE_URL = 'sqlite://'  # the app's own database stays in memory
+    import app as app_module
+    rng = random.Random(seed)
+    client = app_module.app.test_client()
+    results = []
+    for size in sizes:
+        app_module.db = db = populated_database(size, seed)
+        ids = list(db.resumes)
+        cases = {
+            'search': lambda i: client.get(f"/api/search_resumes?search={rng.choice(SKILLS).lower()}"),
+            'search_filtered': lambda i: client.get(
+                f"/api/search_resumes?search={rng.choice(LAST_NAMES).lower()}&trustScore=high&status=verified"),
+            'dashboard': lambda i: client.get('/api/dashboard'),
+            'report_pdf': lambda i: client.get(f"/api/report/{ids[i + 1]}"),
+            'report_pdf_cached': lambda i: client.get(f"/api/report/{ids[0]}"),
+            'report_json': lambda i: client.get(f"/api/report/{rng.choice(ids)}?format=json"),
+        }
+        row = {'resumes': size}
+        for case, request in cases.items():
+            request(0)
+            row[case] = sample_ms(request, requests)
+        results.append(row)
+    return results
+
+STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+result = {'import_ms': (time.perf_counter() - start) * 1000,
+          'loaded_at_import': sorted(m for m in ('reportlab', 'PyPDF2', 'docx') if m in sys.modules)}
+client = app.app.test_client()
+for name, path in (('first_report_ms', '/api/report/' + sys.argv[1]), ('first_dashboard_ms', '/dashboard')):
+    start = time.perf_counter()
+    status = client.get(path).status_code
+    result[name] = (time.perf_counter() - start) * 1000 if status == 200 else None
+print(json.dumps({key: round(value, 1) if isinstance(value, float) else value for key, value in result.items()}))
+"""
+
+def bench_startup(sizes=(1000, 100000), runs=3, seed=42):
+    """Cold start of the app in a fresh interpreter: import, then the first report and dashboard.
+    
+    Each run is a new process so module imports and the database open are
+    measured as a deployment would see them; the best of ``runs`` is kept.
+    """
+    import os
+    import subprocess
+    import tempfile
+    from models import ResumeDatabase
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            db_path = os.path.join(tmp, f"startup_{size}.db")
+            db = ResumeDatabase(f"sqlite:///{db_path}", json_file=None)
+            rng = random.Random(seed)
+            for start in range(0, size, 10000):
+                db.add_resumes([synthetic_resume(i, rng) for i in range(start, min(start + 10000, size))])
+            resume_id = next(iter(db.resumes))
+            db.conn.close()
+            
+            # Run outside the source tree so the legacy JSON file is not migrated in
+            env = {**os.environ, 'DATABASE_URL': f"sqlite:///{db_path}",
+                   'PYTHONPATH': os.path.dirname(os.path.abspath(__file__))}
+            samples = []
+            for _ in range(runs):
+                output = subprocess.run(
+                    [sys.executable, '-c', STARTUP_PROBE, resume_id], env=env, cwd=tmp,
+                    capture_output=True, text=True, check=True,
+                ).stdout
+                samples.append(json.loads(output.strip().splitlines()[-1]))
+            best = min(samples, key=lambda sample: sample['import_ms'])
+            results.append({'resumes': size, **best})
+    return results
+
+def bench_rescore(sizes=(100000,), legacy_samples=1000, seed=42):
+    """scoring.rescore over an on-disk store vs rescoring resume by resume.
+    
+    Each size is rescored three times, as ``python scoring.py`` would run it:
+    with unchanged settings (nothing written), with a new flagged-claim
+    penalty (most scores change) and with a new threshold (only threshold
+    flags change). ``legacy_ms_per_resume`` is the old path: load the
+    verification results, recompute the score and flags, and update the row.
+    """
+    import os
+    import tempfile
+    from models import ResumeDatabase
+    from scoring import rescore
+    from verification import VerificationEngine
+    engine = VerificationEngine()
+    statuses = ['verified'] * 6 + ['needs_review'] * 3 + ['flagged']
+    
+    def scored_resume(index, rng):
+        resume = synthetic_resume(index, rng)
+        resume.verification_results = {
+            category: [{'status': rng.choice(statuses)} for _ in range(rng.randint(0, 6))]
+            for category in ('skills', 'experience', 'education', 'certifications')
+        }
+        resume.trust_score = engine.calculate_trust_score(resume.verification_results)
+        resume.flags = engine.generate_flags(resume.verification_results, resume.parsed_data, resume.trust_score)
+        return resume
+    
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            rng = random.Random(seed)
+            database_url = f"sqlite:///{os.path.join(tmp, f'rescore_{size}.db')}"
+            db = ResumeDatabase(database_url, json_file=None)
+            for start in range(0, size, 10000):
+                db.add_resumes([scored_resume(i, rng) for i in range(start, min(start + 10000, size))])
+            db.conn.close()
+            
+            # Rescored the way the CLI does it: straight from the database, nothing loaded in memory
+            db = ResumeDatabase(database_url, json_file=None, lazy=True)
+            
+            row = {'resumes': size}
+            for case, kwargs in (('unchanged', {}), ('penalty_15', {'penalty': 15}), ('threshold_60', {'penalty': 15, 'threshold': 60})):
+                start = time.perf_counter()
+                summary = rescore(db, **kwargs)
+                row[case] = {'seconds': round(time.perf_counter() - start, 3), 'changed': summary['changed'],
+                             **{key: value for key, value in summary.items() if key.endswith('_seconds')}}
+            
+            ids = [r[0] for r in db.conn.execute('SELECT id FROM resumes LIMIT ?', (legacy_samples,))]
+            
+            def legacy(i):
+                resume = db.get_resume(ids[i])
+                results = resume.verification_results
+                trust_score = engine.calculate_trust_score(results)
+                db.update_resume(resume.id, trust_score=trust_score,
+                                 flags=engine.generate_flags(results, resume.summary, trust_score))
+            
+            db.load()
+            start = time.perf_counter()
+            for i in range(len(ids)):
+                legacy(i)
+            row['legacy_ms_per_resume'] = round((time.perf_counter() - start) * 1000 / len(ids), 3)
+            row['legacy_estimated_seconds'] = round(row['legacy_ms_per_resume'] * size / 1000, 1)
+            db.conn.close()
+            results.append(row)
+    return results
+
+def bench_snapshot(sizes=(100000,), samples=50, seed=42):
+    """Analytics over the memory-mapped columnar snapshot vs loading the resume store.
+    
+    ``load_seconds`` is what a dashboard request costs a fresh worker with
+    no snapshot; the query timings read only the snapshot files.
+    """
+    import os
+    import tempfile
+    from datetime import datetime, timedelta
+    from models import ResumeDatabase
+    from snapshot import SnapshotStore
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            rng = random.Random(seed)
+            database_url = f"sqlite:///{os.path.join(tmp, f'snapshot_{size}.db')}"
+            db = ResumeDatabase(database_url, json_file=None)
+            start_date = datetime(2025, 1, 1)
+            for start in range(0, size, 10000):
+                db.add_resumes([synthetic_resume(i, rng, start_date + timedelta(minutes=rng.randint(0, 365 * 24 * 60)))
+                                for i in range(start, min(start + 10000, size))])
+            db.conn.close()
+            
+            db = ResumeDatabase(database_url, json_file=None, lazy=True)
+            store = SnapshotStore(os.path.join(tmp, f'snapshot_{size}'))
+            start = time.perf_counter()
+            snapshot = store.refresh_from(db)
+            build_seconds = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            db.load()
+            load_seconds = time.perf_counter() - start
+            path = os.path.join(store.directory, snapshot.manifest['generation'])
+            results.append({
+                'resumes': size,
+                'build_seconds': round(build_seconds, 3),
+                'snapshot_kb': round(sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)) / 1024, 1),
+                'load_seconds': round(load_seconds, 3),
+                'dashboard': sample_ms(lambda i: snapshot.dashboard(), samples),
+                'top_skills': sample_ms(lambda i: snapshot.top_skills(10), samples),
+                'uploads_per_day': sample_ms(lambda i: snapshot.time_series('uploads', 'day'), samples),
+                'avg_trust_per_week': sample_ms(lambda i: snapshot.time_series('avg_trust', 'week'), samples),
+            })
+            db.conn.close()
+    return results
+
+def bench_similarity(sizes=(10000, 100000), duplicates=200, seed=42):
+    """MinHash signatures and LSH lookups of the template_reuse check.
+    
+    Each size indexes that many distinct one-page resumes, then looks up
+    ``duplicates`` planted copies of indexed resumes with the name, email
+    and one line changed. ``recall`` is the share of copies matched back to
+    their original; ``false_positive_rate`` the share of fresh resumes that
+    matched anything.
+    """
+    import os
+    import tempfile
+    from models import ResumeDatabase
+    from similarity import minhash
+    
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            rng = random.Random(seed)
+            db = ResumeDatabase(f"sqlite:///{os.path.join(tmp, f'similarity_{size}.db')}", json_file=None, lazy=True)
+            texts = [synthetic_resume_text(1, rng) for _ in range(size)]
+            
+            start = time.perf_counter()
+            signatures = [minhash(text) for text in texts]
+            signature_seconds = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            for i, signature in enumerate(signatures):
+                db.index_signature(str(i), signature)
+            index_seconds = time.perf_counter() - start
+            
+            originals = rng.sample(range(size), duplicates)
+            copies = []
+            for i in originals:
+                lines = texts[i].split('\n')
+                lines[0], lines[1] = f"Candidate {i}", f"candidate{i}@example.org | +14155559999"
+                lines[rng.randrange(3, len(lines))] = 'Led a team of engineers on internal tooling.'
+                copies.append('\n'.join(lines))
+            fresh = [synthetic_resume_text(1, rng) for _ in range(duplicates)]
+            
+            start = time.perf_counter()
+            copy_matches = [db.index_signature(f"copy{n}", minhash(text)) for n, text in enumerate(copies)]
+            fresh_matches = [db.index_signature(f"fresh{n}", minhash(text)) for n, text in enumerate(fresh)]
+            query_seconds = time.perf_counter() - start
+            
+            results.append({
+                'resumes': size,
+                'signatures_per_second': round(size / signature_seconds),
+                'index_per_second': round(size / index_seconds),
+                'lookup_ms': round(query_seconds * 1000 / (2 * duplicates), 3),
+                'recall': round(sum(str(i) in dict(matches) for i, matches in zip(originals, copy_matches)) / duplicates, 3),
+                'false_positive_rate': round(sum(bool(matches) for matches in fresh_matches) / duplicates, 3),
+            })
+            db.conn.close()
+    return results
+
+BENCHMARKS = {
+    'skills': bench_skills,
+    'extraction': bench_extraction,
+    'search': bench_search,
+    'pdf': bench_pdf,
+    'verification': bench_verification,
+    'corpus': bench_corpus,
+    'parse': bench_parse,
+    'verify': bench_verify,
+    'database': bench_database,
+    'endpoints': bench_endpoints,
+    'identity': bench_identity,
+    'startup': bench_startup,
+    'rescore': bench_rescore,
+    'similarity': bench_similarity,
+    'snapshot': bench_snapshot,
+}
+
+def environment():
+    """Where the numbers came from, recorded with every run"""
+    import os
+    import platform
+    import subprocess
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def main():
+    """Command-line entry point: python benchmark.py [name ...]"""
+    arg_parser = argparse.ArgumentParser(description='Run SkillCred benchmarks')
+    arg_parser.add_argument('names', nargs='*', help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    arg_parser.add_argument('--output', help='write JSON results to this file')
+    arg_parser.add_argument('--sizes', help='comma-separated record counts for the search, database and endpoints benchmarks')
+    args = arg_parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        arg_parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    options = {}
+    if args.sizes:
+        options['sizes'] = tuple(int(size) for size in args.sizes.split(','))
+    
+    results = {'environment': environment(), 'benchmarks': {}}
+    for name in (args.names or BENCHMARKS):
+        benchmark = BENCHMARKS[name]
+        accepted = inspect.signature(benchmark).parameters
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stderr):  # keep stdout pure JSON
+            results['benchmarks'][name] = benchmark(**{k: v for k, v in options.items() if k in accepted})
+        print(f"{name}: {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
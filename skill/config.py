@@ -10,10 +10,56 @@ class Config:
     
     # Database configuration
     DATABASE_URL = os.environ.get('DATABASE_URL') or 'sqlite:///skillcred.db'
+    DATABASE_BUSY_TIMEOUT = 30  # seconds a write waits for another process's lock
+    DATABASE_CHANGELOG_SIZE = 100000  # recent changes kept for other processes to replay
+    
+    # Parsing settings
+    SKILLS_TAXONOMY_FILE = os.environ.get('SKILLS_TAXONOMY_FILE')  # JSON {skill: [aliases]}
+    PARSE_MAX_PAGES = 20  # PDF pages read per resume
+    PARSE_MAX_CHARS = 200000  # characters of text kept per resume
     
     # Verification settings
     VERIFICATION_TIMEOUT = 30  # seconds
-    DEFAULT_TRUST_THRESHOLD = 70  # percentage
+    DEFAULT_TRUST_THRESHOLD = 70  # percentage; lower scores get a low_trust_score flag
+    FLAGGED_PENALTY = 10  # trust score points deducted per flagged claim
+    VERIFICATION_POOL_SIZE = 10  # concurrent requests per provider
+    VERIFICATION_RATE_LIMIT = float(os.environ.get('VERIFICATION_RATE_LIMIT') or 0)  # requests/sec per provider, 0 = unlimited
+    VERIFICATION_REQUEST_TIMEOUT = 5  # seconds per provider request
+    VERIFICATION_RETRIES = 2  # retries per claim, with jittered backoff
+    CLAIM_CACHE_SIZE = int(os.environ.get('CLAIM_CACHE_SIZE') or 10000)  # cached claim verdicts, 0 disables
+    CLAIM_CACHE_TTL = 24 * 60 * 60  # seconds a verdict is reused
+    CLAIM_CACHE_FILE = os.environ.get('CLAIM_CACHE_FILE')  # optional JSON file persisting the cache
+    VERIFICATION_DETERMINISTIC = os.environ.get('VERIFICATION_DETERMINISTIC') == '1'  # seed verdicts from the file hash
+    
+    # Fraud detection settings
+    MINHASH_PERMUTATIONS = 128  # MinHash signature length
+    MINHASH_BANDS = 16  # LSH bands of 8 rows; candidates from about 70% similarity
+    TEMPLATE_REUSE_THRESHOLD = 0.8  # estimated text similarity that raises a template_reuse flag
+    
+    # Upload pipeline settings
+    UPLOAD_SPOOL_SIZE = 1024 * 1024  # upload bytes held in memory before spilling to disk
+    UPLOAD_ASYNC = os.environ.get('UPLOAD_ASYNC', '1') != '0'  # process uploads in background workers
+    UPLOAD_WORKERS = int(os.environ.get('UPLOAD_WORKERS') or os.cpu_count() or 1)
+    UPLOAD_MAX_QUEUE = int(os.environ.get('UPLOAD_MAX_QUEUE') or 100)  # queued + running jobs before 503
+    UPLOAD_JOB_TIMEOUT = VERIFICATION_TIMEOUT  # seconds per parse + verify job
+    
+    # Bulk ingestion settings
+    BULK_WORKERS = os.cpu_count() or 1
+    BULK_CHUNK_SIZE = 500  # resumes committed per database write
+    BULK_MAX_CONTENT_LENGTH = 512 * 1024 * 1024  # 512MB max ZIP size
+    BULK_MAX_FILES = 10000  # resume files per ZIP
+    BULK_MAX_EXTRACTED_SIZE = 2 * 1024 * 1024 * 1024  # 2GB of resumes extracted per ZIP
+    BULK_JOB_TTL = int(os.environ.get('BULK_JOB_TTL') or 24 * 60 * 60)  # seconds a bulk job's status is kept
+    
+    # Report settings
+    REPORT_CACHE_SIZE = int(os.environ.get('REPORT_CACHE_SIZE') or 256)  # rendered PDFs kept in memory
+    REPORT_WORKERS = os.cpu_count() or 1  # processes rendering bulk report exports
+    REPORT_BULK_MAX = 1000  # resumes per bulk report request
+    
+    # Analytics snapshot settings
+    SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR') or os.path.join(os.getcwd(), 'snapshot')
+    SNAPSHOT_INTERVAL = int(os.environ.get('SNAPSHOT_INTERVAL') or 60)  # seconds between rebuild checks
+    SNAPSHOT_MAX_SKILLS = 1024  # most common skills given a bit in the per-resume skill bitsets
     
     # UI settings
     ITEMS_PER_PAGE = 20
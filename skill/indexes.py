@@ -0,0 +1,455 @@
+import bisect
+import heapq
+import re
+from collections import Counter, OrderedDict
+
+# Chart buckets shared by the dashboard and the search filters
+TRUST_BUCKETS = ['high', 'medium', 'low', 'very-low']  # 90-100%, 70-89%, 50-69%, 0-49%
+STATUS_BUCKETS = ['verified', 'review', 'flagged']  # >= 80, >= 60, below
+# SortedIndex.top ranks id sets under 1/DIRECT_RANK_RATIO of the index directly
+DIRECT_RANK_RATIO = 32
+
+def trust_bucket(trust_score):
+    if trust_score >= 90:
+        return 0
+    if trust_score >= 70:
+        return 1
+    if trust_score >= 50:
+        return 2
+    return 3
+
+def status_bucket(trust_score):
+    if trust_score >= 80:
+        return 0
+    if trust_score >= 60:
+        return 1
+    return 2
+
+class DashboardStats:
+    """Running dashboard aggregates, updated as resumes are added or changed.
+    
+    Each resume's last contribution is remembered so an update subtracts the
+    old values before adding the new ones; no query scans the table.
+    """
+    
+    def __init__(self):
+        self.clear()
+    
+    def clear(self):
+        self.total = 0
+        self.by_status = Counter()
+        self.completed_trust_sum = 0.0
+        self.flag_count = 0
+        self.skills = Counter()
+        self.trust_histogram = [0] * len(TRUST_BUCKETS)
+        self.status_histogram = [0] * len(STATUS_BUCKETS)
+        self.contributions = {}  # resume_id -> (status, trust_score, flag count, skills)
+    
+    def upsert(self, resume):
+        self.discard(resume.id)
+        skills = tuple(skill.strip() for skill in (resume.summary or {}).get('skills') or [])
+        contribution = (resume.status, resume.trust_score or 0, len(resume.flags or []),
+                        tuple(skill for skill in skills if skill))
+        self.apply(contribution, 1)
+        self.contributions[resume.id] = contribution
+    
+    def discard(self, resume_id):
+        contribution = self.contributions.pop(resume_id, None)
+        if contribution is not None:
+            self.apply(contribution, -1)
+    
+    def apply(self, contribution, sign):
+        status, trust_score, flag_count, skills = contribution
+        self.total += sign
+        self.by_status[status] += sign
+        self.flag_count += sign * flag_count
+        for skill in skills:
+            self.skills[skill] += sign
+            if self.skills[skill] <= 0:
+                del self.skills[skill]
+        if status == 'completed':
+            self.completed_trust_sum += sign * trust_score
+            self.trust_histogram[trust_bucket(trust_score)] += sign
+            self.status_histogram[status_bucket(trust_score)] += sign
+    
+    def top_skills(self, k=10):
+        return dict(self.skills.most_common(k))
+    
+    def as_dict(self):
+        completed = self.by_status['completed']
+        return {
+            'total_resumes': self.total,
+            'completed': completed,
+            'pending': self.by_status['pending'] + self.by_status['processing'],
+            'avg_trust_score': round(self.completed_trust_sum / max(completed, 1), 1),
+            'verification_rate': round((completed / self.total) * 100, 1) if self.total > 0 else 0,
+            'fraud_alerts': self.flag_count,
+            'trust_score_distribution': list(self.trust_histogram),
+            'verification_status': list(self.status_histogram),
+        }
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+')
+
+def tokenize(text):
+    """Lowercase word tokens (``c++`` and ``c#`` stay whole, node.js -> node, js)"""
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+def intersect(sets):
+    """Intersection of ``sets``, smallest first; a single set is returned as is"""
+    sets = sorted(sets, key=len)
+    result = sets[0]
+    for other in sets[1:]:
+        result = result & other
+        if not result:
+            break
+    return result
+
+class Difference:
+    """Read-only view of ``base - excluded`` (``excluded`` a subset of ``base``) that copies neither set"""
+    
+    __slots__ = ('base', 'excluded')
+    
+    def __init__(self, base, excluded):
+        self.base = base
+        self.excluded = excluded
+    
+    def __len__(self):
+        return len(self.base) - len(self.excluded)
+    
+    def __contains__(self, item):
+        return item in self.base and item not in self.excluded
+    
+    def __iter__(self):
+        return (item for item in self.base if item not in self.excluded)
+
+class PrefixMatches:
+    """Read-only view of the indexed resumes with a token starting with ``prefix``, less ``excluded``.
+    
+    Membership is tested against the resume's own tokens, so the postings
+    of the prefix are never unioned; ``count`` is the size of the view.
+    """
+    
+    __slots__ = ('documents', 'prefix', 'excluded', 'count')
+    
+    def __init__(self, documents, prefix, excluded, count):
+        self.documents = documents
+        self.prefix = prefix
+        self.excluded = excluded
+        self.count = count
+    
+    def __len__(self):
+        return self.count
+    
+    def __contains__(self, item):
+        document = self.documents.get(item)
+        return (document is not None and item not in self.excluded
+                and any(token.startswith(self.prefix) for token in document[0]))
+    
+    def __iter__(self):
+        return (item for item in self.documents if item in self)
+
+class SearchIndex:
+    """Inverted index over name, email, skills and companies.
+    
+    Query terms match indexed tokens by prefix (a sorted vocabulary gives the
+    range of tokens sharing a prefix); a resume must match every term and is
+    ranked higher for exact token matches. Trust-score buckets and
+    verification status are kept as facet sets so filters never visit
+    non-matching resumes.
+    
+    A query of one short term (``s``, ``go``) is answered without a union:
+    resumes are counted per prefix of up to ``SHORT_PREFIX`` characters, and
+    the sort index walk tests each resume's tokens. Otherwise a prefix
+    covering many postings is unioned once, then kept in an LRU cache that
+    ``upsert`` and ``discard`` update in place. The cache holds at most
+    ``PREFIX_CACHE_BUDGET`` ids per indexed resume.
+    """
+    
+    SHORT_PREFIX = 2  # longest prefix with a maintained resume count
+    PREFIX_CACHE_MIN = 10000  # postings in a prefix range before its union is cached
+    PREFIX_CACHE_BUDGET = 4  # cached ids per indexed resume
+    
+    def __init__(self):
+        self.clear()
+    
+    def clear(self):
+        self.postings = {}  # token -> set of resume ids
+        self.vocabulary = []  # sorted tokens, for prefix ranges
+        self.trust_facets = {bucket: set() for bucket in TRUST_BUCKETS}
+        self.status_facets = {bucket: set() for bucket in STATUS_BUCKETS}
+        self.documents = {}  # resume_id -> (tokens, trust bucket, status bucket)
+        self.prefix_cache = OrderedDict()  # prefix -> set of resume ids, least recently used first
+        self.prefix_counts = Counter()  # short prefix -> resumes with a token starting with it
+    
+    @staticmethod
+    def document_tokens(resume):
+        parsed_data = resume.summary or {}
+        fields = [
+            parsed_data.get('name') or '',
+            parsed_data.get('email') or '',
+            ' '.join(parsed_data.get('skills') or []),
+            ' '.join(exp.get('company') or '' for exp in (parsed_data.get('experience') or [])),
+        ]
+        return frozenset(tokenize(' '.join(fields)))
+    
+    @classmethod
+    def short_prefixes(cls, tokens):
+        return {token[:end] for token in tokens for end in range(1, min(len(token), cls.SHORT_PREFIX) + 1)}
+    
+    def upsert(self, resume):
+        trust_score = resume.trust_score or 0
+        document = (self.document_tokens(resume),
+                    TRUST_BUCKETS[trust_bucket(trust_score)],
+                    STATUS_BUCKETS[status_bucket(trust_score)])
+        if self.documents.get(resume.id) == document:
+            return
+        self.discard(resume.id)
+        
+        tokens, trust, status = document
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = set()
+                bisect.insort(self.vocabulary, token)
+            posting.add(resume.id)
+        self.update_prefix_cache(tokens, resume.id, set.add)
+        self.prefix_counts.update(self.short_prefixes(tokens))
+        self.trust_facets[trust].add(resume.id)
+        self.status_facets[status].add(resume.id)
+        self.documents[resume.id] = document
+    
+    def discard(self, resume_id):
+        document = self.documents.pop(resume_id, None)
+        if document is None:
+            return
+        tokens, trust, status = document
+        for token in tokens:
+            posting = self.postings[token]
+            posting.discard(resume_id)
+            if not posting:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+        self.update_prefix_cache(tokens, resume_id, set.discard)
+        for prefix in self.short_prefixes(tokens):
+            self.prefix_counts[prefix] -= 1
+            if not self.prefix_counts[prefix]:
+                del self.prefix_counts[prefix]
+        self.trust_facets[trust].discard(resume_id)
+        self.status_facets[status].discard(resume_id)
+    
+    def update_prefix_cache(self, tokens, resume_id, update):
+        """Apply ``update`` (``set.add`` or ``set.discard``) to every cached prefix of ``tokens``"""
+        if not self.prefix_cache:
+            return
+        for token in tokens:
+            for end in range(1, len(token) + 1):
+                cached = self.prefix_cache.get(token[:end])
+                if cached is not None:
+                    update(cached, resume_id)
+    
+    def prefix_matches(self, term):
+        """Resume ids with a token starting with ``term``"""
+        cached = self.prefix_cache.get(term)
+        if cached is not None:
+            self.prefix_cache.move_to_end(term)
+            return cached
+        start = bisect.bisect_left(self.vocabulary, term)
+        end = bisect.bisect_left(self.vocabulary, term + '\uffff', start)
+        if end - start == 1:
+            return self.postings[self.vocabulary[start]]
+        postings = [self.postings[token] for token in self.vocabulary[start:end]]
+        matched = set().union(*postings)
+        if sum(map(len, postings)) >= self.PREFIX_CACHE_MIN:
+            self.prefix_cache[term] = matched
+            budget = self.PREFIX_CACHE_BUDGET * len(self.documents)
+            while len(self.prefix_cache) > 1 and sum(map(len, self.prefix_cache.values())) > budget:
+                self.prefix_cache.popitem(last=False)
+        return matched
+    
+    def search(self, query='', trust_filter='all', status_filter='all'):
+        """Return matching resume ids as a list of sets in rank order.
+        
+        Resumes matching every search term exactly rank above prefix-only
+        matches. Returns None when neither a query nor a filter narrows the
+        result. The returned sets may be shared with the index: do not modify
+        them, and use them only while holding the lock writers take
+        (``ResumeDatabase.lock``).
+        """
+        facets = []
+        if trust_filter != 'all':
+            facets.append(self.trust_facets.get(trust_filter, set()))
+        if status_filter != 'all':
+            facets.append(self.status_facets.get(status_filter, set()))
+        
+        terms = sorted(tokenize(query)) if query else []
+        if len(terms) == 1 and not facets and len(terms[0]) <= self.SHORT_PREFIX:
+            tiers = self.short_prefix_search(terms[0])
+            if tiers is not None:
+                return tiers
+        prefix_sets = [self.prefix_matches(term) for term in terms]
+        exact_sets = [self.postings.get(term, set()) for term in terms]
+        sets = facets + prefix_sets
+        if not sets:
+            return None
+        
+        candidates = intersect(sets)
+        if not terms or not candidates or not all(exact_sets):
+            return [candidates]
+        # Terms matching a single token already are their exact sets
+        if all(exact_set is prefix_set for exact_set, prefix_set in zip(exact_sets, prefix_sets)):
+            return [candidates]
+        # Each exact set lies within its term's prefix matches, so the exact
+        # tier never needs the (larger) prefix sets
+        exact = intersect(facets + exact_sets)
+        if len(exact) == len(candidates):
+            return [candidates]
+        # Prefix-only matches are never copied out; the sort index walk tests membership
+        return [tier for tier in (exact, Difference(candidates, exact)) if tier]
+    
+    def short_prefix_search(self, term):
+        """``search`` tiers for a lone short ``term``; None if too few resumes match to walk the sort index for them"""
+        count = self.prefix_counts.get(term, 0)
+        if count * DIRECT_RANK_RATIO < len(self.documents):
+            return None
+        exact = self.postings.get(term, set())
+        prefix_only = PrefixMatches(self.documents, term, exact, count - len(exact))
+        return [tier for tier in (exact, prefix_only) if tier]
+
+def normalize_email(email):
+    """Canonical mailbox for matching: lowercase, ``+tag`` dropped, dots ignored for Gmail"""
+    local, at, domain = (email or '').strip().lower().partition('@')
+    if not (local and at and domain):
+        return None
+    local = local.split('+', 1)[0]
+    if domain in ('gmail.com', 'googlemail.com'):
+        local, domain = local.replace('.', ''), 'gmail.com'
+    return f"{local}@{domain}"
+
+def normalize_phone(phone):
+    """Last ten digits of a phone number, so "+1 (415) 555-0123" matches "4155550123"; None if too short"""
+    digits = re.sub(r'\D', '', phone or '')
+    return digits[-10:] if len(digits) >= 7 else None
+
+class IdentityIndex:
+    """Hash indexes from normalized email and phone to the resumes listing them.
+    
+    Each resume's name tokens and employers are kept alongside, so
+    ``collisions`` can tell the same person re-uploading from a contact that
+    shows up under a different identity, in one lookup per contact.
+    """
+    
+    def __init__(self):
+        self.clear()
+    
+    def clear(self):
+        self.contacts = {}  # (field, normalized value) -> set of resume ids
+        self.identities = {}  # resume_id -> (contact keys, name tokens, employers)
+    
+    @staticmethod
+    def identity(parsed_data):
+        contacts = tuple(key for key in (('email', normalize_email(parsed_data.get('email'))),
+                                         ('phone', normalize_phone(parsed_data.get('phone'))))
+                         if key[1])
+        name = frozenset(tokenize(parsed_data.get('name') or ''))
+        employers = frozenset(' '.join(sorted(tokenize(exp.get('company') or '')))
+                              for exp in parsed_data.get('experience') or [])
+        return contacts, name, employers - {''}
+    
+    def upsert(self, resume):
+        identity = self.identity(resume.summary or {})
+        if self.identities.get(resume.id) == identity:
+            return
+        self.discard(resume.id)
+        if identity[0]:
+            for key in identity[0]:
+                self.contacts.setdefault(key, set()).add(resume.id)
+            self.identities[resume.id] = identity
+    
+    def discard(self, resume_id):
+        identity = self.identities.pop(resume_id, None)
+        if identity is None:
+            return
+        for key in identity[0]:
+            ids = self.contacts[key]
+            ids.discard(resume_id)
+            if not ids:
+                del self.contacts[key]
+    
+    def collisions(self, resume_id, parsed_data):
+        """``[(resume_id, fields), ...]`` of other resumes sharing a contact under another name or employer history.
+        
+        Another identity means a different name, or employers that have
+        nothing in common; an updated resume from the same person matches
+        neither.
+        """
+        contacts, name, employers = self.identity(parsed_data or {})
+        shared = {}
+        for field, value in contacts:
+            for other_id in self.contacts.get((field, value), ()):
+                if other_id != resume_id:
+                    shared.setdefault(other_id, []).append(field)
+        matches = []
+        for other_id, fields in shared.items():
+            _, other_name, other_employers = self.identities[other_id]
+            if (name and other_name and name != other_name) or \
+                    (employers and other_employers and not employers & other_employers):
+                matches.append((other_id, tuple(fields)))
+        return sorted(matches)
+
+class SortedIndex:
+    """Resume ids ordered by ``key(resume)`` for top-k listings and keyset pagination"""
+    
+    def __init__(self, key):
+        self.key = key
+        self.clear()
+    
+    def clear(self):
+        self.entries = []  # sorted (key, resume_id)
+        self.positions = {}  # resume_id -> its (key, resume_id) entry
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def upsert(self, resume):
+        entry = (self.key(resume), resume.id)
+        previous = self.positions.get(resume.id)
+        if previous == entry:
+            return
+        if previous is not None:
+            del self.entries[bisect.bisect_left(self.entries, previous)]
+        bisect.insort(self.entries, entry)
+        self.positions[resume.id] = entry
+    
+    def discard(self, resume_id):
+        previous = self.positions.pop(resume_id, None)
+        if previous is not None:
+            del self.entries[bisect.bisect_left(self.entries, previous)]
+    
+    def top(self, ids=None, limit=None, before=None):
+        """Ids in descending key order, restricted to ``ids`` and to entries below ``before``.
+        
+        Small id sets are ranked directly; large ones (or no restriction) walk
+        the index from the top and stop after ``limit`` hits, so the newest
+        page never touches the rest of the table. Ids no longer indexed are
+        skipped. Both walk live structures, so callers hold the lock that
+        guards ``upsert`` (``ResumeDatabase.lock``).
+        """
+        if ids is not None and len(ids) * DIRECT_RANK_RATIO < len(self.entries):
+            entries = (entry for entry in map(self.positions.get, ids) if entry is not None)
+            if before is not None:
+                entries = (entry for entry in entries if entry < before)
+            if limit is None:
+                ranked = sorted(entries, reverse=True)
+            else:
+                ranked = heapq.nlargest(limit, entries)
+            return [resume_id for _, resume_id in ranked]
+        
+        end = len(self.entries) if before is None else bisect.bisect_left(self.entries, before)
+        result = []
+        for i in range(end - 1, -1, -1):
+            resume_id = self.entries[i][1]
+            if ids is None or resume_id in ids:
+                result.append(resume_id)
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
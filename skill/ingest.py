@@ -0,0 +1,177 @@
+import argparse
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.utils import secure_filename
+from config import Config
+from models import Resume, ResumeDatabase
+from jobs import cross_resume_flags, init_worker, process_resume, record_job_metrics, template_reuse_flags
+from storage import hash_file
+
+def ingest_file(task):
+    """Pool task: never raises so one bad file cannot abort the batch"""
+    file_path, content_hash = task
+    try:
+        return file_path, content_hash, process_resume(file_path, content_hash), None
+    except Exception as e:
+        return file_path, content_hash, None, str(e)
+
+def find_resume_files(directory, recursive=True):
+    """List files under ``directory`` with a supported resume extension"""
+    allowed = Config.ALLOWED_RESUME_EXTENSIONS
+    found = []
+    for root, dirs, files in os.walk(directory):
+        for name in sorted(files):
+            if '.' in name and name.rsplit('.', 1)[1].lower() in allowed:
+                found.append(os.path.join(root, name))
+        if not recursive:
+            break
+    return sorted(found)
+
+class ArchiveLimitError(Exception):
+    """Raised when a ZIP holds a resume over MAX_CONTENT_LENGTH, or more than BULK_MAX_FILES / BULK_MAX_EXTRACTED_SIZE"""
+
+def extract_zip(archive, target_dir):
+    """Extract supported resume files from a ZIP into ``target_dir``.
+    
+    The limits are checked against the declared sizes before anything is
+    written; ``zipfile`` never reads an entry past its declared size, so a
+    forged header cannot inflate one either.
+    """
+    allowed = Config.ALLOWED_RESUME_EXTENSIONS
+    with zipfile.ZipFile(archive) as zf:
+        entries = []
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            filename = secure_filename(os.path.basename(info.filename))
+            if '.' not in filename or filename.rsplit('.', 1)[1].lower() not in allowed:
+                continue
+            if info.file_size > Config.MAX_CONTENT_LENGTH:
+                raise ArchiveLimitError(f"{filename} is larger than {Config.MAX_CONTENT_LENGTH} bytes")
+            entries.append((info, filename))
+        if len(entries) > Config.BULK_MAX_FILES:
+            raise ArchiveLimitError(f"Archive holds more than {Config.BULK_MAX_FILES} resumes")
+        if sum(info.file_size for info, _ in entries) > Config.BULK_MAX_EXTRACTED_SIZE:
+            raise ArchiveLimitError(f"Archive expands to more than {Config.BULK_MAX_EXTRACTED_SIZE} bytes")
+        
+        os.makedirs(target_dir, exist_ok=True)
+        extracted = []
+        for info, filename in entries:
+            file_path = os.path.join(target_dir, filename)
+            stem, ext = os.path.splitext(filename)
+            counter = 1
+            while os.path.exists(file_path):
+                file_path = os.path.join(target_dir, f"{stem}_{counter}{ext}")
+                counter += 1
+            with zf.open(info) as src, open(file_path, 'wb') as dst:
+                while True:
+                    chunk = src.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+            extracted.append(file_path)
+    return extracted
+
+def ingest_files(file_paths, db, workers=None, chunk_size=None):
+    """Parse, verify and store ``file_paths``; returns a throughput report"""
+    workers = workers or Config.BULK_WORKERS
+    chunk_size = chunk_size or Config.BULK_CHUNK_SIZE
+    start = time.perf_counter()
+    errors = []
+    succeeded = 0
+    duplicates = 0
+    claim_cache = {'hits': 0, 'misses': 0}
+    batch = []
+    signatures = []  # (resume, MinHash signature) of the batch, indexed together on flush
+    
+    # Skip files whose content is already stored (or repeated in this batch)
+    tasks = []
+    seen = set()
+    for file_path in file_paths:
+        content_hash = hash_file(file_path)
+        if content_hash in seen or db.find_by_hash(content_hash):
+            duplicates += 1
+            continue
+        seen.add(content_hash)
+        tasks.append((file_path, content_hash))
+    db.record_cache_lookups(hits=duplicates, misses=len(tasks))
+    
+    def flush():
+        if signatures:
+            flags = template_reuse_flags(db, [(resume.id, signature) for resume, signature in signatures])
+            for resume, _ in signatures:
+                if resume.id in flags:
+                    resume.flags = resume.flags + [flags[resume.id]]
+            signatures.clear()
+        if batch:
+            db.add_resumes(batch)
+            batch.clear()
+    
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('spawn'),
+                             initializer=init_worker) as executor:
+        map_chunk = max(1, min(32, len(tasks) // (workers * 4) or 1))
+        for file_path, content_hash, result, error in executor.map(ingest_file, tasks, chunksize=map_chunk):
+            resume = Resume(os.path.basename(file_path), file_path)
+            resume.content_hash = content_hash
+            if result is None:
+                resume.status = 'error'
+                errors.append({'file': file_path, 'error': error or 'Failed to parse resume file'})
+            else:
+                resume.parsed_data = result['parsed_data']
+                resume.verification_results = result['verification_results']
+                resume.trust_score = result['trust_score']
+                resume.flags = result['flags'] + cross_resume_flags(db, resume.id, result, index_signature=False)
+                if result.get('minhash'):
+                    signatures.append((resume, result['minhash']))
+                with db.lock:
+                    db.identity_index.upsert(resume)  # visible to later files before the batch is written
+                resume.status = 'completed'
+                succeeded += 1
+                record_job_metrics(result)
+                for key in claim_cache:
+                    claim_cache[key] += result['claim_cache'][key]
+            batch.append(resume)
+            if len(batch) >= chunk_size:
+                flush()
+        flush()
+    db.record_claim_cache(**claim_cache)
+    
+    elapsed = time.perf_counter() - start
+    return {
+        'files': len(file_paths),
+        'succeeded': succeeded,
+        'failed': len(errors),
+        'duplicates': duplicates,
+        'elapsed_seconds': round(elapsed, 3),
+        'files_per_sec': round(len(file_paths) / elapsed, 2) if elapsed > 0 else 0,
+        'workers': workers,
+        'chunk_size': chunk_size,
+        'errors': errors,
+    }
+
+def main():
+    """Command-line entry point: python ingest.py <directory> [--workers N] [--chunk-size N]"""
+    arg_parser = argparse.ArgumentParser(description='Bulk-ingest a directory of resumes')
+    arg_parser.add_argument('directory', help='directory containing PDF/DOCX resumes')
+    arg_parser.add_argument('--workers', type=int, default=Config.BULK_WORKERS)
+    arg_parser.add_argument('--chunk-size', type=int, default=Config.BULK_CHUNK_SIZE,
+                            help='resumes committed per database write')
+    arg_parser.add_argument('--no-recursive', action='store_true', help='do not descend into subdirectories')
+    args = arg_parser.parse_args()
+    
+    file_paths = find_resume_files(args.directory, recursive=not args.no_recursive)
+    print(f"Ingesting {len(file_paths)} files with {args.workers} workers...")
+    report = ingest_files(file_paths, ResumeDatabase(), args.workers, args.chunk_size)
+    
+    print(f"Done: {report['succeeded']} succeeded, {report['failed']} failed, "
+          f"{report['duplicates']} duplicates skipped "
+          f"in {report['elapsed_seconds']}s ({report['files_per_sec']} files/sec)")
+    for error in report['errors']:
+        print(f"  {error['file']}: {error['error']}")
+
+if __name__ == '__main__':
+    main()
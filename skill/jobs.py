@@ -0,0 +1,261 @@
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import Config
+from metrics import metrics
+from verification import ResumeParser, VerificationEngine, identity_collision_flag
+
+# Per-worker-process components, created once by init_worker
+_parser = None
+_verifier = None
+_started = None  # queue of job ids a worker has picked up
+
+def init_worker(started=None):
+    global _parser, _verifier, _started
+    _parser = ResumeParser()
+    _verifier = VerificationEngine()
+    _started = started
+
+def process_resume(file_path, content_hash=None, job_id=None):
+    """Parse and verify a resume file. Runs inside a pool worker.
+    
+    ``content_hash`` seeds verification in deterministic mode. ``job_id`` is
+    announced on the pool's started queue so the job's deadline runs from
+    here rather than from submit. Stage and extractor timings travel back
+    with the result, since the worker's own metrics are never scraped.
+    """
+    if _parser is None:
+        init_worker()
+    if _started is not None and job_id is not None:
+        _started.put(job_id)
+    
+    parsed_data = _parser.parse_resume(file_path)
+    if parsed_data is None:
+        return None
+    timings = dict(_parser.last_stages)
+    
+    start = time.perf_counter()
+    cache_before = _verifier.cache_stats()
+    verification_results, flags, trust_score = _verifier.verify_claims(parsed_data, seed=content_hash)
+    cache_after = _verifier.cache_stats()
+    timings['verify_claims'] = time.perf_counter() - start
+    
+    from similarity import minhash
+    start = time.perf_counter()
+    signature = minhash(parsed_data.get('raw_text'))
+    timings['minhash'] = time.perf_counter() - start
+    return {
+        'parsed_data': parsed_data,
+        'verification_results': verification_results,
+        'flags': flags,
+        'trust_score': trust_score,
+        'minhash': signature,
+        'claim_cache': {
+            'hits': cache_after['hits'] - cache_before['hits'],
+            'misses': cache_after['misses'] - cache_before['misses'],
+        },
+        'timings': timings,
+        'extractor_timings': dict(_parser.last_timings),
+    }
+
+def record_job_metrics(result):
+    """Fold a worker result's timings and page count into this process's metrics"""
+    metrics.record(result.get('timings') or {})
+    metrics.record(result.get('extractor_timings') or {}, 'skillcred_extractor_seconds', 'field')
+    metrics.inc('skillcred_pages_parsed_total', result['parsed_data'].get('pages_parsed') or 0)
+
+def cross_resume_flags(db, resume_id, result, index_signature=True):
+    """Flags that compare a job's result with the stored resumes; runs in the main process.
+    
+    With ``index_signature`` off the template reuse check is left to the
+    caller, which batches signatures through ``template_reuse_flags``.
+    """
+    from similarity import template_reuse_flag
+    flags = [identity_collision_flag(db.find_identity_collisions(resume_id, result['parsed_data']))]
+    if index_signature and result.get('minhash'):
+        flags.append(template_reuse_flag(db.index_signature(resume_id, result['minhash'])))
+    return [flag for flag in flags if flag]
+
+def template_reuse_flags(db, pairs):
+    """Index ``[(resume_id, signature)]`` in one transaction; returns ``{resume_id: template reuse flag}`` for the reused ones"""
+    from similarity import template_reuse_flag
+    flags = {resume_id: template_reuse_flag(matches) for resume_id, matches in db.index_signatures(pairs).items()}
+    return {resume_id: flag for resume_id, flag in flags.items() if flag}
+
+class QueueFullError(Exception):
+    """Raised when the upload queue is at Config.UPLOAD_MAX_QUEUE"""
+
+class UploadPipeline:
+    """Bounded process pool that parses and verifies uploaded resumes.
+    
+    Jobs are keyed by resume id and report progress through ``Resume.status``:
+    ``pending`` on upload, ``processing`` once queued, then ``completed`` or
+    ``error``. A job still running ``timeout`` seconds after a worker picked
+    it up is marked ``error`` and its late result is discarded. Its worker
+    cannot be interrupted, so the job keeps its queue slot until it finishes.
+    A pool broken by a crashed worker is replaced on the next submit.
+    
+    Bulk archives run through ``ingest.ingest_files`` on a background
+    thread, one archive at a time. Their status is stored in the database, so
+    ``bulk_status`` answers from any worker process and after a restart.
+    """
+    
+    MAX_ERRORS = 1000  # error messages kept for status polls, oldest dropped first
+    
+    def __init__(self, db, workers=None, max_queue=None, timeout=None):
+        self.db = db
+        self.workers = workers or Config.UPLOAD_WORKERS
+        self.max_queue = max_queue or Config.UPLOAD_MAX_QUEUE
+        self.timeout = timeout or Config.UPLOAD_JOB_TIMEOUT
+        self.executor = None
+        self.started = None  # job ids announced by workers as they pick them up
+        self.jobs = {}  # resume_id -> (future, submitted at)
+        self.deadlines = {}  # resume_id -> deadline, for jobs a worker has started
+        self.timed_out = set()  # resume ids failed by the watchdog, still running
+        self.errors = OrderedDict()  # resume_id -> error message, at most MAX_ERRORS
+        self.bulk_executor = None
+        self.lock = threading.Lock()
+        self.watchdog = None
+    
+    def get_executor(self):
+        if self.executor is None:
+            context = multiprocessing.get_context('spawn')
+            self.started = context.SimpleQueue()
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=init_worker,
+                initargs=(self.started,),
+            )
+        if self.watchdog is None:
+            self.watchdog = threading.Thread(target=self.watch_deadlines, daemon=True)
+            self.watchdog.start()
+        return self.executor
+    
+    def submit_job(self, resume):
+        """Submit to the pool, replacing it once if a crashed worker broke it; call with ``lock`` held"""
+        args = (process_resume, resume.file_path, resume.content_hash, resume.id)
+        try:
+            return self.get_executor().submit(*args)
+        except BrokenProcessPool as e:
+            print(f"Error submitting resume {resume.id}, restarting the worker pool: {e}")
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+            return self.get_executor().submit(*args)
+    
+    def queue_depth(self):
+        with self.lock:
+            return len(self.jobs)
+    
+    def submit(self, resume):
+        """Queue a stored resume for parsing and verification"""
+        with self.lock:
+            if len(self.jobs) >= self.max_queue:
+                raise QueueFullError(f"Upload queue is full ({self.max_queue} jobs)")
+            try:
+                future = self.submit_job(resume)
+            except BrokenProcessPool as e:
+                self.fail(resume.id, f'Worker pool unavailable: {e}')
+                raise
+            self.db.update_resume(resume.id, status='processing')
+            self.jobs[resume.id] = (future, time.monotonic())
+        
+        future.add_done_callback(lambda f, resume_id=resume.id: self.on_done(resume_id, f))
+        return resume.id
+    
+    def process_now(self, resume):
+        """Run a job in the calling thread (used when UPLOAD_ASYNC is off)"""
+        self.db.update_resume(resume.id, status='processing')
+        try:
+            result = process_resume(resume.file_path, resume.content_hash)
+        except Exception as e:
+            return self.fail(resume.id, str(e))
+        return self.complete(resume.id, result)
+    
+    def on_done(self, resume_id, future):
+        with self.lock:
+            job = self.jobs.pop(resume_id, None)
+            self.deadlines.pop(resume_id, None)
+            timed_out = resume_id in self.timed_out
+            self.timed_out.discard(resume_id)
+        if job is None or timed_out:
+            return  # the watchdog already failed it; the late result is discarded
+        # Queue wait plus processing, from submit to result
+        metrics.observe('skillcred_stage_seconds', time.monotonic() - job[1], stage='job_total')
+        if future.cancelled():
+            self.fail(resume_id, 'Job was cancelled')
+            return
+        error = future.exception()
+        if error is not None:
+            self.fail(resume_id, str(error))
+            return
+        self.complete(resume_id, future.result())
+    
+    def complete(self, resume_id, result):
+        if result is None:
+            return self.fail(resume_id, 'Failed to parse resume file')
+        
+        self.db.update_resume(resume_id,
+                              parsed_data=result['parsed_data'],
+                              verification_results=result['verification_results'],
+                              trust_score=result['trust_score'],
+                              flags=result['flags'] + cross_resume_flags(self.db, resume_id, result),
+                              status='completed')
+        record_job_metrics(result)
+        metrics.inc('skillcred_uploads_total', outcome='completed')
+        if result.get('claim_cache'):
+            self.db.record_claim_cache(**result['claim_cache'])
+        return True
+    
+    def fail(self, resume_id, message):
+        metrics.inc('skillcred_uploads_total', outcome='error')
+        self.errors[resume_id] = message
+        while len(self.errors) > self.MAX_ERRORS:
+            self.errors.popitem(last=False)
+        self.db.update_resume(resume_id, status='error')
+        return False
+    
+    def watch_deadlines(self):
+        while True:
+            time.sleep(1)
+            now = time.monotonic()
+            with self.lock:
+                while not self.started.empty():
+                    resume_id = self.started.get()
+                    if resume_id in self.jobs:
+                        self.deadlines[resume_id] = now + self.timeout
+                expired = [r_id for r_id, deadline in self.deadlines.items() if deadline < now]
+                for resume_id in expired:
+                    del self.deadlines[resume_id]
+                    self.timed_out.add(resume_id)
+            for resume_id in expired:
+                self.fail(resume_id, f'Processing timed out after {self.timeout} seconds')
+    
+    def get_error(self, resume_id):
+        return self.errors.get(resume_id)
+    
+    def submit_bulk(self, job_id, file_paths):
+        """Queue extracted archive files for ``ingest_files``; archives are ingested one at a time"""
+        with self.lock:
+            if self.bulk_executor is None:
+                self.bulk_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bulk-ingest')
+            self.db.save_bulk_job(job_id, 'pending', files=len(file_paths))
+            self.bulk_executor.submit(self.run_bulk, job_id, file_paths)
+        return job_id
+    
+    def run_bulk(self, job_id, file_paths):
+        from ingest import ingest_files
+        self.db.save_bulk_job(job_id, 'processing')
+        try:
+            report = ingest_files(file_paths, self.db)
+        except Exception as e:
+            print(f"Error ingesting bulk upload {job_id}: {e}")
+            self.db.save_bulk_job(job_id, 'error', error=str(e))
+            return
+        self.db.save_bulk_job(job_id, 'completed', report=report)
+    
+    def bulk_status(self, job_id):
+        return self.db.get_bulk_job(job_id)
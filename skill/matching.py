@@ -0,0 +1,122 @@
+import re
+
+class KeywordMatcher:
+    """Matches many keywords against a text, each only on word boundaries.
+    
+    Built once from ``{canonical: [alias, ...]}``; ``find`` returns the
+    canonical names whose keyword or any alias occurs on word boundaries, so
+    "Java" does not match inside "JavaScript". Matching is case insensitive
+    and results keep the order the keywords were given in.
+    
+    Up to ``SCAN_MAX_KEYWORDS`` keywords, each is one compiled regex
+    alternation searched in C; larger taxonomies build an Aho-Corasick
+    automaton and scan the text once.
+    """
+    
+    SCAN_MAX_KEYWORDS = 100
+    
+    def __init__(self, keywords):
+        self.canonical = []
+        self.patterns = None
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+        keywords = self.normalize(keywords)
+        scan = len(keywords) <= self.SCAN_MAX_KEYWORDS
+        if scan:
+            self.patterns = []
+        for canonical, aliases in keywords:
+            keyword_id = len(self.canonical)
+            self.canonical.append(canonical)
+            aliases = sorted({canonical.lower(), *(a.lower() for a in aliases)} - {''})
+            if scan:
+                self.patterns.append(self.compile(aliases))
+                continue
+            for alias in aliases:
+                self.add(alias, keyword_id)
+        if not scan:
+            self.build()
+    
+    @staticmethod
+    def compile(aliases):
+        """``(aliases, regex)``: the regex matches any alias, anchored where an alias edge is a word character.
+        
+        Each alternative starts with its literal text; the start boundary is a
+        lookbehind placed after it.
+        """
+        parts = []
+        for alias in aliases:
+            part = re.escape(alias)
+            if alias[0].isalnum():
+                part += r'(?<![^\W_]' + re.escape(alias) + ')'
+            if alias[-1].isalnum():
+                part += r'(?![^\W_])'
+            parts.append(part)
+        return tuple(aliases), re.compile('|'.join(parts))
+    
+    @staticmethod
+    def normalize(keywords):
+        if isinstance(keywords, dict):
+            return [(k, v or []) for k, v in keywords.items()]
+        return [(k, []) for k in keywords]
+    
+    def add(self, pattern, keyword_id):
+        state = 0
+        for ch in pattern:
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(())
+            state = next_state
+        # Boundary checks only apply where the pattern edge is a word character
+        match = (keyword_id, len(pattern), pattern[0].isalnum(), pattern[-1].isalnum())
+        self.out[state] = self.out[state] + (match,)
+    
+    def build(self):
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.out[next_state] = self.out[next_state] + self.out[self.fail[next_state]]
+    
+    def find(self, text, lowered=False):
+        """Return canonical keywords present in ``text``"""
+        if not lowered:
+            text = text.lower()
+        if self.patterns is not None:
+            found = []
+            for canonical, (aliases, pattern) in zip(self.canonical, self.patterns):
+                # str.find rules out most keywords and skips the regex to the first occurrence
+                starts = [start for start in map(text.find, aliases) if start >= 0]
+                if starts and pattern.search(text, min(starts)):
+                    found.append(canonical)
+            return found
+        last = len(text) - 1
+        goto, fail, out = self.goto, self.fail, self.out
+        found = set()
+        state = 0
+        for i, ch in enumerate(text):
+            next_state = goto[state].get(ch)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(ch)
+            state = next_state or 0
+            if out[state]:
+                for keyword_id, length, check_start, check_end in out[state]:
+                    if keyword_id in found:
+                        continue
+                    start = i - length + 1
+                    if check_start and start > 0 and text[start - 1].isalnum():
+                        continue
+                    if check_end and i < last and text[i + 1].isalnum():
+                        continue
+                    found.add(keyword_id)
+        return [self.canonical[keyword_id] for keyword_id in sorted(found)]
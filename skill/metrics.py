@@ -0,0 +1,148 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; upper bounds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Metric name -> (type, help text)
+METRICS = {
+    'skillcred_stage_seconds': ('histogram', 'Time spent in each upload pipeline stage'),
+    'skillcred_extractor_seconds': ('histogram', 'Time spent in each ResumeParser field extractor'),
+    'skillcred_bytes_processed_total': ('counter', 'Bytes of resume files received'),
+    'skillcred_pages_parsed_total': ('counter', 'PDF pages (or DOCX documents) read by the parser'),
+    'skillcred_request_seconds': ('histogram', 'HTTP request latency by endpoint'),
+    'skillcred_uploads_total': ('counter', 'Uploads by outcome'),
+    'skillcred_upload_queue_depth': ('gauge', 'Upload jobs queued or running'),
+    'skillcred_resumes': ('gauge', 'Resumes stored'),
+}
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class MetricsRegistry:
+    """Process-wide histograms, counters and gauges rendered in Prometheus text format.
+    
+    Stages timed in worker processes are returned with the job result as a
+    ``{stage: seconds}`` dict and folded in here with ``record``. Between
+    ``begin_collection`` and ``end_collection`` every stage observed on the
+    current thread is also summed into a dict, giving a per-request breakdown.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}  # (name, labels) -> Histogram
+        self.counters = {}  # (name, labels) -> value
+        self.gauges = {}  # name -> callable returning the current value
+        self.local = threading.local()
+    
+    @staticmethod
+    def key(name, labels):
+        return name, tuple(sorted(labels.items()))
+    
+    def observe(self, name, value, **labels):
+        key = self.key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+    
+    def inc(self, name, amount=1, **labels):
+        key = self.key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+    
+    def register_gauge(self, name, func):
+        self.gauges[name] = func
+    
+    def observe_stage(self, stage, seconds):
+        self.observe('skillcred_stage_seconds', seconds, stage=stage)
+        timings = getattr(self.local, 'timings', None)
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + seconds
+    
+    @contextmanager
+    def time(self, stage):
+        """Observe the block's duration as pipeline stage ``stage``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+    
+    def record(self, timings, name='skillcred_stage_seconds', label='stage'):
+        """Observe a ``{stage: seconds}`` dict measured elsewhere (e.g. in a worker)"""
+        for stage, seconds in timings.items():
+            if name == 'skillcred_stage_seconds':
+                self.observe_stage(stage, seconds)
+            else:
+                self.observe(name, seconds, **{label: stage})
+    
+    def begin_collection(self):
+        self.local.timings = {}
+    
+    def end_collection(self):
+        timings = getattr(self.local, 'timings', None)
+        self.local.timings = None
+        return timings or {}
+    
+    def collected(self):
+        """Stages observed on this thread since ``begin_collection``"""
+        return dict(getattr(self.local, 'timings', None) or {})
+    
+    @staticmethod
+    def format_labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ''
+        escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for _, value in pairs)
+        return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+    
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+            histograms = [(key, list(h.counts), h.sum, h.count, h.buckets) for key, h in histograms]
+        gauges = []
+        for name, func in sorted(self.gauges.items()):
+            try:
+                gauges.append(((name, ()), func()))
+            except Exception as e:
+                print(f"Error reading gauge {name}: {e}")
+        
+        lines = []
+        described = set()
+        
+        def describe(name):
+            if name not in described:
+                described.add(name)
+                metric_type, help_text = METRICS.get(name, ('untyped', name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+        
+        for (name, labels), counts, total, count, buckets in histograms:
+            describe(name)
+            cumulative = 0
+            for bound, bucket_count in zip(list(buckets) + ['+Inf'], counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{self.format_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_sum{self.format_labels(labels)} {total}")
+            lines.append(f"{name}_count{self.format_labels(labels)} {count}")
+        for (name, labels), value in counters + gauges:
+            describe(name)
+            lines.append(f"{name}{self.format_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry()
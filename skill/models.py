@@ -1,10 +1,46 @@
 from datetime import datetime
 import json
 import os
+import sqlite3
+import sys
+import threading
+from config import Config
+from indexes import DashboardStats, IdentityIndex, SearchIndex, SortedIndex
+from metrics import metrics
+from scoring import claim_counts
+
+# Placeholder for a bulky field that lives only in the database
+UNLOADED = object()
+
+def compact(value):
+    """Intern the short strings of parsed data; statuses, skills and flag
+    categories repeat across thousands of resumes"""
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= 64 else value
+    if isinstance(value, dict):
+        return {compact(k): compact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [compact(item) for item in value]
+    return value
 
 class Resume:
-    def __init__(self, filename, file_path, uploaded_at=None):
-        self.id = self.generate_id()
+    """A stored resume.
+    
+    The record is slotted and keeps only what listings, search and the
+    dashboard use. ``raw_text`` and ``verification_results`` are bulky and
+    rarely read, so resumes held by ``ResumeDatabase`` leave them in the
+    database and load them on access through ``loader``. ``summary`` is the
+    parsed data without the raw text and never touches the database.
+    """
+    
+    __slots__ = ('id', 'filename', 'file_path', 'uploaded_at', '_status', 'summary', '_raw_text',
+                 '_verification_results', 'trust_score', '_flags', 'content_hash', 'version', 'loader')
+    
+    _id_lock = threading.Lock()
+    _last_id = 0
+    
+    def __init__(self, filename, file_path, uploaded_at=None, resume_id=None):
+        self.id = resume_id or self.generate_id()
         self.filename = filename
         self.file_path = file_path
         self.uploaded_at = uploaded_at or datetime.now()
@@ -13,102 +49,791 @@ class Resume:
         self.verification_results = {}
         self.trust_score = 0
         self.flags = []
+        self.content_hash = None  # SHA-256 of the uploaded file
+        self.version = 1  # bumped on every update, keys cached reports
+        self.loader = None  # (resume_id, field) -> value, for fields left in the database
     
     def generate_id(self):
-        return str(int(datetime.now().timestamp() * 1000))
+        # Millisecond timestamp, bumped when several resumes are created within
+        # the same millisecond (bulk ingestion) so ids stay unique
+        with Resume._id_lock:
+            new_id = max(int(datetime.now().timestamp() * 1000), Resume._last_id + 1)
+            Resume._last_id = new_id
+        return str(new_id)
+    
+    @property
+    def status(self):
+        return self._status
+    
+    @status.setter
+    def status(self, value):
+        self._status = sys.intern(value)
+    
+    @property
+    def flags(self):
+        return self._flags
+    
+    @flags.setter
+    def flags(self, value):
+        self._flags = compact(value or [])
+    
+    def load(self, field, value):
+        if value is UNLOADED:
+            return self.loader(self.id, field) if self.loader else None
+        return value
+    
+    @property
+    def raw_text(self):
+        return self.load('raw_text', self._raw_text)
     
-    def to_dict(self):
+    @property
+    def parsed_data(self):
+        """Parsed fields including ``raw_text`` (a new dict when the text is present)"""
+        raw_text = self.raw_text
+        return self.summary if raw_text is None else {**self.summary, 'raw_text': raw_text}
+    
+    @parsed_data.setter
+    def parsed_data(self, value):
+        value = dict(value or {})
+        self._raw_text = value.pop('raw_text', None)
+        self.summary = compact(value)
+    
+    @property
+    def verification_results(self):
+        return self.load('verification_results', self._verification_results)
+    
+    @verification_results.setter
+    def verification_results(self, value):
+        self._verification_results = {} if value is None else value
+    
+    def release(self, loader):
+        """Drop the bulky fields from memory; ``loader`` fetches them on demand"""
+        self.loader = loader
+        self._raw_text = UNLOADED
+        self._verification_results = UNLOADED
+    
+    def to_dict(self, full=True):
+        """Serializable form; ``full=False`` skips the raw text and verification results"""
         return {
             'id': self.id,
             'filename': self.filename,
             'file_path': self.file_path,
             'uploaded_at': self.uploaded_at.isoformat(),
             'status': self.status,
-            'parsed_data': self.parsed_data,
-            'verification_results': self.verification_results,
+            'parsed_data': self.parsed_data if full else self.summary,
+            'verification_results': self.verification_results if full else {},
             'trust_score': self.trust_score,
-            'flags': self.flags
+            'flags': self.flags,
+            'content_hash': self.content_hash,
+            'version': self.version
         }
     
     @classmethod
     def from_dict(cls, data):
-        resume = cls(data['filename'], data['file_path'])
-        resume.id = data['id']
-        resume.uploaded_at = datetime.fromisoformat(data['uploaded_at'])
+        resume = cls(data['filename'], data['file_path'],
+                     datetime.fromisoformat(data['uploaded_at']), data['id'])
         resume.status = data['status']
         resume.parsed_data = data['parsed_data']
         resume.verification_results = data['verification_results']
         resume.trust_score = data['trust_score']
         resume.flags = data['flags']
+        resume.content_hash = data.get('content_hash')
+        resume.version = data.get('version') or 1
         return resume
 
 class ResumeDatabase:
-    def __init__(self, db_file='resume_data.json'):
-        self.db_file = db_file
-        self.resumes = self.load_resumes()
+    """Resume store backed by SQLite in WAL mode.
     
-    def load_resumes(self):
-        if os.path.exists(self.db_file):
+    Every resume is one row, so ``add_resume`` and ``update_resume`` write only
+    the record (and, for updates, only the columns) that changed instead of
+    rewriting the whole database. The legacy ``resume_data.json`` file is
+    imported once on first open.
+    
+    Several processes (e.g. gunicorn workers) can share one database file.
+    Triggers append every changed resume id to ``resume_changes``; ``sync``
+    notices other processes' commits through ``PRAGMA data_version`` and
+    re-reads just those rows into the in-memory resumes and indexes.
+    """
+    
+    # Resume attribute -> column type; JSON columns are stored as TEXT
+    COLUMNS = {
+        'filename': 'TEXT',
+        'file_path': 'TEXT',
+        'uploaded_at': 'TEXT',
+        'status': 'TEXT',
+        'parsed_data': 'JSON',
+        'verification_results': 'JSON',
+        'trust_score': 'REAL',
+        'flags': 'JSON',
+        'content_hash': 'TEXT',
+        'version': 'INTEGER',
+        'raw_text': 'TEXT',
+    }
+    
+    # Claim status counts derived from verification_results, read by scoring.rescore
+    COUNT_COLUMNS = ('claims_total', 'claims_verified', 'claims_flagged')
+    
+    # Bulky columns left out of memory and read on demand
+    LAZY_COLUMNS = ('raw_text', 'verification_results')
+    
+    # Built by ``load``; the first access on a lazily opened database loads it
+    LOADED_ATTRIBUTES = ('resumes', 'stats', 'search_index', 'identity_index', 'sorted_indexes', 'indexes')
+    
+    def __init__(self, database_url=None, json_file='resume_data.json', lazy=False):
+        self.db_path = self.resolve_sqlite_path(database_url or Config.DATABASE_URL)
+        self.json_file = json_file
+        self.lock = threading.RLock()
+        self.conn = self.connect()
+        self.create_schema()
+        self.migrate_from_json()
+        if not lazy:
+            self.load()
+        
+    def __getattr__(self, name):
+        if name in self.LOADED_ATTRIBUTES:
+            self.load()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+    
+    @property
+    def loaded(self):
+        return 'resumes' in self.__dict__
+    
+    def load(self):
+        """Read resumes into memory and build the secondary indexes, once"""
+        with self.lock:
+            if self.loaded:
+                return
+            # Read the change position first: anything committed meanwhile is replayed by sync
+            self.seen_change = self.last_change()
+            self.data_version = self.get_data_version()
+            resumes = self.load_resumes()
+            
+            # Secondary indexes kept in step with every write
+            stats = DashboardStats()
+            search_index = SearchIndex()
+            identity_index = IdentityIndex()
+            sorted_indexes = {
+                'uploaded_at': SortedIndex(lambda r: r.uploaded_at),
+                'trust_score': SortedIndex(lambda r: r.trust_score or 0),
+            }
+            indexes = [stats, search_index, identity_index, *sorted_indexes.values()]
+            for resume in resumes.values():
+                for index in indexes:
+                    index.upsert(resume)
+            
+            self.stats = stats
+            self.search_index = search_index
+            self.identity_index = identity_index
+            self.sorted_indexes = sorted_indexes
+            self.indexes = indexes
+            self.resumes = resumes
+    
+    @staticmethod
+    def resolve_sqlite_path(database_url):
+        """Turn ``sqlite:///relative.db`` / ``sqlite:////abs.db`` into a path"""
+        if not database_url.startswith('sqlite://'):
+            raise ValueError(f"Unsupported DATABASE_URL: {database_url}")
+        path = database_url[len('sqlite://'):]
+        if path in ('', '/', '/:memory:'):
+            return ':memory:'
+        return path[1:] if path.startswith('/') else path
+    
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=Config.DATABASE_BUSY_TIMEOUT, check_same_thread=False)
+        if self.db_path != ':memory:':
+            conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+    
+    def create_schema(self):
+        with self.lock, self.conn:
+            # Take the write lock up front so processes starting together migrate one at a time
+            self.conn.execute('BEGIN IMMEDIATE')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS resumes (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    uploaded_at TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    parsed_data TEXT,
+                    verification_results TEXT,
+                    trust_score REAL DEFAULT 0,
+                    flags TEXT,
+                    content_hash TEXT,
+                    version INTEGER DEFAULT 1,
+                    raw_text TEXT,
+                    claims_total INTEGER,
+                    claims_verified INTEGER,
+                    claims_flagged INTEGER
+                )
+            ''')
+            added = self.ensure_columns()
+            if 'raw_text' in added:
+                # Older rows kept the text inside parsed_data; move it to its own column
+                self.conn.execute("""
+                    UPDATE resumes
+                    SET raw_text = json_extract(parsed_data, '$.raw_text'),
+                        parsed_data = json_remove(parsed_data, '$.raw_text')
+                    WHERE json_extract(parsed_data, '$.raw_text') IS NOT NULL
+                """)
+            if 'claims_total' in added:
+                # Count the claims of existing rows once; writes keep the counts current after that
+                claims = ("FROM json_each(resumes.verification_results) AS c, json_each(c.value) AS i "
+                          "WHERE c.type = 'array'")
+                status = "json_extract(i.value, '$.status')"
+                self.conn.execute(f"""
+                    UPDATE resumes
+                    SET claims_total = (SELECT COUNT(*) {claims}),
+                        claims_verified = (SELECT COUNT(*) {claims} AND {status} = 'verified'),
+                        claims_flagged = (SELECT COUNT(*) {claims} AND {status} = 'flagged')
+                """)
+            self.conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_resumes_content_hash ON resumes (content_hash)'
+            )
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)'
+            )
+            # MinHash signatures and their LSH buckets, for near-duplicate lookups
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS resume_signatures (resume_id TEXT PRIMARY KEY, minhash BLOB NOT NULL)'
+            )
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS resume_bands (band_key INTEGER NOT NULL, resume_id TEXT NOT NULL, '
+                'PRIMARY KEY (band_key, resume_id)) WITHOUT ROWID'
+            )
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS resume_changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, resume_id TEXT NOT NULL)'
+            )
+            # Bulk upload jobs, readable from every worker process until they expire
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS bulk_jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, files INTEGER, '
+                'report TEXT, error TEXT, expires_at REAL NOT NULL)'
+            )
+            for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+                self.conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS resumes_{event.lower()}_logged AFTER {event} ON resumes
+                    BEGIN INSERT INTO resume_changes (resume_id) VALUES ({row}.id); END
+                """)
+            self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS resume_changes_pruned AFTER INSERT ON resume_changes
+                BEGIN DELETE FROM resume_changes WHERE seq <= NEW.seq - {int(Config.DATABASE_CHANGELOG_SIZE)}; END
+            """)
+    
+    def ensure_columns(self):
+        """Add columns introduced after a database file was created"""
+        existing = {row[1] for row in self.conn.execute('PRAGMA table_info(resumes)')}
+        added = []
+        for key, column_type in {**self.COLUMNS, **dict.fromkeys(self.COUNT_COLUMNS, 'INTEGER')}.items():
+            if key not in existing:
+                column_type = 'TEXT' if column_type == 'JSON' else column_type
+                self.conn.execute(f'ALTER TABLE resumes ADD COLUMN {key} {column_type}')
+                added.append(key)
+        return added
+    
+    def get_data_version(self):
+        """Changes whenever another connection commits to the database file"""
+        return self.conn.execute('PRAGMA data_version').fetchone()[0]
+    
+    def last_change(self):
+        return self.conn.execute('SELECT MAX(seq) FROM resume_changes').fetchone()[0] or 0
+    
+    def sync(self):
+        """Pick up resumes written by other processes since the last sync.
+        
+        Cheap when nothing changed (one PRAGMA). If this process fell further
+        behind than the changelog reaches, everything is reloaded.
+        """
+        if not self.loaded:
+            return
+        with self.lock:
+            data_version = self.get_data_version()
+            if data_version == self.data_version:
+                return
+            self.data_version = data_version
             try:
-                with open(self.db_file, 'r', encoding='utf-8') as f:
+                oldest = self.conn.execute('SELECT MIN(seq) FROM resume_changes').fetchone()[0]
+                if oldest is not None and oldest > self.seen_change + 1:
+                    for name in self.LOADED_ATTRIBUTES:
+                        del self.__dict__[name]
+                    self.load()
+                    return
+                changes = self.conn.execute(
+                    'SELECT seq, resume_id FROM resume_changes WHERE seq > ? ORDER BY seq', (self.seen_change,)
+                ).fetchall()
+                if changes:
+                    self.refresh({resume_id for _, resume_id in changes})
+                    self.seen_change = changes[-1][0]
+            except sqlite3.Error as e:
+                print(f"Error syncing resume database: {e}")
+    
+    def refresh(self, resume_ids):
+        """Re-read ``resume_ids`` into memory, dropping any that were deleted"""
+        columns = [key for key in self.COLUMNS if key not in self.LAZY_COLUMNS]
+        resume_ids = list(resume_ids)
+        found = set()
+        for start in range(0, len(resume_ids), 500):
+            chunk = resume_ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT {', '.join(['id'] + columns)} FROM resumes WHERE id IN ({', '.join('?' for _ in chunk)})",
+                chunk
+            ).fetchall()
+            for row in rows:
+                resume = self.from_row(row, columns)
+                resume.release(self.load_field)
+                self.resumes[resume.id] = resume
+                self.index_resume(resume)
+                found.add(resume.id)
+        for resume_id in set(resume_ids) - found:
+            if self.resumes.pop(resume_id, None) is not None:
+                for index in self.indexes:
+                    index.discard(resume_id)
+    
+    def get_meta(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+    
+    def set_meta(self, key, value):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value))
+        )
+    
+    def migrate_from_json(self):
+        """One-shot import of the legacy whole-file JSON database"""
+        if not self.json_file or not os.path.exists(self.json_file):
+            return
+        with self.lock:
+            if self.get_meta('json_migrated_from'):
+                return
+            try:
+                with open(self.json_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    return {r_id: Resume.from_dict(r_data) for r_id, r_data in data.items()}
+                resumes = [Resume.from_dict(r_data) for r_data in data.values()]
+                with self.conn:
+                    self.conn.executemany(
+                        self.insert_sql('INSERT OR IGNORE'),
+                        [self.to_row(resume) for resume in resumes]
+                    )
+                    self.set_meta('json_migrated_from', os.path.abspath(self.json_file))
+                print(f"Migrated {len(resumes)} resumes from {self.json_file}")
             except Exception as e:
-                print(f"Error loading resume database: {e}")
-                return {}
-        return {}
+                print(f"Error migrating resume database: {e}")
     
-    def save_resumes(self):
+    def insert_sql(self, verb='INSERT'):
+        columns = ['id'] + list(self.COLUMNS) + list(self.COUNT_COLUMNS)
+        placeholders = ', '.join('?' for _ in columns)
+        return f"{verb} INTO resumes ({', '.join(columns)}) VALUES ({placeholders})"
+    
+    def encode(self, key, value):
+        if self.COLUMNS[key] == 'JSON':
+            return json.dumps(value, ensure_ascii=False)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+    
+    @staticmethod
+    def column_value(resume, key):
+        # parsed_data is stored without the raw text, which has its own column
+        return resume.summary if key == 'parsed_data' else getattr(resume, key)
+    
+    def to_row(self, resume):
+        return ((resume.id,) + tuple(self.encode(key, self.column_value(resume, key)) for key in self.COLUMNS)
+                + claim_counts(resume.verification_results))
+    
+    def decode(self, key, value):
+        return json.loads(value) if self.COLUMNS[key] == 'JSON' and value else value
+    
+    def from_row(self, row, columns=None):
+        data = {'id': row[0]}
+        for key, value in zip(columns or self.COLUMNS, row[1:]):
+            data[key] = self.decode(key, value)
+        data['parsed_data'] = data['parsed_data'] or {}
+        if data.get('raw_text'):
+            data['parsed_data']['raw_text'] = data['raw_text']
+        data['verification_results'] = data.get('verification_results') or {}
+        data['flags'] = data['flags'] or []
+        return Resume.from_dict(data)
+    
+    def load_resumes(self):
+        """Load every resume without its lazy columns"""
         try:
-            data = {r_id: resume.to_dict() for r_id, resume in self.resumes.items()}
-            with open(self.db_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            columns = [key for key in self.COLUMNS if key not in self.LAZY_COLUMNS]
+            rows = self.conn.execute(f"SELECT {', '.join(['id'] + columns)} FROM resumes").fetchall()
+            resumes = {}
+            for row in rows:
+                resume = self.from_row(row, columns)
+                resume.release(self.load_field)
+                resumes[row[0]] = resume
+            return resumes
         except Exception as e:
+            print(f"Error loading resume database: {e}")
+            return {}
+    
+    def load_field(self, resume_id, key):
+        """Read one lazy column of a stored resume"""
+        try:
+            with self.lock:
+                row = self.conn.execute(f'SELECT {key} FROM resumes WHERE id = ?', (resume_id,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error loading {key} for resume {resume_id}: {e}")
+            return None
+        value = self.decode(key, row[0]) if row else None
+        return {} if key == 'verification_results' and not value else value
+    
+    def get_resume_detail(self, resume_id):
+        """A fully loaded copy of a resume for detail pages and reports"""
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    f"SELECT {', '.join(['id'] + list(self.COLUMNS))} FROM resumes WHERE id = ?", (resume_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error loading resume {resume_id}: {e}")
+            return None
+        return self.from_row(row) if row else None
+    
+    def save_resumes(self):
+        """Write every in-memory resume in a single transaction.
+        
+        A row another process has since updated (higher version) is left alone
+        rather than overwritten with this process's stale copy.
+        """
+        assignments = ', '.join(f'{key} = excluded.{key}' for key in [*self.COLUMNS, *self.COUNT_COLUMNS])
+        try:
+            with metrics.time('db_save_all'), self.lock, self.conn:
+                self.conn.executemany(
+                    f"{self.insert_sql()} ON CONFLICT(id) DO UPDATE SET {assignments} "
+                    "WHERE excluded.version >= resumes.version",
+                    [self.to_row(resume) for resume in self.resumes.values()]
+                )
+        except sqlite3.Error as e:
             print(f"Error saving resume database: {e}")
     
+    def index_resume(self, resume):
+        for index in self.indexes:
+            index.upsert(resume)
+    
+    def insert(self, resume):
+        """INSERT one resume, moving it to a fresh id if another process already took its id"""
+        try:
+            self.conn.execute(self.insert_sql(), self.to_row(resume))
+        except sqlite3.IntegrityError:
+            if not self.conn.execute('SELECT 1 FROM resumes WHERE id = ?', (resume.id,)).fetchone():
+                raise
+            # This transaction holds the write lock, so ids past the largest stored one are free
+            highest = self.conn.execute('SELECT MAX(CAST(id AS INTEGER)) FROM resumes').fetchone()[0]
+            with Resume._id_lock:
+                Resume._last_id = max(Resume._last_id, highest or 0)
+            old_id, resume.id = resume.id, resume.generate_id()
+            self.conn.execute(self.insert_sql(), self.to_row(resume))
+            for table in ('resume_signatures', 'resume_bands'):
+                self.conn.execute(f'UPDATE {table} SET resume_id = ? WHERE resume_id = ?', (resume.id, old_id))
+    
     def add_resume(self, resume):
-        self.resumes[resume.id] = resume
-        self.save_resumes()
+        # Written first: the insert may change the id
+        with self.lock:
+            try:
+                with metrics.time('db_add'), self.conn:
+                    self.insert(resume)
+                saved = True
+            except sqlite3.Error as e:
+                print(f"Error saving resume {resume.id}: {e}")
+                saved = False
+            self.resumes[resume.id] = resume
+            self.index_resume(resume)
+            if saved:
+                resume.release(self.load_field)
         return resume.id
     
+    def add_resumes(self, resumes):
+        """Insert a batch of resumes in a single transaction"""
+        with self.lock:
+            try:
+                with metrics.time('db_add_batch'), self.conn:
+                    for resume in resumes:
+                        self.insert(resume)
+                saved = True
+            except sqlite3.Error as e:
+                print(f"Error saving resume batch: {e}")
+                saved = False
+            for resume in resumes:
+                self.resumes[resume.id] = resume
+                self.index_resume(resume)
+                if saved:
+                    resume.release(self.load_field)
+        return [resume.id for resume in resumes]
+    
     def get_resume(self, resume_id):
-        return self.resumes.get(resume_id)
+        if self.loaded:
+            return self.resumes.get(resume_id)
+        # Not loaded yet: read the one row rather than the whole table
+        columns = [key for key in self.COLUMNS if key not in self.LAZY_COLUMNS]
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    f"SELECT {', '.join(['id'] + columns)} FROM resumes WHERE id = ?", (resume_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error loading resume {resume_id}: {e}")
+            return None
+        if row is None:
+            return None
+        resume = self.from_row(row, columns)
+        resume.release(self.load_field)
+        return resume
+    
+    def count_resumes(self):
+        """Number of stored resumes, without loading them"""
+        if self.loaded:
+            return self.stats.total
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM resumes').fetchone()[0]
+    
+    def find_by_hash(self, content_hash):
+        """Return the resume previously stored for this file content, if any"""
+        row = self.conn.execute(
+            "SELECT id FROM resumes WHERE content_hash = ? AND status != 'error' "
+            "ORDER BY uploaded_at LIMIT 1",
+            (content_hash,)
+        ).fetchone()
+        if row and row[0] not in self.resumes:
+            self.sync()  # stored by another process
+        return self.resumes.get(row[0]) if row else None
+    
+    def find_identity_collisions(self, resume_id, parsed_data):
+        """Other resumes listing ``parsed_data``'s email or phone under a different identity, as ``[(resume_id, fields)]``"""
+        self.sync()  # include resumes other processes stored since the last request
+        with self.lock:
+            return self.identity_index.collisions(resume_id, parsed_data)
+    
+    def index_signature(self, resume_id, signature, threshold=None, max_candidates=1000):
+        """Add a resume's MinHash signature to the LSH index and return its near-duplicates.
+        
+        Candidates are the resumes sharing at least one LSH band with
+        ``signature``; those whose estimated similarity reaches ``threshold``
+        (``TEMPLATE_REUSE_THRESHOLD``) come back as ``[(resume_id, similarity)]``,
+        most similar first.
+        """
+        return self.index_signatures([(resume_id, signature)], threshold, max_candidates).get(resume_id, [])
+    
+    def index_signatures(self, pairs, threshold=None, max_candidates=1000):
+        """``index_signature`` for ``[(resume_id, signature)]`` in one transaction, as ``{resume_id: matches}``.
+        
+        Each signature is also matched against those earlier in ``pairs``.
+        """
+        from similarity import band_keys, similarity
+        threshold = Config.TEMPLATE_REUSE_THRESHOLD if threshold is None else threshold
+        pairs = list(pairs)
+        candidates = {}
+        try:
+            with self.lock, self.conn:
+                for resume_id, signature in pairs:
+                    keys = band_keys(signature)
+                    candidates[resume_id] = self.conn.execute(
+                        "SELECT resume_id, minhash FROM resume_signatures WHERE resume_id IN ("
+                        f"SELECT DISTINCT resume_id FROM resume_bands WHERE band_key IN ({', '.join('?' for _ in keys)}) "
+                        "AND resume_id != ? LIMIT ?)",
+                        keys + [resume_id, max_candidates]
+                    ).fetchall()
+                    if self.conn.execute('SELECT 1 FROM resume_signatures WHERE resume_id = ?', (resume_id,)).fetchone():
+                        self.conn.execute('DELETE FROM resume_bands WHERE resume_id = ?', (resume_id,))
+                    self.conn.execute(
+                        'INSERT OR REPLACE INTO resume_signatures (resume_id, minhash) VALUES (?, ?)', (resume_id, signature)
+                    )
+                    self.conn.executemany(
+                        'INSERT OR IGNORE INTO resume_bands (band_key, resume_id) VALUES (?, ?)',
+                        [(key, resume_id) for key in keys]
+                    )
+        except sqlite3.Error as e:
+            print(f"Error indexing signatures of {len(pairs)} resumes: {e}")
+            return {}
+        matches = {}
+        for resume_id, signature in pairs:
+            scored = [(other_id, similarity(signature, other)) for other_id, other in candidates[resume_id]]
+            matches[resume_id] = sorted((match for match in scored if match[1] >= threshold),
+                                        key=lambda match: -match[1])[:5]
+        return matches
+    
+    def increment_meta(self, counts):
+        """Add ``{key: amount}`` to integer counters in the meta table"""
+        try:
+            with self.lock, self.conn:
+                for key, amount in counts.items():
+                    self.conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES (?, '0')", (key,))
+                    self.conn.execute(
+                        'UPDATE meta SET value = CAST(value AS INTEGER) + ? WHERE key = ?', (amount, key)
+                    )
+        except sqlite3.Error as e:
+            print(f"Error updating counters: {e}")
+    
+    def record_cache_lookup(self, hit):
+        """Count an upload served from (hit) or added to (miss) the parse cache"""
+        self.increment_meta({'cache_hits' if hit else 'cache_misses': 1})
+    
+    def record_cache_lookups(self, hits, misses):
+        """Count a batch of parse cache lookups in one write"""
+        self.increment_meta({'cache_hits': hits, 'cache_misses': misses})
+    
+    def record_claim_cache(self, hits, misses):
+        """Count claim verdicts served from (hits) or added to (misses) the verification cache"""
+        self.increment_meta({'claim_cache_hits': hits, 'claim_cache_misses': misses})
+    
+    def save_bulk_job(self, job_id, status, files=None, report=None, error=None):
+        """Create or update a bulk upload job; it expires ``BULK_JOB_TTL`` seconds after its last update"""
+        now = datetime.now().timestamp()
+        try:
+            with self.lock, self.conn:
+                self.conn.execute('DELETE FROM bulk_jobs WHERE expires_at < ?', (now,))
+                self.conn.execute(
+                    'INSERT INTO bulk_jobs (id, status, files, report, error, expires_at) VALUES (?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT (id) DO UPDATE SET status = excluded.status, '
+                    'files = COALESCE(excluded.files, files), report = excluded.report, '
+                    'error = excluded.error, expires_at = excluded.expires_at',
+                    (job_id, status, files, json.dumps(report) if report is not None else None, error,
+                     now + Config.BULK_JOB_TTL)
+                )
+        except sqlite3.Error as e:
+            print(f"Error saving bulk job {job_id}: {e}")
+    
+    def get_bulk_job(self, job_id):
+        """A bulk upload job's status dict, with its report or error once done; None if unknown or expired"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT status, files, report, error FROM bulk_jobs WHERE id = ? AND expires_at >= ?',
+                (job_id, datetime.now().timestamp())
+            ).fetchone()
+        if row is None:
+            return None
+        job = {'job_id': job_id, 'status': row[0], 'files': row[1]}
+        if row[2] is not None:
+            job['report'] = json.loads(row[2])
+        if row[3] is not None:
+            job['error'] = row[3]
+        return job
+    
+    def get_cache_stats(self):
+        stats = {}
+        for prefix in ('cache', 'claim_cache'):
+            hits = int(self.get_meta(f'{prefix}_hits', 0))
+            misses = int(self.get_meta(f'{prefix}_misses', 0))
+            lookups = hits + misses
+            stats[f'{prefix}_hits'] = hits
+            stats[f'{prefix}_misses'] = misses
+            stats[f'{prefix}_hit_rate'] = round(hits / lookups * 100, 1) if lookups else 0
+        return stats
     
     def get_all_resumes(self):
-        return list(self.resumes.values())
+        with self.lock:
+            return list(self.resumes.values())
     
     def update_resume(self, resume_id, **kwargs):
-        if resume_id in self.resumes:
-            for key, value in kwargs.items():
-                setattr(self.resumes[resume_id], key, value)
-            self.save_resumes()
-            return True
-        return False
+        """Change fields of a stored resume; memory, indexes and the row change under the database lock"""
+        with self.lock:
+            if resume_id not in self.resumes:
+                self.sync()  # may have been added by another process
+            if resume_id in self.resumes:
+                resume = self.resumes[resume_id]
+                for key, value in kwargs.items():
+                    setattr(resume, key, value)
+                resume.version += 1
+                self.index_resume(resume)
+                columns = [key for key in kwargs if key in self.COLUMNS]
+                if 'parsed_data' in kwargs:
+                    columns.append('raw_text')
+                if columns:
+                    # The version is bumped in SQL so concurrent writers never reuse one
+                    values = [self.encode(key, self.column_value(resume, key)) for key in columns]
+                    if 'verification_results' in kwargs:
+                        columns.extend(self.COUNT_COLUMNS)
+                        values.extend(claim_counts(resume.verification_results))
+                    assignments = ', '.join([f'{key} = ?' for key in columns] + ['version = version + 1'])
+                    try:
+                        with metrics.time('db_update'), self.conn:
+                            self.conn.execute(
+                                f'UPDATE resumes SET {assignments} WHERE id = ?', values + [resume_id]
+                            )
+                            row = self.conn.execute('SELECT version FROM resumes WHERE id = ?', (resume_id,)).fetchone()
+                        if row:
+                            resume.version = row[0]
+                        resume.release(self.load_field)
+                    except sqlite3.Error as e:
+                        print(f"Error saving resume {resume_id}: {e}")
+                return True
+            return False
     
     def get_stats(self):
-        resumes = list(self.resumes.values())
-        total = len(resumes)
+        """Dashboard counters, maintained incrementally by DashboardStats"""
+        with self.lock:
+            stats = self.stats.as_dict()
+        return {**stats, **self.get_cache_stats()}
         
-        if total == 0:
-            return {
-                'total_resumes': 0,
-                'completed': 0,
-                'pending': 0,
-                'avg_trust_score': 0,
-                'verification_rate': 0,
-                'fraud_alerts': 0
-            }
+    def search_resumes(self, query='', trust_filter='all', status_filter='all',
+                       offset=0, limit=None, after=None, sort='uploaded_at'):
+        """Return ``(total, resumes)`` for one page of matches.
         
-        completed = sum(1 for r in resumes if r.status == 'completed')
-        pending = sum(1 for r in resumes if r.status in ['pending', 'processing'])
-        avg_trust = sum(r.trust_score for r in resumes if r.status == 'completed') / max(completed, 1)
-        fraud_alerts = sum(len(r.flags) for r in resumes)
+        Best matches come first, then resumes are ordered by ``sort``
+        (``uploaded_at`` or ``trust_score``, descending). ``after`` is the id of
+        the last resume of the previous page (keyset pagination) and takes
+        precedence over ``offset``; an unknown id raises KeyError.
+        """
+        # The index sets are live; read them under the same lock writers hold
+        with self.lock:
+            index = self.sorted_indexes[sort]
+            tiers = self.search_index.search(query, trust_filter, status_filter) or [None]
+            total = len(self.resumes) if tiers == [None] else sum(len(tier) for tier in tiers)
         
-        return {
-            'total_resumes': total,
-            'completed': completed,
-            'pending': pending,
-            'avg_trust_score': round(avg_trust, 1),
-            'verification_rate': round((completed / total) * 100, 1) if total > 0 else 0,
-            'fraud_alerts': fraud_alerts
-        }
+            # Resume from the cursor's tier, below the cursor's position
+            before = None
+            cursor_tier = None
+            if after is not None:
+                before = index.positions.get(after)
+                if before is None:
+                    raise KeyError(after)
+                offset = 0
+                for i, tier in enumerate(tiers):
+                    if tier is None or after in tier:
+                        tiers = tiers[i:]
+                        cursor_tier = 0
+                        break
+            
+            wanted = None if limit is None else offset + limit
+            ids = []
+            for i, tier in enumerate(tiers):
+                need = None if wanted is None else wanted - len(ids)
+                if need == 0:
+                    break
+                tier_before = before if cursor_tier is None or i == cursor_tier else None
+                ids.extend(index.top(tier, need, tier_before))
+            return total, [self.resumes[r_id] for r_id in ids[offset:wanted]]
+    
+    def iter_search(self, query='', trust_filter='all', status_filter='all', sort='uploaded_at', batch_size=1000):
+        """Yield every match of ``search_resumes`` in order, fetching one page at a time.
+        
+        The query runs once. Each page continues below the sort index entry
+        ``(sort key, id)`` of the last resume yielded, which stays a valid
+        bound even if that resume is deleted or re-sorted meanwhile.
+        """
+        index = self.sorted_indexes[sort]
+        with self.lock:
+            tiers = self.search_index.search(query, trust_filter, status_filter) or [None]
+        for tier in tiers:
+            before = None
+            while True:
+                with self.lock:
+                    ids = index.top(tier, batch_size, before)
+                    page = [self.resumes[r_id] for r_id in ids]
+                    if ids:
+                        before = index.positions[ids[-1]]
+                yield from page
+                if len(ids) < batch_size:
+                    break
+    
+    def get_recent_resumes(self, limit=20):
+        """Newest resumes first, read from the upload-date index"""
+        with self.lock:
+            return [self.resumes[r_id] for r_id in self.sorted_indexes['uploaded_at'].top(limit=limit)]
+    
+    def get_top_skills(self, k=10):
+        with self.lock:
+            return self.stats.top_skills(k)
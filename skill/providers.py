@@ -0,0 +1,345 @@
+import asyncio
+import atexit
+import json
+import os
+import random
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from config import Config
+from matching import KeywordMatcher
+
+class ProviderError(Exception):
+    """A provider call failed in a way that is worth retrying"""
+
+CLAIM_TOKEN_PATTERN = re.compile(r'[a-z0-9+#.]+')
+
+def normalize_claim(text):
+    """Case- and punctuation-insensitive form of a claimed name ("Google, Inc" -> "google inc")"""
+    return ' '.join(token.strip('.') for token in CLAIM_TOKEN_PATTERN.findall((text or '').lower()) if token.strip('.'))
+
+class ClaimCache:
+    """Verification verdicts shared across resumes, keyed by category and normalized claim.
+    
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted past ``max_entries``. With ``path`` set the cache is loaded at
+    startup and written back (atomically) at most every ``save_interval``
+    seconds and at exit.
+    """
+    
+    def __init__(self, max_entries=None, ttl=None, path=None, save_interval=30):
+        self.max_entries = max_entries or Config.CLAIM_CACHE_SIZE
+        self.ttl = ttl or Config.CLAIM_CACHE_TTL
+        self.path = path
+        self.save_interval = save_interval
+        self.entries = OrderedDict()  # key -> (expires_at, verdict)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.saved_at = time.monotonic()
+        if path:
+            self.load()
+            atexit.register(self.save)
+    
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] < time.time():
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key, verdict):
+        with self.lock:
+            self.entries[key] = (time.time() + self.ttl, verdict)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.dirty = True
+            due = self.path and time.monotonic() - self.saved_at >= self.save_interval
+        if due:
+            self.save()
+    
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
+    
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Error loading claim cache: {e}")
+            return
+        now = time.time()
+        for key, (expires_at, verdict) in sorted(data.items(), key=lambda item: item[1][0]):
+            if expires_at > now:
+                self.entries[key] = (expires_at, verdict)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def save(self):
+        with self.lock:
+            if not self.path or not self.dirty:
+                return
+            data = {key: list(entry) for key, entry in self.entries.items()}
+            self.dirty = False
+            self.saved_at = time.monotonic()
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving claim cache: {e}")
+
+class TokenBucket:
+    """Rate limiter allowing ``rate`` calls per second with bursts up to ``capacity``.
+    
+    Callers reserve a token up front and sleep for however long the bucket is
+    overdrawn, so concurrent callers are spaced out instead of polling.
+    """
+    
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self):
+        """Take a token and return the seconds to wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+    
+    async def acquire(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+class VerificationProvider:
+    """Verifies claims of one category against an external source.
+    
+    Subclasses implement ``check(claim)`` (one request to the source) and
+    ``describe(claim)`` (the claim fields echoed in every result). ``verify``
+    wraps ``check`` with the provider's connection pool (at most ``pool_size``
+    requests in flight), rate limit, per-request timeout and jittered retries;
+    a claim that still fails comes back as ``needs_review`` with the error.
+    """
+    
+    def __init__(self, pool_size=None, rate_limit=None, timeout=None, retries=None, backoff=0.2):
+        self.pool_size = pool_size or Config.VERIFICATION_POOL_SIZE
+        rate_limit = Config.VERIFICATION_RATE_LIMIT if rate_limit is None else rate_limit
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.timeout = timeout or Config.VERIFICATION_REQUEST_TIMEOUT
+        self.retries = Config.VERIFICATION_RETRIES if retries is None else retries
+        self.backoff = backoff
+        self.pools = weakref.WeakKeyDictionary()  # event loop -> semaphore
+    
+    def pool(self):
+        """Semaphore bounding concurrent requests, one per event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self.pools.get(loop)
+        if semaphore is None:
+            semaphore = self.pools[loop] = asyncio.Semaphore(self.pool_size)
+        return semaphore
+    
+    def describe(self, claim):
+        return {}
+    
+    def cache_key(self, claim):
+        """Normalized claim identifying the verdict, or None if it must not be cached"""
+        return None
+    
+    async def check(self, claim, rng=None):
+        """One request to the source; ``rng`` is set in deterministic mode"""
+        raise NotImplementedError
+    
+    async def verify(self, claim, deadline=None, rng=None):
+        """Verify one claim; ``deadline`` (event loop time) caps every attempt"""
+        loop = asyncio.get_running_loop()
+        error = None
+        for attempt in range(self.retries + 1):
+            timeout = self.timeout
+            if deadline is not None:
+                timeout = min(timeout, deadline - loop.time())
+                if timeout <= 0:
+                    error = 'verification deadline exceeded'
+                    break
+            try:
+                async with self.pool():
+                    if self.bucket is not None:
+                        await self.bucket.acquire()
+                    return await asyncio.wait_for(self.check(claim, rng), timeout)
+            except asyncio.TimeoutError:
+                error = f"timed out after {timeout:.1f}s"
+            except (ProviderError, OSError) as e:
+                error = str(e)
+            if attempt < self.retries:
+                await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+        return {**self.describe(claim), 'status': 'needs_review', 'confidence': 0, 'error': error}
+
+class StubProvider(VerificationProvider):
+    """Offline provider answering from a local table; ``latency`` simulates a network round trip.
+    
+    ``lookup`` draws its demo randomness from ``rng``: the global ``random``
+    module normally, a per-claim seeded generator in deterministic mode.
+    Only claims found in the table get a deterministic (``verified``)
+    verdict, so only those have a cache key; a random verdict for an unknown
+    or placeholder claim ("University Name") must not be shared.
+    """
+    
+    def __init__(self, records=None, latency=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.records = self.RECORDS if records is None else records
+        self.latency = latency
+        self.matcher = KeywordMatcher(list(self.records))  # known names, compiled once
+    
+    async def check(self, claim, rng=None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.lookup(claim, rng or random)
+    
+    def lookup(self, claim, rng):
+        raise NotImplementedError
+    
+    def known(self, name):
+        """Whether ``name`` matches a record of the local table"""
+        return bool(self.matcher.find(name or ''))
+
+class SkillStubProvider(StubProvider):
+    """Skills checked against mock GitHub/LeetCode activity"""
+    
+    RECORDS = {
+        'python': {'github_repos': 45, 'leetcode_solved': 120},
+        'javascript': {'github_repos': 32, 'leetcode_solved': 85},
+        'react': {'github_repos': 28, 'projects': 15},
+        'node.js': {'github_repos': 22, 'npm_packages': 3},
+        'machine learning': {'kaggle_competitions': 5, 'papers': 2}
+    }
+    
+    def describe(self, skill):
+        return {'skill': skill}
+    
+    def cache_key(self, skill):
+        return normalize_claim(skill) if skill.lower() in self.records else None
+    
+    def lookup(self, skill, rng):
+        skill_lower = skill.lower()
+        verification_status = 'verified' if skill_lower in self.records else 'unverified'
+        
+        # Add some randomness for demo purposes
+        if verification_status == 'unverified':
+            verification_status = rng.choice(['unverified', 'needs_review']) if rng.random() > 0.7 else 'unverified'
+        
+        return {
+            'skill': skill,
+            'status': verification_status,
+            'evidence': self.records.get(skill_lower, {}),
+            'confidence': rng.randint(60, 95) if verification_status == 'verified' else rng.randint(20, 60)
+        }
+
+class CompanyStubProvider(StubProvider):
+    """Work experience checked against mock company records"""
+    
+    RECORDS = {
+        'google': True, 'microsoft': True, 'amazon': True, 'apple': True,
+        'meta': True, 'netflix': True, 'uber': True, 'airbnb': True
+    }
+    
+    def describe(self, exp):
+        return {'company': exp.get('company'), 'position': exp.get('position'), 'years': exp.get('years')}
+    
+    def cache_key(self, exp):
+        return normalize_claim(exp.get('company')) if self.known(exp.get('company')) else None
+    
+    def lookup(self, exp, rng):
+        is_verified = self.known(exp.get('company'))
+        
+        status = 'verified' if is_verified else 'needs_review'
+        if not is_verified and rng.random() > 0.8:
+            status = 'flagged'
+        
+        return {
+            **self.describe(exp),
+            'status': status,
+            'confidence': rng.randint(70, 95) if status == 'verified' else rng.randint(30, 70)
+        }
+
+class InstitutionStubProvider(StubProvider):
+    """Education checked against mock institution registries"""
+    
+    RECORDS = {
+        'mit': True, 'stanford': True, 'harvard': True, 'berkeley': True,
+        'carnegie mellon': True, 'caltech': True, 'georgia tech': True
+    }
+    
+    def describe(self, edu):
+        return {'degree': edu.get('degree'), 'institution': edu.get('institution'), 'year': edu.get('year')}
+    
+    def cache_key(self, edu):
+        return normalize_claim(edu.get('institution')) if self.known(edu.get('institution')) else None
+    
+    def lookup(self, edu, rng):
+        is_verified = self.known(edu.get('institution'))
+        
+        status = 'verified' if is_verified else 'needs_review'
+        if not is_verified and rng.random() > 0.9:
+            status = 'flagged'
+        
+        return {
+            **self.describe(edu),
+            'status': status,
+            'confidence': rng.randint(75, 98) if status == 'verified' else rng.randint(40, 75)
+        }
+
+class CertificationStubProvider(StubProvider):
+    """Certifications checked against a simulated blockchain ledger.
+    
+    Not cached: the ledger entry (``blockchain_hash``) belongs to one holder,
+    so another resume listing the same certification needs its own lookup.
+    """
+    
+    RECORDS = {}
+    
+    def describe(self, cert):
+        return {'name': cert.get('name'), 'issuer': cert.get('issuer'), 'year': cert.get('year')}
+    
+    def lookup(self, cert, rng):
+        # Simulate blockchain verification
+        rand_val = rng.random()
+        if rand_val < 0.6:
+            status = 'verified'
+        elif rand_val < 0.9:
+            status = 'needs_review'
+        else:
+            status = 'flagged'
+        
+        return {
+            **self.describe(cert),
+            'status': status,
+            'blockchain_hash': f"0x{rng.randint(100000, 999999):x}" if status == 'verified' else None,
+            'confidence': rng.randint(80, 99) if status == 'verified' else rng.randint(25, 80)
+        }
+
+def stub_providers(**kwargs):
+    """Offline providers for every claim category"""
+    return {
+        'skills': SkillStubProvider(**kwargs),
+        'experience': CompanyStubProvider(**kwargs),
+        'education': InstitutionStubProvider(**kwargs),
+        'certifications': CertificationStubProvider(**kwargs),
+    }
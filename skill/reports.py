@@ -0,0 +1,259 @@
+import csv
+import functools
+import io
+import json
+import multiprocessing
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from config import Config
+from models import Resume
+
+@functools.lru_cache(maxsize=None)
+def report_styles():
+    """Paragraph and table styles, built once on first render.
+
+    ReportLab is imported here rather than at module level so importing the
+    app does not pay for it until a report is requested.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    styles = getSampleStyleSheet()
+    info_table_style = [
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8f9fa')),
+    ]
+    return {
+        'normal': styles['Normal'],
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            textColor=colors.HexColor('#2c5530'),
+            spaceAfter=30,
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#2c5530'),
+            spaceBefore=20,
+            spaceAfter=10,
+        ),
+        'footer': ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey),
+        'info_table': TableStyle(info_table_style),
+        # Trust-score cell styling, one per status
+        'trust_tables': {
+            status: TableStyle(info_table_style + [
+                ('TEXTCOLOR', (1, 1), (1, 1), color),
+                ('FONTNAME', (1, 1), (1, 1), 'Helvetica-Bold'),
+            ])
+            for status, color in (('VERIFIED', colors.green), ('REVIEW REQUIRED', colors.orange),
+                                  ('FLAGGED', colors.red))
+        },
+    }
+
+def generate_resume_pdf_report(resume):
+    """Generate PDF report for a resume"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+    style = report_styles()
+    title_style, heading_style, footer_style = style['title'], style['heading'], style['footer']
+    
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    story = []
+    
+    # Title
+    story.append(Paragraph("SkillCred Resume Verification Report", title_style))
+    story.append(Spacer(1, 20))
+    
+    # Basic Info
+    parsed_data = resume.summary or {}
+    story.append(Paragraph("Candidate Information", heading_style))
+    
+    basic_info = [
+        ['Name:', parsed_data.get('name', 'Unknown')],
+        ['Email:', parsed_data.get('email', 'No email provided')],
+        ['Filename:', resume.filename],
+        ['Upload Date:', resume.uploaded_at.strftime('%Y-%m-%d %H:%M:%S')],
+    ]
+    
+    basic_table = Table(basic_info, colWidths=[2*inch, 4*inch])
+    basic_table.setStyle(style['info_table'])
+    story.append(basic_table)
+    story.append(Spacer(1, 20))
+    
+    # Verification Results
+    story.append(Paragraph("Verification Results", heading_style))
+    
+    # Trust Score with color coding
+    status = 'VERIFIED' if resume.trust_score >= 80 else 'REVIEW REQUIRED' if resume.trust_score >= 60 else 'FLAGGED'
+    
+    verification_info = [
+        ['Trust Score:', f"{resume.trust_score}%"],
+        ['Status:', status],
+        ['Flags Count:', str(len(resume.flags))],
+    ]
+    
+    verification_table = Table(verification_info, colWidths=[2*inch, 4*inch])
+    verification_table.setStyle(style['trust_tables'][status])
+    story.append(verification_table)
+    story.append(Spacer(1, 20))
+    
+    # Skills
+    if parsed_data.get('skills'):
+        story.append(Paragraph("Skills", heading_style))
+        skills_text = ', '.join(parsed_data.get('skills', []))
+        story.append(Paragraph(skills_text, style['normal']))
+        story.append(Spacer(1, 15))
+    
+    # Flags (if any)
+    if resume.flags:
+        story.append(Paragraph("Verification Flags", heading_style))
+        for flag in resume.flags:
+            story.append(Paragraph(f"• {flag}", style['normal']))
+        story.append(Spacer(1, 15))
+    
+    # Experience
+    if parsed_data.get('experience'):
+        story.append(Paragraph("Work Experience", heading_style))
+        for exp in parsed_data.get('experience', []):
+            exp_text = f"<b>{exp.get('title', 'Unknown Position')}</b> at {exp.get('company', 'Unknown Company')}"
+            if exp.get('duration'):
+                exp_text += f" ({exp.get('duration')})"
+            story.append(Paragraph(exp_text, style['normal']))
+            story.append(Spacer(1, 5))
+    
+    # Footer
+    story.append(Spacer(1, 30))
+    story.append(Paragraph("This report was generated by SkillCred - AI-Powered Resume Verification System", footer_style))
+    story.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", footer_style))
+    
+    # Build PDF
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+def render_report(resume_data):
+    """Pool task: render a report from ``Resume.to_dict()`` output to PDF bytes"""
+    return generate_resume_pdf_report(Resume.from_dict(resume_data)).getvalue()
+
+class ReportCache:
+    """LRU cache of rendered PDF reports keyed by resume id and version.
+    
+    ``update_resume`` bumps ``Resume.version``, so a changed resume misses the
+    cache and its stale entry ages out.
+    """
+    
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or Config.REPORT_CACHE_SIZE
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.executor = None
+    
+    def get(self, resume):
+        key = (resume.id, resume.version)
+        with self.lock:
+            pdf = self.entries.get(key)
+            if pdf is not None:
+                self.entries.move_to_end(key)
+        return pdf
+    
+    def put(self, resume, pdf):
+        with self.lock:
+            self.entries[(resume.id, resume.version)] = pdf
+            self.entries.move_to_end((resume.id, resume.version))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def render(self, resume):
+        """PDF bytes for ``resume``, rendered at most once per version"""
+        pdf = self.get(resume)
+        if pdf is None:
+            pdf = generate_resume_pdf_report(resume).getvalue()
+            self.put(resume, pdf)
+        return pdf
+    
+    def get_executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=Config.REPORT_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return self.executor
+    
+    def render_many(self, resumes):
+        """Yield ``(resume, pdf bytes)`` in order; cache misses render concurrently in a process pool"""
+        pending = {}
+        for resume in resumes:
+            if self.get(resume) is None:
+                pending[resume.id] = self.get_executor().submit(render_report, resume.to_dict(full=False))
+        for resume in resumes:
+            future = pending.get(resume.id)
+            if future is None:
+                yield resume, self.render(resume)
+            else:
+                pdf = future.result()
+                self.put(resume, pdf)
+                yield resume, pdf
+
+class StreamBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands written bytes back in chunks"""
+    
+    def __init__(self):
+        self.chunks = []
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def stream_zip(entries):
+    """Yield a ZIP archive of ``(name, bytes)`` entries as it is written"""
+    sink = StreamBuffer()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+            yield sink.drain()
+    yield sink.drain()
+
+def stream_csv(fields, rows, batch_size=500):
+    """Yield CSV text for ``rows`` (dicts keyed by ``fields``), header first, ``batch_size`` rows per chunk"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+    for count, row in enumerate(rows, 1):
+        writer.writerow({key: '; '.join(value) if isinstance(value, list) else value for key, value in row.items()})
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def stream_ndjson(rows, batch_size=500):
+    """Yield one JSON document per line for ``rows``, ``batch_size`` rows per chunk"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row, ensure_ascii=False))
+        if len(lines) >= batch_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
@@ -0,0 +1,144 @@
+import argparse
+import json
+import time
+from config import Config
+
+LOW_TRUST_FLAG_TYPE = 'low_trust_score'
+# Raised for a trust score below the threshold; low_trust_flag returns copies
+LOW_TRUST_FLAG = {
+    'type': LOW_TRUST_FLAG_TYPE,
+    'category': 'overall',
+    'severity': 'medium',
+    'message': 'Trust score is below the review threshold'
+}
+
+def claim_counts(verification_results):
+    """``(total, verified, flagged)`` claim counts of one resume's verification results"""
+    total = verified = flagged = 0
+    for items in (verification_results or {}).values():
+        if not isinstance(items, list):
+            continue  # summary counts stored alongside the categories
+        for item in items:
+            total += 1
+            status = item.get('status')
+            verified += status == 'verified'
+            flagged += status == 'flagged'
+    return total, verified, flagged
+
+def low_trust_flag(trust_score, threshold=None):
+    """The flag raised for a trust score below ``threshold`` (default ``DEFAULT_TRUST_THRESHOLD``), or None"""
+    threshold = Config.DEFAULT_TRUST_THRESHOLD if threshold is None else threshold
+    if trust_score >= threshold:
+        return None
+    return dict(LOW_TRUST_FLAG)
+
+# Rewrites a resume's flags without its threshold flag, then appends the new one (if any)
+RESCORE_SQL = f"""
+    UPDATE resumes SET
+        trust_score = ?,
+        flags = (
+            SELECT CASE WHEN ? IS NULL THEN kept ELSE json_insert(kept, '$[#]', json(?)) END
+            FROM (SELECT json_group_array(json(value)) AS kept FROM json_each(resumes.flags)
+                  WHERE json_extract(value, '$.type') IS NOT '{LOW_TRUST_FLAG_TYPE}')
+        ),
+        version = version + 1
+    WHERE id = ?
+"""
+
+def rescore(db, penalty=None, threshold=None, chunk_size=10000):
+    """Recompute trust scores and threshold flags for every completed resume in one vectorized pass.
+    
+    Reads the per-resume claim counts that ``ResumeDatabase`` keeps next to
+    the verification results, scores them with NumPy using the same formula
+    as ``VerificationEngine.calculate_trust_score``, and writes back only the
+    resumes whose score or threshold flag changed. Nothing is re-verified.
+    Returns a summary with the number of changed resumes and the new status
+    buckets.
+    """
+    import numpy as np
+    penalty = Config.FLAGGED_PENALTY if penalty is None else penalty
+    threshold = Config.DEFAULT_TRUST_THRESHOLD if threshold is None else threshold
+    timings = {}
+    
+    start = time.perf_counter()
+    ids = []
+    chunks = []
+    with db.lock:
+        cursor = db.conn.execute(f"""
+            SELECT id, COALESCE(claims_total, 0), COALESCE(claims_verified, 0), COALESCE(claims_flagged, 0),
+                   trust_score, instr(flags, '"{LOW_TRUST_FLAG_TYPE}"') > 0
+            FROM resumes WHERE status = 'completed'
+        """)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            ids.extend(row[0] for row in rows)
+            chunks.append(np.array([row[1:] for row in rows], dtype=np.float64))
+    columns = np.concatenate(chunks) if chunks else np.zeros((0, 5))
+    total, verified, flagged, old_score, old_flagged = columns.T
+    timings['load_seconds'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        base_score = np.where(total > 0, (verified / total) * 100, 0)
+    score = np.where(total > 0, np.round(np.maximum(0, base_score - flagged * penalty), 1), 0)
+    low = score < threshold
+    changed = np.flatnonzero((score != old_score) | (low != old_flagged.astype(bool)))
+    buckets = np.select([score >= 80, score >= 60], [0, 1], 2)
+    timings['score_seconds'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    flag = json.dumps(LOW_TRUST_FLAG)
+    changed_ids = [ids[i] for i in changed]
+    try:
+        for offset in range(0, len(changed), chunk_size):
+            params = []
+            for i in changed[offset:offset + chunk_size]:
+                flag_json = flag if low[i] else None
+                params.append((float(score[i]), flag_json, flag_json, ids[i]))
+            with db.lock, db.conn:
+                db.conn.executemany(RESCORE_SQL, params)
+    except Exception as e:
+        print(f"Error writing rescored resumes: {e}")
+    timings['write_seconds'] = time.perf_counter() - start
+    
+    # Resumes already in memory (e.g. in the web app) are re-read now; other processes sync
+    if db.loaded and changed_ids:
+        start = time.perf_counter()
+        with db.lock:
+            db.refresh(changed_ids)
+        timings['refresh_seconds'] = time.perf_counter() - start
+    
+    counts = np.bincount(buckets, minlength=3) if len(buckets) else [0, 0, 0]
+    return {
+        'resumes': len(ids),
+        'changed': len(changed_ids),
+        'penalty': penalty,
+        'threshold': threshold,
+        'verified': int(counts[0]),
+        'review': int(counts[1]),
+        'flagged': int(counts[2]),
+        'below_threshold': int(low.sum()),
+        **{key: round(value, 3) for key, value in timings.items()},
+    }
+
+def main():
+    """Command-line entry point: python scoring.py [--penalty N] [--threshold N]"""
+    from models import ResumeDatabase
+    arg_parser = argparse.ArgumentParser(description='Rescore every resume without re-verifying it')
+    # Unset options fall through to rescore, which reads the same Config values as upload-time scoring
+    arg_parser.add_argument('--penalty', type=float,
+                            help=f'points deducted per flagged claim (default FLAGGED_PENALTY, {Config.FLAGGED_PENALTY})')
+    arg_parser.add_argument('--threshold', type=float,
+                            help='trust score below which a resume is flagged for review '
+                                 f'(default DEFAULT_TRUST_THRESHOLD, {Config.DEFAULT_TRUST_THRESHOLD})')
+    args = arg_parser.parse_args()
+    
+    summary = rescore(ResumeDatabase(lazy=True), args.penalty, args.threshold)
+    print(f"Rescored {summary['resumes']} resumes, {summary['changed']} changed "
+          f"({summary['verified']} verified, {summary['review']} review, {summary['flagged']} flagged; "
+          f"{summary['below_threshold']} below {summary['threshold']}%)")
+
+if __name__ == '__main__':
+    main()
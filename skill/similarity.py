@@ -0,0 +1,70 @@
+import hashlib
+import re
+import zlib
+import numpy as np
+from config import Config
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+MERSENNE_PRIME = (1 << 61) - 1
+SHINGLE_CHUNK = 4096  # shingles hashed per vectorized step, bounds temporary memory
+
+def permutations(count=None, seed=1):
+    """The ``(a, b)`` coefficients of ``count`` hash permutations; fixed so signatures stay comparable"""
+    count = count or Config.MINHASH_PERMUTATIONS
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, MERSENNE_PRIME, size=count, dtype=np.uint64)
+    b = rng.randint(0, MERSENNE_PRIME, size=count, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+PERMUTATIONS = permutations()
+
+def shingles(text, size=3):
+    """32-bit hashes of the distinct ``size``-word shingles of ``text``"""
+    tokens = TOKEN_PATTERN.findall((text or '').lower())
+    if len(tokens) < size:
+        tokens = tokens and [' '.join(tokens)]
+        size = 1
+    return {zlib.crc32(' '.join(tokens[i:i + size]).encode('utf-8'))
+            for i in range(len(tokens) - size + 1)}
+
+def minhash(text):
+    """MinHash signature of ``text`` as bytes (``MINHASH_PERMUTATIONS`` uint32 values), or None for empty text"""
+    hashes = np.fromiter(shingles(text), dtype=np.uint64)
+    if not len(hashes):
+        return None
+    a, b = PERMUTATIONS
+    signature = np.full(len(a), MERSENNE_PRIME, dtype=np.uint64)
+    # a * h + b wraps around 64 bits; with a spread over [1, p) the result still mixes well
+    for start in range(0, len(hashes), SHINGLE_CHUNK):
+        chunk = hashes[start:start + SHINGLE_CHUNK][None, :]
+        np.minimum(signature, ((a * chunk + b) % MERSENNE_PRIME).min(axis=1), out=signature)
+    return (signature & 0xFFFFFFFF).astype('<u4').tobytes()
+
+def band_keys(signature, bands=None):
+    """LSH bucket keys: one signed 64-bit key per band of the signature.
+    
+    Two signatures share a bucket when a whole band matches, which happens
+    with high probability above a similarity of about
+    ``(1 / bands) ** (1 / rows per band)``, e.g. 0.7 for 16 bands of 8.
+    """
+    bands = bands or Config.MINHASH_BANDS
+    width = len(signature) // bands
+    return [int.from_bytes(hashlib.blake2b(bytes([band]) + signature[band * width:(band + 1) * width],
+                                           digest_size=8).digest(), 'little', signed=True)
+            for band in range(bands)]
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.mean(np.frombuffer(signature, dtype='<u4') == np.frombuffer(other, dtype='<u4')))
+
+def template_reuse_flag(matches):
+    """Flag for a resume whose text nearly matches other resumes ``[(resume_id, similarity), ...]``, or None"""
+    if not matches:
+        return None
+    return {
+        'type': 'template_reuse',
+        'category': 'document',
+        'severity': 'high',
+        'message': f"Text is {round(matches[0][1] * 100)}% similar to {len(matches)} other resume(s)",
+        'matches': [{'resume_id': resume_id, 'similarity': round(score, 3)} for resume_id, score in matches],
+    }
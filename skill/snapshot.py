@@ -0,0 +1,330 @@
+import argparse
+import fcntl
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from config import Config
+
+# Processing statuses stored as small integers; anything else maps to 'other'
+STATUSES = ['pending', 'processing', 'completed', 'error', 'other']
+COLUMNS = ('trust_score', 'status', 'uploaded_at', 'flag_count', 'skills')
+MANIFEST = 'manifest.json'
+BUILD_LOCK = 'build.lock'
+DAY = 24 * 60 * 60
+EPOCH = date(1970, 1, 1)
+
+SKILL_COUNTS_SQL = """
+    SELECT TRIM(value) AS skill FROM resumes, json_each(resumes.parsed_data, '$.skills')
+    WHERE json_valid(resumes.parsed_data) AND TRIM(value) != ''
+    GROUP BY skill ORDER BY COUNT(*) DESC, skill LIMIT ?
+"""
+
+ROWS_SQL = """
+    SELECT COALESCE(trust_score, 0), status, CAST(strftime('%s', uploaded_at) AS INTEGER),
+           CASE WHEN json_valid(flags) THEN json_array_length(flags) ELSE 0 END,
+           CASE WHEN json_valid(parsed_data) THEN json_extract(parsed_data, '$.skills') END
+    FROM resumes
+"""
+
+@contextmanager
+def build_lock(directory):
+    """Exclusive lock on ``directory``, held by one build at a time across processes"""
+    with open(os.path.join(directory, BUILD_LOCK), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+def build_snapshot(conn, directory, max_skills=None, chunk_size=10000):
+    """Write the columns of every stored resume to a new generation in ``directory`` and publish it.
+    
+    Reads only SQLite, never the in-memory store. Each column is an ``.npy``
+    file; ``skills`` holds one bitset row per resume over the ``max_skills``
+    (``SNAPSHOT_MAX_SKILLS``) most common skills, listed in the manifest.
+    Builds are serialized by ``build_lock``, so no build prunes a generation
+    another one is still writing. Returns the published manifest.
+    """
+    with build_lock(directory):
+        return write_generation(conn, directory, max_skills, chunk_size)
+
+def write_generation(conn, directory, max_skills, chunk_size):
+    """Build one generation and publish it; the caller holds ``build_lock``"""
+    import numpy as np
+    max_skills = max_skills or Config.SNAPSHOT_MAX_SKILLS
+    change = conn.execute('SELECT MAX(seq) FROM resume_changes').fetchone()[0] or 0
+    vocabulary = [skill for skill, in conn.execute(SKILL_COUNTS_SQL, (max_skills,))]
+    skill_ids = {skill: i for i, skill in enumerate(vocabulary)}
+    status_codes = {status: i for i, status in enumerate(STATUSES)}
+    
+    scalars = []
+    bit_rows, bit_ids = [], []
+    cursor = conn.execute(ROWS_SQL)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for trust_score, status, uploaded_at, flag_count, skills in rows:
+            row = len(scalars)
+            scalars.append((trust_score, status_codes.get(status, len(STATUSES) - 1), uploaded_at or 0, flag_count))
+            for skill in set(json.loads(skills) if skills else []):
+                skill_id = skill_ids.get(skill.strip()) if isinstance(skill, str) else None
+                if skill_id is not None:
+                    bit_rows.append(row)
+                    bit_ids.append(skill_id)
+    table = np.array(scalars, dtype=np.float64).reshape(-1, 4)
+    bits = np.zeros((len(scalars), max(1, (len(vocabulary) + 63) // 64)), dtype=np.uint64)
+    bit_ids = np.array(bit_ids, dtype=np.uint64)
+    np.bitwise_or.at(bits, (np.array(bit_rows, dtype=np.intp), (bit_ids >> np.uint64(6)).astype(np.intp)),
+                     np.uint64(1) << (bit_ids & np.uint64(63)))
+    columns = {
+        'trust_score': table[:, 0],
+        'status': table[:, 1].astype(np.uint8),
+        'uploaded_at': table[:, 2].astype(np.int64),
+        'flag_count': table[:, 3].astype(np.uint16),
+        'skills': bits,
+    }
+    
+    generation = f"{time.time_ns()}-{os.getpid()}"
+    path = os.path.join(directory, generation)
+    os.makedirs(path)
+    for name, values in columns.items():
+        np.save(os.path.join(path, f"{name}.npy"), values)
+    manifest = {
+        'generation': generation,
+        'built_at': time.time(),
+        'change': change,
+        'resumes': len(scalars),
+        'skills': vocabulary,
+    }
+    return publish(directory, manifest)
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error reading snapshot manifest: {e}")
+        return None
+
+def publish(directory, manifest):
+    """Point the manifest at ``manifest``'s generation unless a newer one is already published.
+    
+    Returns the manifest left published; a generation that lost to a newer
+    one is removed.
+    """
+    generation = manifest['generation']
+    published = read_manifest(directory)
+    if published is not None and published['generation'] >= generation:
+        shutil.rmtree(os.path.join(directory, generation), ignore_errors=True)
+        return published
+    temp_path = os.path.join(directory, f"{MANIFEST}.{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(temp_path, os.path.join(directory, MANIFEST))
+    prune_generations(directory, keep=generation)
+    return manifest
+
+def prune_generations(directory, keep):
+    """Remove generations older than the published ``keep``; processes still mapping one keep reading it until they reopen.
+    
+    Call only under ``build_lock``: newer directories may be builds in progress.
+    """
+    for name in os.listdir(directory):
+        if name < keep and os.path.isdir(os.path.join(directory, name)):
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+def week_start(days):
+    """Monday of the week holding each day number (days since 1970-01-01, a Thursday)"""
+    return days - (days + 3) % 7
+
+class Snapshot:
+    """One published generation, its columns memory-mapped read-only.
+    
+    Pages are shared through the OS page cache, so every worker process
+    scanning the same generation reads the same memory.
+    """
+    
+    def __init__(self, directory, manifest):
+        import numpy as np
+        self.manifest = manifest
+        self.skill_ids = {skill: i for i, skill in enumerate(manifest['skills'])}
+        path = os.path.join(directory, manifest['generation'])
+        for name in COLUMNS:
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r'))
+    
+    def __len__(self):
+        return len(self.status)
+    
+    def completed(self):
+        return self.status == STATUSES.index('completed')
+    
+    def has_skill(self, skill):
+        """Row mask of the resumes listing ``skill``; None if it is not in the snapshot's vocabulary"""
+        import numpy as np
+        skill_id = self.skill_ids.get(skill)
+        if skill_id is None:
+            return None
+        return (self.skills[:, skill_id // 64] & np.uint64(1 << (skill_id % 64))) != 0
+    
+    def skill_counts(self, chunk_size=8192):
+        """Resumes per skill id, counted from the bitsets a chunk of rows at a time"""
+        import numpy as np
+        counts = np.zeros(self.skills.shape[1] * 64, dtype=np.int64)
+        for start in range(0, len(self), chunk_size):
+            chunk = np.ascontiguousarray(self.skills[start:start + chunk_size])
+            counts += np.unpackbits(chunk.view(np.uint8), axis=1, bitorder='little').sum(axis=0, dtype=np.int64)
+        return counts[:len(self.skill_ids)]
+    
+    def top_skills(self, k=10):
+        import numpy as np
+        counts = self.skill_counts()
+        order = np.argsort(-counts, kind='stable')[:k]
+        return {self.manifest['skills'][i]: int(counts[i]) for i in order if counts[i]}
+    
+    def dashboard(self):
+        """The dashboard aggregates, computed over the columns"""
+        import numpy as np
+        completed = self.completed()
+        scores = np.asarray(self.trust_score[completed], dtype=np.float64)
+        total = len(self)
+        return {
+            'total_resumes': total,
+            'completed': int(completed.sum()),
+            'pending': int(np.isin(self.status, [STATUSES.index('pending'), STATUSES.index('processing')]).sum()),
+            'avg_trust_score': round(float(scores.mean()), 1) if len(scores) else 0,
+            'verification_rate': round(len(scores) / total * 100, 1) if total else 0,
+            'fraud_alerts': int(self.flag_count.sum(dtype=np.int64)),
+            # Same buckets as indexes.trust_bucket and indexes.status_bucket
+            'trust_score_distribution': np.bincount(3 - np.digitize(scores, [50, 70, 90]), minlength=4).tolist(),
+            'verification_status': np.bincount(2 - np.digitize(scores, [60, 80]), minlength=3).tolist(),
+        }
+    
+    def time_series(self, metric='uploads', bucket='day', since=None, until=None, skill=None):
+        """``[(period start date, value), ...]`` per day or week, oldest first.
+        
+        ``uploads`` counts every resume by upload date; ``avg_trust`` averages
+        completed resumes' trust scores. ``since``/``until`` are inclusive
+        ``datetime.date`` bounds and ``skill`` keeps only resumes listing it.
+        """
+        import numpy as np
+        days = self.uploaded_at // DAY
+        mask = np.ones(len(self), dtype=bool)
+        if since is not None:
+            mask &= days >= (since - EPOCH).days
+        if until is not None:
+            mask &= days <= (until - EPOCH).days
+        if skill is not None:
+            has_skill = self.has_skill(skill)
+            mask &= has_skill if has_skill is not None else False
+        if metric == 'avg_trust':
+            mask &= self.completed()
+        periods = days[mask]
+        if bucket == 'week':
+            periods = week_start(periods)
+        starts, inverse, counts = np.unique(periods, return_inverse=True, return_counts=True)
+        if metric == 'avg_trust':
+            sums = np.bincount(inverse, weights=self.trust_score[mask], minlength=len(starts))
+            values = np.round(sums / counts, 1).tolist()
+        else:
+            values = counts.tolist()
+        return [(str(np.datetime64(int(start), 'D')), value) for start, value in zip(starts, values)]
+
+class SnapshotStore:
+    """The snapshots in ``directory``: ``current`` opens the newest, ``refresh`` builds one when the store changed.
+    
+    ``start`` refreshes every ``SNAPSHOT_INTERVAL`` seconds from a background
+    thread with its own connection, so building never holds the web
+    process's database lock (except for in-memory databases).
+    """
+    
+    def __init__(self, directory=None, interval=None):
+        self.directory = directory or Config.SNAPSHOT_DIR
+        self.interval = interval or Config.SNAPSHOT_INTERVAL
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.manifest_mtime = None
+        self.refresher = None
+    
+    def read_manifest(self):
+        return read_manifest(self.directory)
+    
+    def current(self):
+        """The newest published snapshot (reopened when another process publishes one), or None"""
+        try:
+            mtime = os.stat(os.path.join(self.directory, MANIFEST)).st_mtime_ns
+        except OSError:
+            return None
+        with self.lock:
+            if mtime != self.manifest_mtime:
+                manifest = self.read_manifest()
+                if manifest is not None:
+                    try:
+                        self.snapshot = Snapshot(self.directory, manifest)
+                        self.manifest_mtime = mtime
+                    except (OSError, ValueError) as e:
+                        print(f"Error opening snapshot {manifest.get('generation')}: {e}")
+            return self.snapshot
+    
+    def refresh(self, conn, force=False):
+        """Build a new snapshot unless the published one exists and covers the latest change; returns the current one"""
+        os.makedirs(self.directory, exist_ok=True)
+        manifest = self.read_manifest()
+        change = conn.execute('SELECT MAX(seq) FROM resume_changes').fetchone()[0] or 0
+        if (force or manifest is None or manifest['change'] != change
+                or not os.path.isdir(os.path.join(self.directory, manifest['generation']))):
+            try:
+                build_snapshot(conn, self.directory)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Error building snapshot: {e}")
+        return self.current()
+    
+    def refresh_from(self, db, force=False):
+        """``refresh`` against ``db``'s file through a separate read connection"""
+        if db.db_path == ':memory:':
+            with db.lock:
+                return self.refresh(db.conn, force)
+        conn = sqlite3.connect(db.db_path, timeout=Config.DATABASE_BUSY_TIMEOUT)
+        try:
+            return self.refresh(conn, force)
+        finally:
+            conn.close()
+    
+    def start(self, db):
+        """Keep the snapshot fresh from a daemon thread; safe to call more than once"""
+        with self.lock:
+            if self.refresher is not None:
+                return
+            self.refresher = threading.Thread(target=self.run, args=(db,), daemon=True)
+        self.refresher.start()
+    
+    def run(self, db):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.refresh_from(db)
+            except Exception as e:
+                print(f"Error refreshing snapshot: {e}")
+
+def main():
+    """Command-line entry point: python snapshot.py [--force]"""
+    from models import ResumeDatabase
+    arg_parser = argparse.ArgumentParser(description='Build the columnar analytics snapshot')
+    arg_parser.add_argument('--force', action='store_true', help='rebuild even if nothing changed')
+    args = arg_parser.parse_args()
+    
+    store = SnapshotStore()
+    snapshot = store.refresh_from(ResumeDatabase(lazy=True), force=args.force)
+    if snapshot is not None:
+        print(f"Snapshot {snapshot.manifest['generation']}: {len(snapshot)} resumes, "
+              f"{len(snapshot.manifest['skills'])} skills in {store.directory}")
+
+if __name__ == '__main__':
+    main()
@@ -248,7 +248,12 @@ class SkillCredApp {
                 body: formData
             });
 
-            if (response.ok) {
+            if (response.status === 202) {
+                const job = await response.json();
+                fileData.results = await this.waitForJob(job.status_url);
+                fileData.status = 'completed';
+                fileData.progress = 100;
+            } else if (response.ok) {
                 const results = await response.json();
                 fileData.status = 'completed';
                 fileData.progress = 100;
@@ -265,6 +270,26 @@ class SkillCredApp {
 
         this.updateFileList();
     }
+    
+    async waitForJob(statusUrl, interval = 1000) {
+        // Poll the job status endpoint until the resume is processed
+        while (true) {
+            const response = await fetch(statusUrl);
+            if (!response.ok) {
+                throw new Error('Failed to fetch job status');
+            }
+            
+            const job = await response.json();
+            if (job.status === 'completed') {
+                return job;
+            }
+            if (job.status === 'error') {
+                throw new Error(job.error || 'Processing failed');
+            }
+            
+            await new Promise(resolve => setTimeout(resolve, interval));
+        }
+    }
 
     simulateProgress(fileData) {
         const interval = setInterval(() => {
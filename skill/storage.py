@@ -0,0 +1,165 @@
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+from config import Config
+
+try:
+    import magic
+except ImportError:  # optional; the built-in signatures below cover PDF and DOCX
+    magic = None
+
+CHUNK_SIZE = 64 * 1024
+
+DOCX_MIME_TYPES = {
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/zip',  # libmagic often can't tell DOCX from ZIP on the first chunk
+}
+
+class UnsupportedUpload(ValueError):
+    """The uploaded content is not a PDF or DOCX document"""
+
+def hash_file(file_path):
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def sniff_extension(head):
+    """``'pdf'``, ``'docx'`` or None for a file starting with ``head``.
+    
+    A MIME type libmagic gives that is neither (``application/octet-stream``
+    for a truncated head, a PDF with leading junk) falls back to the
+    signature check; DOCX uploads are confirmed by ``is_docx`` afterwards.
+    """
+    if magic is not None:
+        mime = magic.from_buffer(head, mime=True)
+        if mime == 'application/pdf':
+            return 'pdf'
+        if mime in DOCX_MIME_TYPES:
+            return 'docx'
+    if b'%PDF-' in head[:1024]:
+        return 'pdf'
+    return 'docx' if head.startswith(b'PK\x03\x04') else None
+    
+def is_docx(file):
+    """Whether ``file`` (a path or file object) is a ZIP holding a Word document"""
+    try:
+        with zipfile.ZipFile(file) as archive:
+            archive.getinfo('word/document.xml')
+        return True
+    except (zipfile.BadZipFile, KeyError):
+        return False
+
+def content_path(upload_folder, content_hash, extension):
+    """Content-addressed location of a stored upload: ``<folder>/<hash[:2]>/<hash>.<ext>``"""
+    return os.path.join(upload_folder, content_hash[:2], f"{content_hash}.{extension}")
+
+class SpooledUpload:
+    """An upload written in one pass while werkzeug parses the request body.
+    
+    ``SkillCredRequest`` hands werkzeug one of these as the stream of each
+    uploaded resume, so every chunk is sniffed, hashed and size-checked as it
+    arrives instead of being spooled by werkzeug and read back. The type is
+    sniffed once the first chunk is in, while it is still in memory, so junk
+    is rejected before anything is written and the rest of it is dropped.
+    The content stays in memory up to ``spool_size`` bytes and then spills to
+    a temp file in ``upload_folder``. ``finish`` raises ``UnsupportedUpload``
+    for a rejected upload; ``store`` moves it into the content-addressed
+    layout, and ``discard`` (or ``close``, at the end of the request) drops
+    it. Either way each upload reaches disk at most once, and a duplicate
+    small enough to stay in memory is never written at all.
+    """
+    
+    def __init__(self, upload_folder, spool_size=None, max_size=None):
+        self.upload_folder = upload_folder
+        self.spool_size = spool_size or Config.UPLOAD_SPOOL_SIZE
+        self.max_size = max_size or Config.MAX_CONTENT_LENGTH
+        self.buffer = io.BytesIO()
+        self.out = self.buffer
+        self.temp_path = None
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self.extension = None
+        self.content_hash = None
+        self.error = None
+    
+    def write(self, data):
+        if self.error is None and self.content_hash is None:
+            self.size += len(data)
+            if self.size > self.max_size:
+                self.reject(f'File is larger than {self.max_size // (1024 * 1024)}MB')
+            else:
+                self.digest.update(data)
+                self.out.write(data)
+                if self.extension is None and self.size >= CHUNK_SIZE:
+                    self.sniff()
+                if self.out is self.buffer and self.extension is not None and self.size > self.spool_size:
+                    self.out = self.spill()
+        return len(data)
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Called by werkzeug once the part is written; the content is only read back through ``store``"""
+        return 0
+    
+    def sniff(self):
+        self.extension = sniff_extension(self.buffer.getvalue()[:CHUNK_SIZE])
+        if self.extension is None:
+            self.reject('File content is not a PDF or DOCX document')
+    
+    def reject(self, message):
+        self.error = message
+        self.discard()
+    
+    def finish(self):
+        """Check the complete upload and return it; raises ``UnsupportedUpload`` if it was rejected"""
+        if self.error is None and self.content_hash is None:
+            if self.extension is None:
+                self.sniff()  # smaller than one chunk
+            if self.out is not self.buffer and self.out is not None:
+                self.out.close()
+            if self.error is None and self.extension == 'docx' and not is_docx(self.temp_path or self.buffer):
+                self.reject('File content is not a PDF or DOCX document')
+            if self.error is None:
+                self.content_hash = self.digest.hexdigest()
+        if self.error is not None:
+            raise UnsupportedUpload(self.error)
+        return self
+    
+    def spill(self):
+        """Continue on disk: copy what is buffered to a temp file and return it"""
+        fd, self.temp_path = tempfile.mkstemp(dir=self.upload_folder, suffix='.part')
+        out = os.fdopen(fd, 'wb')
+        out.write(self.buffer.getvalue())
+        self.buffer = None
+        return out
+    
+    def store(self):
+        """Move the upload to its content-addressed path (kept if already there) and return the path"""
+        file_path = content_path(self.upload_folder, self.content_hash, self.extension)
+        if os.path.exists(file_path):
+            self.discard()
+            return file_path
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        if self.temp_path is None:
+            fd, self.temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix='.part')
+            with os.fdopen(fd, 'wb') as out:
+                out.write(self.buffer.getvalue())
+            self.buffer = None
+        os.replace(self.temp_path, file_path)
+        self.temp_path = None
+        return file_path
+    
+    def discard(self):
+        if self.out is not self.buffer and self.out is not None:
+            self.out.close()
+        self.buffer = self.out = None
+        if self.temp_path and os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+        self.temp_path = None
+    
+    def close(self):
+        self.discard()
@@ -0,0 +1,27 @@
+from config import Config
+from models import ResumeDatabase
+
+
+def test_bulk_job_is_visible_to_other_connections(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'resumes.db'}"
+    writer = ResumeDatabase(database_url, json_file=None)
+    reader = ResumeDatabase(database_url, json_file=None)
+    
+    writer.save_bulk_job('bulk_1', 'pending', files=3)
+    assert reader.get_bulk_job('bulk_1') == {'job_id': 'bulk_1', 'status': 'pending', 'files': 3}
+    
+    writer.save_bulk_job('bulk_1', 'completed', report={'ingested': 3, 'errors': []})
+    assert reader.get_bulk_job('bulk_1') == {
+        'job_id': 'bulk_1', 'status': 'completed', 'files': 3, 'report': {'ingested': 3, 'errors': []},
+    }
+
+
+def test_bulk_jobs_expire(tmp_path, monkeypatch):
+    db = ResumeDatabase(f"sqlite:///{tmp_path / 'resumes.db'}", json_file=None)
+    monkeypatch.setattr(Config, 'BULK_JOB_TTL', -1)
+    db.save_bulk_job('bulk_old', 'completed', files=1, report={})
+    monkeypatch.setattr(Config, 'BULK_JOB_TTL', 60)
+    db.save_bulk_job('bulk_new', 'pending', files=1)
+    
+    assert db.get_bulk_job('bulk_old') is None
+    assert db.conn.execute('SELECT id FROM bulk_jobs').fetchall() == [('bulk_new',)]
@@ -0,0 +1,36 @@
+import providers
+from providers import ClaimCache, stub_providers
+from verification import VerificationEngine
+
+
+def resume(institution):
+    return {'skills': [], 'experience': [], 'certifications': [],
+            'education': [{'degree': 'Bachelor', 'institution': institution, 'year': '2020'}]}
+
+
+def engine():
+    return VerificationEngine(stub_providers(retries=0), cache=ClaimCache(), deterministic=False)
+
+
+def test_unknown_institution_verdict_is_not_shared(monkeypatch):
+    draws = iter([0.95, 0.0])  # flagged for the first resume, needs_review for the second
+    monkeypatch.setattr(providers.random, 'random', lambda: next(draws))
+    verifier = engine()
+    
+    first, _, _ = verifier.verify_claims(resume('University Name'))
+    second, _, _ = verifier.verify_claims(resume('University Name'))
+    
+    assert first['education'][0]['status'] == 'flagged'
+    assert second['education'][0]['status'] == 'needs_review'
+    assert not [key for key in verifier.cache.entries if key.startswith('education:')]
+
+
+def test_known_institution_is_cached():
+    verifier = engine()
+    
+    first, _, _ = verifier.verify_claims(resume('MIT'))
+    second, _, _ = verifier.verify_claims(resume('MIT'))
+    
+    assert first['education'][0]['status'] == second['education'][0]['status'] == 'verified'
+    assert list(verifier.cache.entries) == ['education:mit']
+    assert verifier.cache_stats()['hits'] == 1
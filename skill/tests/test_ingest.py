@@ -0,0 +1,17 @@
+from ingest import ingest_files
+from models import ResumeDatabase
+
+
+def test_cache_lookups_are_counted_in_one_write(tmp_path, monkeypatch):
+    db = ResumeDatabase(f"sqlite:///{tmp_path / 'resumes.db'}", json_file=None)
+    writes = []
+    monkeypatch.setattr(db, 'increment_meta', writes.append)
+    file_paths = []
+    for name, content in (('a.txt', b'first'), ('b.txt', b'first'), ('c.txt', b'second')):
+        (tmp_path / name).write_bytes(content)
+        file_paths.append(str(tmp_path / name))
+    
+    report = ingest_files(file_paths, db, workers=1)
+    
+    assert report['duplicates'] == 1
+    assert [counts for counts in writes if 'cache_hits' in counts] == [{'cache_hits': 1, 'cache_misses': 2}]
@@ -0,0 +1,76 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+
+import pytest
+
+import jobs
+from jobs import UploadPipeline
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.updates = []
+    
+    def update_resume(self, resume_id, **kwargs):
+        self.updates.append((resume_id, kwargs.get('status')))
+
+
+class FakeExecutor:
+    def __init__(self, broken=False):
+        self.broken = broken
+        self.shut_down = False
+    
+    def submit(self, *args):
+        if self.broken:
+            raise BrokenProcessPool('a worker process terminated abruptly')
+        return Future()
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def pipeline(monkeypatch, replacement):
+    monkeypatch.setattr(jobs, 'ProcessPoolExecutor', lambda **kwargs: replacement)
+    upload_pipeline = UploadPipeline(FakeDatabase(), workers=1, max_queue=10, timeout=60)
+    upload_pipeline.watchdog = object()  # no deadline thread in tests
+    return upload_pipeline
+
+
+def resume(resume_id='1'):
+    return SimpleNamespace(id=resume_id, file_path='resume.pdf', content_hash='hash')
+
+
+def test_broken_pool_is_replaced_and_submit_retried(monkeypatch):
+    broken = FakeExecutor(broken=True)
+    upload_pipeline = pipeline(monkeypatch, FakeExecutor())
+    upload_pipeline.executor = broken
+    
+    upload_pipeline.submit(resume())
+    
+    assert broken.shut_down
+    assert upload_pipeline.executor is not broken
+    assert upload_pipeline.db.updates == [('1', 'processing')]
+    assert '1' in upload_pipeline.jobs
+
+
+def test_failed_submit_does_not_leave_resume_processing(monkeypatch):
+    upload_pipeline = pipeline(monkeypatch, FakeExecutor(broken=True))
+    upload_pipeline.executor = FakeExecutor(broken=True)
+    
+    with pytest.raises(BrokenProcessPool):
+        upload_pipeline.submit(resume())
+    
+    assert upload_pipeline.db.updates == [('1', 'error')]
+    assert upload_pipeline.get_error('1').startswith('Worker pool unavailable')
+    assert not upload_pipeline.jobs
+
+
+def test_error_messages_are_capped(monkeypatch):
+    upload_pipeline = pipeline(monkeypatch, FakeExecutor())
+    monkeypatch.setattr(UploadPipeline, 'MAX_ERRORS', 3)
+    
+    for resume_id in '12345':
+        upload_pipeline.fail(resume_id, f'error {resume_id}')
+    
+    assert list(upload_pipeline.errors) == ['3', '4', '5']
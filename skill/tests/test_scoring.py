@@ -0,0 +1,39 @@
+import sys
+
+import models
+import scoring
+from models import Resume, ResumeDatabase
+from verification import VerificationEngine
+
+PARSED = {
+    'skills': ['Python', 'React', 'Rust', 'Haskell', 'COBOL'],
+    'experience': [{'company': 'Google', 'position': 'Engineer', 'years': 2},
+                   {'company': 'Initech', 'position': 'Engineer', 'years': 3},
+                   {'company': 'Globex', 'position': 'Analyst', 'years': 1}],
+    'education': [{'degree': 'Bachelor', 'institution': 'University Name', 'year': '2020'}],
+    'certifications': [],
+}
+
+
+def test_rescore_reproduces_upload_trust_scores(tmp_path, monkeypatch, capsys):
+    db = ResumeDatabase(f"sqlite:///{tmp_path / 'resumes.db'}", json_file=None)
+    verifier = VerificationEngine(deterministic=True)
+    scores = {}
+    flagged_claims = 0
+    for seed in range(40):
+        results, flags, trust_score = verifier.verify_claims(PARSED, seed=str(seed))
+        resume = Resume(f'resume_{seed}.pdf', f'resume_{seed}.pdf')
+        resume_id = db.add_resume(resume)
+        db.update_resume(resume_id, parsed_data=PARSED, verification_results=results,
+                         trust_score=trust_score, flags=flags, status='completed')
+        scores[resume_id] = trust_score
+        flagged_claims += sum(item.get('status') == 'flagged' for items in results.values() for item in items)
+    
+    # The command line with its default penalty and threshold
+    monkeypatch.setattr(models, 'ResumeDatabase', lambda lazy: db)
+    monkeypatch.setattr(sys, 'argv', ['scoring.py'])
+    scoring.main()
+    
+    assert flagged_claims  # the penalty is exercised
+    assert f"Rescored {len(scores)} resumes, 0 changed" in capsys.readouterr().out
+    assert {resume_id: db.get_resume(resume_id).trust_score for resume_id in scores} == scores
@@ -0,0 +1,21 @@
+from models import ResumeDatabase
+from similarity import minhash
+
+TEXT = ' '.join(f"built service {i} with python and postgres for team {i % 7}" for i in range(60))
+
+
+def test_index_signatures_writes_a_batch_in_one_transaction(tmp_path):
+    db = ResumeDatabase(f"sqlite:///{tmp_path / 'resumes.db'}", json_file=None)
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    
+    matches = db.index_signatures([
+        ('1', minhash(TEXT)),
+        ('2', minhash(TEXT + ' jane doe')),
+        ('3', minhash('an unrelated resume about accounting and audit work ' * 20)),
+    ])
+    
+    assert [resume_id for resume_id, _ in matches['2']] == ['1']
+    assert matches['1'] == matches['3'] == []
+    assert len([sql for sql in statements if sql.strip().upper().startswith('BEGIN')]) == 1
+    assert db.conn.execute('SELECT COUNT(*) FROM resume_signatures').fetchone()[0] == 3
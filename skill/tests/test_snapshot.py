@@ -0,0 +1,50 @@
+import os
+import shutil
+
+from models import Resume, ResumeDatabase
+from snapshot import MANIFEST, SnapshotStore, build_snapshot, publish
+
+
+def database(tmp_path):
+    db = ResumeDatabase(f"sqlite:///{tmp_path / 'resumes.db'}", json_file=None)
+    resume = Resume('resume.pdf', str(tmp_path / 'resume.pdf'))
+    resume.status = 'completed'
+    resume.trust_score = 80
+    resume.parsed_data = {'skills': ['Python']}
+    db.add_resume(resume)
+    return db
+
+
+def test_older_build_does_not_replace_newer_generation(tmp_path):
+    newer = {'generation': '2000-2', 'change': 2}
+    older = {'generation': '1000-1', 'change': 1}
+    for manifest in (newer, older):
+        os.makedirs(tmp_path / manifest['generation'])
+    
+    assert publish(str(tmp_path), newer) == newer
+    assert publish(str(tmp_path), older) == newer
+    assert sorted(os.listdir(tmp_path)) == ['2000-2', MANIFEST]
+
+
+def test_publish_keeps_builds_in_progress(tmp_path):
+    os.makedirs(tmp_path / '1000-1')
+    os.makedirs(tmp_path / '3000-3')  # still being written by another build
+    os.makedirs(tmp_path / '2000-2')
+    
+    publish(str(tmp_path), {'generation': '2000-2', 'change': 2})
+    
+    assert sorted(os.listdir(tmp_path)) == ['2000-2', '3000-3', MANIFEST]
+
+
+def test_refresh_rebuilds_missing_generation(tmp_path):
+    db = database(tmp_path)
+    directory = str(tmp_path / 'snapshot')
+    os.makedirs(directory)
+    manifest = build_snapshot(db.conn, directory)
+    shutil.rmtree(os.path.join(directory, manifest['generation']))
+    
+    snapshot = SnapshotStore(directory).refresh(db.conn)
+    
+    assert snapshot is not None
+    assert snapshot.manifest['generation'] != manifest['generation']
+    assert len(snapshot) == 1
@@ -0,0 +1,57 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from storage import CHUNK_SIZE, SpooledUpload, UnsupportedUpload
+
+PDF = b'%PDF-1.4\n' + b'x' * (3 * CHUNK_SIZE)
+
+
+def write(upload, content, chunk_size=1000):
+    for start in range(0, len(content), chunk_size):
+        upload.write(content[start:start + chunk_size])
+    upload.seek(0)
+    return upload
+
+
+def test_junk_is_rejected_before_anything_is_written(tmp_path):
+    upload = write(SpooledUpload(str(tmp_path), spool_size=CHUNK_SIZE), b'junk' * CHUNK_SIZE)
+    
+    with pytest.raises(UnsupportedUpload):
+        upload.finish()
+    assert os.listdir(tmp_path) == []
+
+
+def test_large_upload_spills_once_and_is_stored(tmp_path):
+    upload = write(SpooledUpload(str(tmp_path), spool_size=CHUNK_SIZE), PDF).finish()
+    
+    path = upload.store()
+    upload.close()
+    
+    assert upload.extension == 'pdf'
+    with open(path, 'rb') as f:
+        assert f.read() == PDF
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.part')] == []
+
+
+def test_small_docx_stays_in_memory(tmp_path):
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, 'w') as archive:
+        archive.writestr('word/document.xml', '<w:document/>')
+    
+    upload = write(SpooledUpload(str(tmp_path)), content.getvalue()).finish()
+    
+    assert upload.extension == 'docx'
+    assert upload.temp_path is None
+    upload.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_oversized_upload_is_rejected(tmp_path):
+    upload = write(SpooledUpload(str(tmp_path), spool_size=CHUNK_SIZE, max_size=CHUNK_SIZE * 2), PDF)
+    
+    with pytest.raises(UnsupportedUpload, match='larger than'):
+        upload.finish()
+    assert os.listdir(tmp_path) == []
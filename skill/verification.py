@@ -1,67 +1,228 @@
+import asyncio
+import hashlib
 import re
 import json
-from docx import Document
-import PyPDF2
+import os
 from datetime import datetime
 import random
+import threading
+import time
+from functools import cached_property
+from config import Config
+from matching import KeywordMatcher
+from providers import ClaimCache, stub_providers
+from scoring import claim_counts, low_trust_flag
+
+# Compiled once at import and shared by every ResumeParser
+PATTERNS = {
+    'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    'phone': re.compile(r'[\+]?[1-9]?[0-9]{7,12}'),
+    'year': re.compile(r'(20\d{2}|19\d{2})'),
+}
+
+COMPANY_PATTERNS = [
+    re.compile(r'(\w+\s+(?:Inc|LLC|Corp|Corporation|Company|Ltd|Limited|Technologies|Tech|Solutions|Systems|Group))', re.IGNORECASE),
+    re.compile(r'at\s+([A-Z][a-zA-Z\s&]+)', re.IGNORECASE),
+    re.compile(r'worked\s+at\s+([A-Z][a-zA-Z\s&]+)', re.IGNORECASE),
+]
+
+DEGREE_PATTERNS = [
+    re.compile(r'(Bachelor[\'s]*\s+(?:of\s+)?(?:Science|Arts|Engineering|Technology|Computer Science))', re.IGNORECASE),
+    re.compile(r'(Master[\'s]*\s+(?:of\s+)?(?:Science|Arts|Engineering|Technology|Computer Science))', re.IGNORECASE),
+    re.compile(r'(PhD|Ph\.D\.?|Doctorate)', re.IGNORECASE),
+    re.compile(r'(B\.?S\.?|B\.?A\.?|M\.?S\.?|M\.?A\.?|B\.?Tech|M\.?Tech)', re.IGNORECASE),
+]
+
+class ResumeText:
+    """Resume text plus the derived forms extractors share, computed once on first use"""
+    
+    def __init__(self, text):
+        self.text = text
+    
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+    
+    @cached_property
+    def header_lines(self):
+        return self.text.split('\n', 5)[:5]
+    
+    @cached_property
+    def years(self):
+        return PATTERNS['year'].findall(self.text)
 
 class ResumeParser:
-    def __init__(self):
+    # Common spellings and abbreviations mapped to canonical skill names
+    SKILL_ALIASES = {
+        'JavaScript': ['JS', 'ECMAScript'],
+        'C++': ['CPP'],
+        'Node.js': ['NodeJS', 'Node js'],
+        'PostgreSQL': ['Postgres'],
+        'Kubernetes': ['K8s'],
+        'AWS': ['Amazon Web Services'],
+        'Azure': ['Microsoft Azure'],
+        'Machine Learning': ['ML'],
+        'CI/CD': ['CICD', 'Continuous Integration'],
+    }
+    
+    CERT_ALIASES = {
+        'Certificate': ['Certificates'],
+        'Certification': ['Certifications'],
+        'Scrum Master': ['ScrumMaster'],
+    }
+    
+    # Extractors that only look at the first lines of a resume
+    HEADER_FIELDS = {'name'}
+    
+    def __init__(self, skills_taxonomy=None, max_pages=None, max_chars=None):
+        # Extraction budget; text beyond it is never read
+        self.max_pages = max_pages or Config.PARSE_MAX_PAGES
+        self.max_chars = max_chars or Config.PARSE_MAX_CHARS
         self.skills_database = [
             'Python', 'JavaScript', 'Java', 'C++', 'React', 'Node.js', 'Django', 'Flask',
             'HTML', 'CSS', 'SQL', 'MongoDB', 'PostgreSQL', 'Git', 'Docker', 'Kubernetes',
             'AWS', 'Azure', 'Machine Learning', 'Data Science', 'TensorFlow', 'PyTorch',
             'Blockchain', 'Solidity', 'Web3', 'Smart Contracts', 'DevOps', 'CI/CD'
         ]
+        self.cert_keywords = [
+            'AWS Certified', 'Azure Certified', 'Google Cloud', 'Certified',
+            'Certificate', 'Certification', 'CompTIA', 'Cisco', 'Microsoft',
+            'Oracle Certified', 'PMP', 'Scrum Master', 'Kubernetes'
+        ]
+        
+        # {canonical: [aliases]}; a taxonomy file replaces the built-in list
+        skills = {skill: self.SKILL_ALIASES.get(skill, []) for skill in self.skills_database}
+        taxonomy_file = skills_taxonomy or Config.SKILLS_TAXONOMY_FILE
+        if taxonomy_file and os.path.exists(taxonomy_file):
+            with open(taxonomy_file, 'r', encoding='utf-8') as f:
+                skills = json.load(f)
+            self.skills_database = list(skills)
+        
+        # Compiled once and reused for every resume
+        self.skill_matcher = KeywordMatcher(skills)
+        self.cert_matcher = KeywordMatcher(
+            {keyword: self.CERT_ALIASES.get(keyword, []) for keyword in self.cert_keywords}
+        )
     
-    def parse_resume(self, file_path):
-        """Parse resume and extract structured data"""
+        # Field -> extractor, run in order by extract_information
+        self.extractors = {
+            'name': self.extract_name,
+            'email': self.extract_email,
+            'phone': self.extract_phone,
+            'skills': self.extract_skills,
+            'experience': self.extract_experience,
+            'education': self.extract_education,
+            'certifications': self.extract_certifications,
+        }
+        self.last_timings = {}  # field -> seconds for the last resume
+        self.last_stages = {}  # read_text / extract_fields -> seconds for the last file
+        self.timing_totals = {}  # field -> (calls, total seconds)
+    
+    def parse_resume(self, file_path, fields=None):
+        """Parse resume and extract structured data.
+        
+        ``fields`` limits extraction to those fields; when they are all header
+        fields (e.g. ``['name']``) only the first page is read.
+        """
         try:
             if file_path.lower().endswith('.docx'):
-                return self.parse_docx(file_path)
+                return self.parse_docx(file_path, fields)
             elif file_path.lower().endswith('.pdf'):
-                return self.parse_pdf(file_path)
+                return self.parse_pdf(file_path, fields)
             else:
                 return None
         except Exception as e:
             print(f"Error parsing resume: {e}")
             return None
     
-    def parse_docx(self, file_path):
+    def parse_docx(self, file_path, fields=None):
         """Parse DOCX file and extract information"""
-        doc = Document(file_path)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return self.extract_information(text)
+        max_paragraphs = 5 if self.header_only(fields) else None
+        data, _ = self.parse_chunks(self.iter_docx_paragraphs(file_path), '\n', max_paragraphs, fields)
+        data['pages_parsed'] = 1
+        return data
     
-    def parse_pdf(self, file_path):
+    def parse_pdf(self, file_path, fields=None):
         """Parse PDF file and extract information"""
+        max_pages = 1 if self.header_only(fields) else self.max_pages
+        data, pages = self.parse_chunks(self.iter_pdf_pages(file_path), '', max_pages, fields)
+        data['pages_parsed'] = pages
+        return data
+    
+    def parse_chunks(self, chunks, separator, max_chunks, fields):
+        """Read streamed text within the budget and extract fields; returns ``(data, chunks read)``"""
+        start = time.perf_counter()
+        text, count, truncated = self.read_text(chunks, separator, max_chunks)
+        read_seconds = time.perf_counter() - start
+        data = self.extract_information(text, fields)
+        data['truncated'] = truncated
+        self.last_stages = {'read_text': read_seconds, 'extract_fields': sum(self.last_timings.values())}
+        return data, count
+    
+    def iter_pdf_pages(self, file_path):
+        """Yield the text of each PDF page, extracting pages only as they are consumed"""
+        import PyPDF2
         with open(file_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
             for page in pdf_reader.pages:
-                text += page.extract_text()
-        return self.extract_information(text)
+                yield page.extract_text() or ''
+    
+    def iter_docx_paragraphs(self, file_path):
+        from docx import Document
+        for paragraph in Document(file_path).paragraphs:
+            yield paragraph.text
+    
+    def read_text(self, chunks, separator, max_chunks=None):
+        """Join streamed chunks within the page/character budget.
+        
+        Returns ``(text, chunks read, truncated)``; the stream is abandoned as
+        soon as the budget is spent.
+        """
+        parts = []
+        size = 0
+        truncated = False
+        for chunk in chunks:
+            if max_chunks is not None and len(parts) >= max_chunks:
+                truncated = True
+                break
+            if size + len(chunk) > self.max_chars:
+                parts.append(chunk[:self.max_chars - size])
+                truncated = True
+                break
+            parts.append(chunk)
+            size += len(chunk) + len(separator)
+        return separator.join(parts), len(parts), truncated
     
-    def extract_information(self, text):
+    def header_only(self, fields):
+        return fields is not None and set(fields) <= self.HEADER_FIELDS
+    
+    def extract_information(self, text, fields=None):
         """Extract structured information from text"""
-        data = {
-            'raw_text': text,
-            'name': self.extract_name(text),
-            'email': self.extract_email(text),
-            'phone': self.extract_phone(text),
-            'skills': self.extract_skills(text),
-            'experience': self.extract_experience(text),
-            'education': self.extract_education(text),
-            'certifications': self.extract_certifications(text),
-            'parsed_at': datetime.now().isoformat()
-        }
+        doc = ResumeText(text)
+        timings = {}
+        data = {'raw_text': text}
+        for field, extractor in self.extractors.items():
+            if fields is not None and field not in fields:
+                continue
+            start = time.perf_counter()
+            data[field] = extractor(doc)
+            timings[field] = time.perf_counter() - start
+        data['parsed_at'] = datetime.now().isoformat()
+        
+        self.last_timings = timings
+        for field, seconds in timings.items():
+            count, total = self.timing_totals.get(field, (0, 0.0))
+            self.timing_totals[field] = (count + 1, total + seconds)
         return data
     
-    def extract_name(self, text):
+    def register_extractor(self, field, extractor):
+        """Add or replace the extractor for ``field``; it receives a ResumeText"""
+        self.extractors[field] = extractor
+    
+    def extract_name(self, doc):
         """Extract candidate name from text"""
-        lines = text.split('\n')
         # Assume name is in the first few lines
-        for line in lines[:5]:
+        for line in doc.header_lines:
             line = line.strip()
             if line and not any(keyword in line.lower() for keyword in ['email', 'phone', '@', 'tel:', 'mobile']):
                 # Simple heuristic: if line has 2-4 words and proper case, likely a name
@@ -70,64 +231,42 @@ class ResumeParser:
                     return line
         return "Name Not Found"
     
-    def extract_email(self, text):
+    def extract_email(self, doc):
         """Extract email address from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text)
-        return matches[0] if matches else None
+        match = PATTERNS['email'].search(doc.text)
+        return match.group(0) if match else None
     
-    def extract_phone(self, text):
+    def extract_phone(self, doc):
         """Extract phone number from text"""
-        phone_pattern = r'[\+]?[1-9]?[0-9]{7,12}'
-        matches = re.findall(phone_pattern, text)
-        return matches[0] if matches else None
+        match = PATTERNS['phone'].search(doc.text)
+        return match.group(0) if match else None
     
-    def extract_skills(self, text):
+    def extract_skills(self, doc):
         """Extract skills from text"""
-        found_skills = []
-        text_lower = text.lower()
-        for skill in self.skills_database:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-        return found_skills
-    
-    def extract_experience(self, text):
+        return self.skill_matcher.find(doc.lower, lowered=True)
+    
+    def extract_experience(self, doc):
         """Extract work experience from text"""
         experience = []
-        # Look for company patterns and years
-        company_patterns = [
-            r'(\w+\s+(?:Inc|LLC|Corp|Corporation|Company|Ltd|Limited|Technologies|Tech|Solutions|Systems|Group))',
-            r'at\s+([A-Z][a-zA-Z\s&]+)',
-            r'worked\s+at\s+([A-Z][a-zA-Z\s&]+)'
-        ]
+        # Estimate years from the year tokens shared by all extractors
+        recent_years = len([y for y in doc.years if int(y) >= 2015])
         
-        year_pattern = r'(20\d{2}|19\d{2})'
-        years = re.findall(year_pattern, text)
-        
-        for pattern in company_patterns:
-            companies = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in COMPANY_PATTERNS:
+            companies = pattern.findall(doc.text)
             for company in companies[:3]:  # Limit to first 3 matches
                 experience.append({
                     'company': company.strip(),
-                    'years': len([y for y in years if int(y) >= 2015]),  # Estimate years
+                    'years': recent_years,
                     'position': 'Software Developer'  # Default position
                 })
         
         return experience
     
-    def extract_education(self, text):
+    def extract_education(self, doc):
         """Extract education information from text"""
         education = []
-        degree_patterns = [
-            r'(Bachelor[\'s]*\s+(?:of\s+)?(?:Science|Arts|Engineering|Technology|Computer Science))',
-            r'(Master[\'s]*\s+(?:of\s+)?(?:Science|Arts|Engineering|Technology|Computer Science))',
-            r'(PhD|Ph\.D\.?|Doctorate)',
-            r'(B\.?S\.?|B\.?A\.?|M\.?S\.?|M\.?A\.?|B\.?Tech|M\.?Tech)',
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern in DEGREE_PATTERNS:
+            for match in pattern.findall(doc.text):
                 education.append({
                     'degree': match.strip(),
                     'year': 2020,  # Default year
@@ -136,159 +275,157 @@ class ResumeParser:
         
         return education
     
-    def extract_certifications(self, text):
+    def extract_certifications(self, doc):
         """Extract certifications from text"""
-        cert_keywords = [
-            'AWS Certified', 'Azure Certified', 'Google Cloud', 'Certified',
-            'Certificate', 'Certification', 'CompTIA', 'Cisco', 'Microsoft',
-            'Oracle Certified', 'PMP', 'Scrum Master', 'Kubernetes'
-        ]
-        
         certifications = []
-        for keyword in cert_keywords:
-            if keyword.lower() in text.lower():
-                certifications.append({
-                    'name': keyword,
-                    'year': 2023,  # Default year
-                    'issuer': 'Certification Body'
-                })
+        for keyword in self.cert_matcher.find(doc.lower, lowered=True):
+            certifications.append({
+                'name': keyword,
+                'year': 2023,  # Default year
+                'issuer': 'Certification Body'
+            })
         
         return certifications
 
+def identity_collision_flag(matches):
+    """Flag for a resume whose contact details appear on other identities ``[(resume_id, fields), ...]``, or None"""
+    if not matches:
+        return None
+    fields = sorted({field for _, shared in matches for field in shared})
+    return {
+        'type': 'identity_collision',
+        'category': 'identity',
+        'severity': 'high',
+        'message': f"{' and '.join(fields).capitalize()} also used on {len(matches)} resume(s) "
+                   f"with a different name or employment history",
+        'matches': [{'resume_id': resume_id, 'fields': list(shared)} for resume_id, shared in matches[:10]],
+    }
+
 class VerificationEngine:
-    def __init__(self):
-        # Mock verification databases
-        self.verified_skills = {
-            'python': {'github_repos': 45, 'leetcode_solved': 120},
-            'javascript': {'github_repos': 32, 'leetcode_solved': 85},
-            'react': {'github_repos': 28, 'projects': 15},
-            'node.js': {'github_repos': 22, 'npm_packages': 3},
-            'machine learning': {'kaggle_competitions': 5, 'papers': 2}
-        }
+    """Verifies parsed claims through one provider per category.
         
-        self.verified_companies = {
-            'google': True, 'microsoft': True, 'amazon': True, 'apple': True,
-            'meta': True, 'netflix': True, 'uber': True, 'airbnb': True
-        }
+    All claims of a resume are checked concurrently on an event loop; each
+    thread keeps its own loop so provider connection pools survive between
+    resumes. The whole resume is bounded by ``Config.VERIFICATION_TIMEOUT``.
+    Verdicts for claims the provider has on record are cached per normalized
+    claim, so a claim seen on an earlier resume ("Google", "MIT") skips the
+    provider; unknown claims are checked again for every resume.
+    
+    In deterministic mode every claim draws from its own generator seeded with
+    the resume's content hash and the claim, so the same file always gets the
+    same verdicts regardless of claim order or concurrency. The claim cache is
+    bypassed in this mode, since a shared verdict would depend on which resume
+    was verified first.
+    """
         
-        self.verified_institutions = {
-            'mit': True, 'stanford': True, 'harvard': True, 'berkeley': True,
-            'carnegie mellon': True, 'caltech': True, 'georgia tech': True
-        }
+    # Category -> parsed_data key holding its claims
+    CATEGORIES = {
+        'skills': 'skills',
+        'experience': 'experience',
+        'education': 'education',
+        'certifications': 'certifications',
+    }
+    
+    def __init__(self, providers=None, cache=None, deterministic=None):
+        self.providers = providers or stub_providers()
+        self.deterministic = Config.VERIFICATION_DETERMINISTIC if deterministic is None else deterministic
+        if self.deterministic:
+            cache = False
+        elif cache is None and Config.CLAIM_CACHE_SIZE:
+            cache = ClaimCache(path=Config.CLAIM_CACHE_FILE)
+        self.cache = cache or None  # cache=False disables it
+        self.local = threading.local()
     
-    def verify_claims(self, parsed_data):
-        """Verify all claims in the parsed resume data"""
-        results = {
-            'skills': self.verify_skills(parsed_data.get('skills', [])),
-            'experience': self.verify_experience(parsed_data.get('experience', [])),
-            'education': self.verify_education(parsed_data.get('education', [])),
-            'certifications': self.verify_certifications(parsed_data.get('certifications', []))
+    def run(self, coroutine):
+        loop = getattr(self.local, 'loop', None)
+        if loop is None:
+            loop = self.local.loop = asyncio.new_event_loop()
+        return loop.run_until_complete(coroutine)
+    
+    async def verify_all(self, claims_by_category, seed=None):
+        """Verify ``{category: [claim, ...]}`` concurrently, keeping claim order"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + Config.VERIFICATION_TIMEOUT
+        tasks = [
+            self.verify_claim(category, claim, deadline, seed)
+            for category, claims in claims_by_category.items()
+            for claim in claims
+        ]
+        verified = iter(await asyncio.gather(*tasks))
+        return {
+            category: [next(verified) for _ in claims]
+            for category, claims in claims_by_category.items()
         }
+    
+    async def verify_claim(self, category, claim, deadline, seed=None):
+        provider = self.providers[category]
+        if self.deterministic:
+            claim_id = json.dumps(claim, sort_keys=True, default=str)
+            rng = random.Random(f"{seed}:{category}:{claim_id}")
+            return await provider.verify(claim, deadline, rng)
+        
+        key = provider.cache_key(claim) if self.cache is not None else None
+        if key:
+            key = f"{category}:{key}"
+            verdict = self.cache.get(key)
+            if verdict is not None:
+                return {**provider.describe(claim), **verdict}
+        
+        result = await provider.verify(claim, deadline)
+        if key and 'error' not in result:
+            described = provider.describe(claim)
+            self.cache.put(key, {k: v for k, v in result.items() if k not in described})
+        return result
+    
+    def cache_stats(self):
+        return self.cache.stats() if self.cache is not None else {'hits': 0, 'misses': 0, 'entries': 0}
+    
+    def verify_claims(self, parsed_data, seed=None):
+        """Verify all claims in the parsed resume data.
+        
+        ``seed`` (normally the file's content hash) fixes the outcome in
+        deterministic mode; without one the parsed data itself is hashed.
+        """
+        if self.deterministic and seed is None:
+            seed = hashlib.sha256(json.dumps(parsed_data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        results = self.run(self.verify_all({
+            category: parsed_data.get(key, [])
+            for category, key in self.CATEGORIES.items()
+        }, seed))
         
         # Calculate overall trust score
         trust_score = self.calculate_trust_score(results)
         
         # Generate flags for suspicious claims
-        flags = self.generate_flags(results, parsed_data)
+        flags = self.generate_flags(results, parsed_data, trust_score)
         
         return results, flags, trust_score
     
+    def verify_category(self, category, claims):
+        return self.run(self.verify_all({category: claims}))[category]
+    
     def verify_skills(self, skills):
         """Verify technical skills against external data sources"""
-        verified_skills = []
-        for skill in skills:
-            skill_lower = skill.lower()
-            verification_status = 'verified' if skill_lower in self.verified_skills else 'unverified'
-            
-            # Add some randomness for demo purposes
-            if verification_status == 'unverified':
-                verification_status = random.choice(['unverified', 'needs_review']) if random.random() > 0.7 else 'unverified'
-            
-            verified_skills.append({
-                'skill': skill,
-                'status': verification_status,
-                'evidence': self.verified_skills.get(skill_lower, {}),
-                'confidence': random.randint(60, 95) if verification_status == 'verified' else random.randint(20, 60)
-            })
-        
-        return verified_skills
+        return self.verify_category('skills', skills)
     
     def verify_experience(self, experience):
         """Verify work experience against company records"""
-        verified_experience = []
-        for exp in experience:
-            company_lower = exp.get('company', '').lower()
-            is_verified = any(verified_company in company_lower for verified_company in self.verified_companies.keys())
-            
-            status = 'verified' if is_verified else 'needs_review'
-            if not is_verified and random.random() > 0.8:
-                status = 'flagged'
-            
-            verified_experience.append({
-                'company': exp.get('company'),
-                'position': exp.get('position'),
-                'years': exp.get('years'),
-                'status': status,
-                'confidence': random.randint(70, 95) if status == 'verified' else random.randint(30, 70)
-            })
-        
-        return verified_experience
+        return self.verify_category('experience', experience)
     
     def verify_education(self, education):
         """Verify educational credentials"""
-        verified_education = []
-        for edu in education:
-            institution_lower = edu.get('institution', '').lower()
-            is_verified = any(verified_inst in institution_lower for verified_inst in self.verified_institutions.keys())
-            
-            status = 'verified' if is_verified else 'needs_review'
-            if not is_verified and random.random() > 0.9:
-                status = 'flagged'
-            
-            verified_education.append({
-                'degree': edu.get('degree'),
-                'institution': edu.get('institution'),
-                'year': edu.get('year'),
-                'status': status,
-                'confidence': random.randint(75, 98) if status == 'verified' else random.randint(40, 75)
-            })
-        
-        return verified_education
+        return self.verify_category('education', education)
     
     def verify_certifications(self, certifications):
         """Verify professional certifications"""
-        verified_certs = []
-        for cert in certifications:
-            # Simulate blockchain verification
-            rand_val = random.random()
-            if rand_val < 0.6:
-                status = 'verified'
-            elif rand_val < 0.9:
-                status = 'needs_review'
-            else:
-                status = 'flagged'
-            
-            verified_certs.append({
-                'name': cert.get('name'),
-                'issuer': cert.get('issuer'),
-                'year': cert.get('year'),
-                'status': status,
-                'blockchain_hash': f"0x{random.randint(100000, 999999):x}" if status == 'verified' else None,
-                'confidence': random.randint(80, 99) if status == 'verified' else random.randint(25, 80)
-            })
-        
-        return verified_certs
+        return self.verify_category('certifications', certifications)
     
     def calculate_trust_score(self, verification_results):
-        """Calculate overall trust score based on verification results"""
-        total_items = 0
-        verified_items = 0
+        """Calculate overall trust score based on verification results.
         
-        for category, items in verification_results.items():
-            for item in items:
-                total_items += 1
-                if item.get('status') == 'verified':
-                    verified_items += 1
+        ``scoring.rescore`` applies the same formula to the whole corpus at once.
+        """
+        total_items, verified_items, flagged_items = claim_counts(verification_results)
         
         if total_items == 0:
             return 0
@@ -296,13 +433,12 @@ class VerificationEngine:
         base_score = (verified_items / total_items) * 100
         
         # Apply penalties for flagged items
-        flagged_penalty = sum(1 for category in verification_results.values() 
-                             for item in category if item.get('status') == 'flagged') * 10
+        flagged_penalty = flagged_items * Config.FLAGGED_PENALTY
         
         final_score = max(0, base_score - flagged_penalty)
         return round(final_score, 1)
     
-    def generate_flags(self, verification_results, parsed_data):
+    def generate_flags(self, verification_results, parsed_data, trust_score=None):
         """Generate flags for suspicious or inconsistent claims"""
         flags = []
         
@@ -337,4 +473,9 @@ class VerificationEngine:
                 'message': f"Possible skill stuffing detected ({len(skills)} skills listed)"
             })
         
+        if trust_score is not None:
+            flag = low_trust_flag(trust_score)
+            if flag:
+                flags.append(flag)
+        
         return flags